@@ -1,5 +1,8 @@
 import dns.resolver
 import socket
+import asyncio
+
+from DNS_Records.dns_cache import get_resolver
 
 class DNSUtils:
     @staticmethod
@@ -34,7 +37,7 @@ class DNSUtils:
         :return: A list of A records (IP addresses).
         """
         try:
-            answers = dns.resolver.resolve(domain, 'A')
+            answers = get_resolver().resolve(domain, 'A')
             return [record.to_text() for record in answers]
         except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN) as e:
             print(f"No A records found for {domain}: {e}")
@@ -43,6 +46,69 @@ class DNSUtils:
             print(f"An error occurred while fetching A records for {domain}: {e}")
             return []
 
+    @staticmethod
+    def a_records_from_answer(answer):
+        """
+        Convert a DNSAnswer from DNS_Records.dns_engine to the fetch_a_records format.
+        :param answer: Answer to an A (or AAAA) query.
+        :return: A list of A records (IP addresses).
+        """
+        return [record.value for record in answer.records]
+
+    @staticmethod
+    async def resolve_addresses(domain, engine=None, getaddrinfo_fallback=False):
+        """
+        Resolve the IPv4 and IPv6 addresses of a domain with A and AAAA queries sent in parallel.
+
+        :param domain: Domain name as a string.
+        :param engine: DNS_Records.dns_engine.AsyncDNSEngine to query with. Defaults to a
+            new engine on the fetchers' upstream resolvers and the shared DNS cache.
+        :param getaddrinfo_fallback: If DNS finds no address, ask socket.getaddrinfo
+            (hosts file, NSS) in a worker thread instead.
+        :return: A dict with 'addresses' (deduplicated list of dicts with 'address',
+            'rdtype', 'ttl' and 'source'), 'ipv4', 'ipv6' and 'errors'.
+        """
+        if engine is None:
+            from DNS_Records.dns_engine import default_engine
+            engine = default_engine()
+        answers = await asyncio.gather(engine.query(domain, 'A'), engine.query(domain, 'AAAA'))
+        addresses = {}
+        errors = []
+        for answer in answers:
+            if answer.error:
+                errors.append(f"{answer.rdtype}: {answer.error}")
+            for record in answer.records:
+                if record.rdtype != answer.rdtype:
+                    # CNAMEs leading to the addresses
+                    continue
+                known = addresses.get(record.value)
+                if known is None or record.ttl < known['ttl']:
+                    addresses[record.value] = {'address': record.value, 'rdtype': record.rdtype,
+                                               'ttl': record.ttl, 'source': 'dns'}
+        if not addresses and getaddrinfo_fallback:
+            ipv4_addresses, ipv6_addresses = await asyncio.get_running_loop().run_in_executor(
+                None, DNSUtils.fetch_ip_addresses, domain)
+            for rdtype, found in (('A', ipv4_addresses), ('AAAA', ipv6_addresses)):
+                for address in found:
+                    addresses.setdefault(address, {'address': address, 'rdtype': rdtype, 'ttl': None,
+                                                   'source': 'getaddrinfo'})
+        addresses = list(addresses.values())
+        return {'addresses': addresses,
+                'ipv4': [entry['address'] for entry in addresses if entry['rdtype'] == 'A'],
+                'ipv6': [entry['address'] for entry in addresses if entry['rdtype'] == 'AAAA'],
+                'errors': errors}
+
+    @staticmethod
+    def fetch_addresses(domain, getaddrinfo_fallback=False):
+        """
+        Synchronous form of resolve_addresses for callers without an event loop.
+
+        :param domain: Domain name as a string.
+        :param getaddrinfo_fallback: If DNS finds no address, ask socket.getaddrinfo instead.
+        :return: See resolve_addresses.
+        """
+        return asyncio.run(DNSUtils.resolve_addresses(domain, getaddrinfo_fallback=getaddrinfo_fallback))
+
 def save_to_file(filename, domain, content):
     """
     Save content to a file.
@@ -66,10 +132,13 @@ def save_to_file(filename, domain, content):
             file.write(f"- {ip}\n")
 
         file.write("\n\n")
-def get_a_records(domain):
-    a_records = DNSUtils.fetch_a_records(domain)
-    ipv4_addresses, ipv6_addresses = DNSUtils.fetch_ip_addresses(domain)
-    records_to_save = (a_records, ipv4_addresses, ipv6_addresses)
+def get_a_records(domain, getaddrinfo_fallback=False):
+    result = DNSUtils.fetch_addresses(domain, getaddrinfo_fallback)
+    for error in result['errors']:
+        print(f"An error occurred while fetching addresses for {domain}: {error}")
+    a_records = [f"{entry['address']} (TTL {entry['ttl']})" for entry in result['addresses']
+                 if entry['rdtype'] == 'A' and entry['ttl'] is not None]
+    records_to_save = (a_records, result['ipv4'], result['ipv6'])
     if any(records_to_save):
         save_to_file(f"{domain}_A_records.txt", domain, records_to_save)
         print(f"A records saved to {domain}_A_records.txt")
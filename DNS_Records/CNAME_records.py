@@ -1,6 +1,18 @@
+import time
+import dns.exception
+import dns.rcode
+import dns.rdatatype
 import dns.resolver
-import subprocess
-from typing import List
+from typing import Dict, List, Optional
+
+from DNS_Records.dns_cache import get_resolver
+from DNS_Records.dns_engine import negative_ttl
+
+# Longest alias chain followed before it is reported as a loop
+MAX_CHAIN_LENGTH = 16
+
+# Seconds a negative link is remembered when the response carries no SOA
+DEFAULT_NEGATIVE_TTL = 60
 
 def get_cname_records(domain: str) -> List[str]:
     """
@@ -13,7 +25,7 @@ def get_cname_records(domain: str) -> List[str]:
         List[str]: A list of CNAME records for the given domain.
     """
     try:
-        answers = dns.resolver.resolve(domain, 'CNAME')
+        answers = get_resolver().resolve(domain, 'CNAME')
         return [answer.target.to_text() for answer in answers]
     except dns.resolver.NoAnswer:
         print(f"No CNAME records found for {domain}.")
@@ -25,6 +37,18 @@ def get_cname_records(domain: str) -> List[str]:
         print(f"An error occurred: {e}")
         return []
 
+def cname_records_from_answer(answer) -> List[str]:
+    """
+    Converts a DNSAnswer from DNS_Records.dns_engine to the get_cname_records format.
+
+    Args:
+        answer (DNSAnswer): Answer to a CNAME query.
+
+    Returns:
+        List[str]: A list of CNAME records for the queried domain.
+    """
+    return [record.data['target'] for record in answer.records]
+
 def save_to_file(domain: str, cname_records: List[str]) -> None:
     """
     Saves CNAME records to a file.
@@ -39,41 +63,171 @@ def save_to_file(domain: str, cname_records: List[str]) -> None:
             file.write(record + '\n')
     print(f"CNAME records for {domain} saved in {filename}")
 
-def get_cname_records_using_dig(domain: str) -> List[str]:
+class CNAMEChainResolver:
+    """
+    Follows CNAME chains to their terminal name and addresses, memoizing every link.
+
+    An A query returns the whole alias chain in one response, so each link it
+    contains is remembered until its TTL runs out. Domains fronted by the same
+    CDN (e.g. '*.cloudfront.net') then reuse the shared part of the chain and
+    the terminal's addresses instead of resolving them again.
     """
-    Uses 'dig' command to get CNAME records for a given domain.
+
+    def __init__(self, resolver=None, max_length: int = MAX_CHAIN_LENGTH):
+        """
+        Initialize the chain resolver.
+
+        Args:
+            resolver (dns.resolver.Resolver, optional): Resolver to use. Defaults to
+                the resolver with the shared DNS cache.
+            max_length (int): Longest chain followed before it counts as a loop.
+        """
+        self.resolver = resolver or get_resolver()
+        self.max_length = max_length
+        self.links: Dict[str, tuple] = {}  # name -> (alias target or None, expiry)
+        self.addresses: Dict[tuple, tuple] = {}  # (name, rdtype) -> (addresses, expiry)
+        self.lookups = 0
+
+    @staticmethod
+    def _memo(table: dict, key):
+        entry = table.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            return True, entry[0]
+        return False, None
+
+    def _remember_response(self, response) -> None:
+        now = time.monotonic()
+        for rrset in response.answer:
+            owner = rrset.name.to_text().lower()
+            if rrset.rdtype == dns.rdatatype.CNAME:
+                self.links[owner] = (rrset[0].target.to_text().lower(), now + rrset.ttl)
+            elif rrset.rdtype in (dns.rdatatype.A, dns.rdatatype.AAAA):
+                self.links[owner] = (None, now + rrset.ttl)
+                rdtype = dns.rdatatype.to_text(rrset.rdtype)
+                self.addresses[(owner, rdtype)] = ([rdata.address for rdata in rrset], now + rrset.ttl)
+
+    def _learn(self, name: str) -> None:
+        """Resolves the A record of name and memoizes every link and address in the response."""
+        self.lookups += 1
+        try:
+            answer = self.resolver.resolve(name, 'A', raise_on_no_answer=False)
+            response = answer.response
+        except dns.resolver.NXDOMAIN as e:
+            response = next(iter(e.responses().values()), None)
+        except dns.exception.DNSException:
+            # Resolvers refuse to answer for looping or overlong chains, so take one hop at a time
+            self._learn_hop(name)
+            return
+        if response is not None:
+            self._remember_response(response)
+        if not self._memo(self.links, name)[0]:
+            # The response did not (re)state name's link: it has no alias now, even if an expired one is on file
+            expiry = time.monotonic() + (negative_ttl(response) or DEFAULT_NEGATIVE_TTL)
+            self.links[name] = (None, expiry)
+            if response is not None and response.rcode() == dns.rcode.NXDOMAIN:
+                # A name that does not exist has no addresses of any type either
+                self.addresses[(name, 'A')] = self.addresses[(name, 'AAAA')] = ([], expiry)
+
+    def _learn_hop(self, name: str) -> None:
+        self.lookups += 1
+        try:
+            answer = self.resolver.resolve(name, 'CNAME', raise_on_no_answer=False)
+            ttl = answer.rrset.ttl if answer.rrset is not None else negative_ttl(answer.response)
+            target = answer.rrset[0].target.to_text().lower() if answer.rrset is not None else None
+        except dns.resolver.NXDOMAIN:
+            target, ttl = None, None
+        except dns.exception.DNSException as e:
+            print(f"An error occurred while following the CNAME chain at {name}: {e}")
+            target, ttl = None, 0
+        self.links[name] = (target, time.monotonic() + (DEFAULT_NEGATIVE_TTL if ttl is None else ttl))
+
+    def terminal_addresses(self, name: str) -> Dict[str, List[str]]:
+        """Returns the A and AAAA addresses of a terminal name, resolving each type at most once per TTL."""
+        addresses = {}
+        for rdtype in ('A', 'AAAA'):
+            known, values = self._memo(self.addresses, (name, rdtype))
+            if not known:
+                self.lookups += 1
+                try:
+                    answer = self.resolver.resolve(name, rdtype, raise_on_no_answer=False)
+                    values = [rdata.address for rdata in answer.rrset] if answer.rrset is not None else []
+                    ttl = answer.rrset.ttl if answer.rrset is not None else negative_ttl(answer.response)
+                except dns.exception.DNSException:
+                    values, ttl = [], None
+                self.addresses[(name, rdtype)] = (values, time.monotonic() + (DEFAULT_NEGATIVE_TTL if ttl is None
+                                                                              else ttl))
+            addresses[rdtype] = values
+        return addresses
+
+    def follow(self, domain: str) -> dict:
+        """
+        Walks the alias chain of a domain to its terminal name.
+
+        Args:
+            domain (str): The domain to start from.
+
+        Returns:
+            dict: 'chain' (alias targets in order), 'canonical_name' (the terminal
+                name, None if the chain loops), 'addresses' ({'A': [...], 'AAAA': [...]})
+                and 'loop' (True if the chain revisits a name or exceeds max_length).
+        """
+        name = domain.lower().rstrip('.') + '.'
+        chain = []
+        seen = {name}
+        loop = False
+        while True:
+            known, target = self._memo(self.links, name)
+            if not known:
+                self._learn(name)
+                target = self.links[name][0]
+            if target is None:
+                break
+            chain.append(target)
+            if target in seen or len(chain) > self.max_length:
+                loop = True
+                break
+            seen.add(target)
+            name = target
+        canonical_name: Optional[str] = None if loop else name
+        addresses = self.terminal_addresses(name) if not loop else {'A': [], 'AAAA': []}
+        return {'domain': domain, 'chain': chain, 'canonical_name': canonical_name,
+                'addresses': addresses, 'loop': loop}
+
+_chain_resolver = None
+
+def follow_cname_chain(domain: str) -> dict:
+    """
+    Follows the CNAME chain of a domain with the process-wide CNAMEChainResolver,
+    so links memoized for one domain serve every later one.
 
     Args:
-        domain (str): The domain to query for CNAME records.
+        domain (str): The domain to start from.
 
     Returns:
-        List[str]: A list of CNAME records for the given domain.
+        dict: See CNAMEChainResolver.follow.
     """
-    try:
-        result = subprocess.run(['dig', domain, 'CNAME', '+short'], capture_output=True, text=True)
-        return result.stdout.splitlines()
-    except FileNotFoundError:
-        print("The 'dig' command is not available. Please install it.")
-        return []
+    global _chain_resolver
+    if _chain_resolver is None:
+        _chain_resolver = CNAMEChainResolver()
+    return _chain_resolver.follow(domain)
 
 def fetch_cname_records(domain):
     """
-    Fetches CNAME records for a list of domains.
+    Follows the full CNAME chain of a domain and saves it with the terminal addresses.
 
     Args:
-        domains (List[str]): List of domains to fetch CNAME records for.
+        domain (str): The domain to fetch CNAME records for.
     """
     try:
-        cname_records = []
-
-        # Try dnspython method
-        cname_records += get_cname_records(domain)
-
-        # Try dig command (if available)
-        cname_records += get_cname_records_using_dig(domain)
+        result = follow_cname_chain(domain)
 
-        if cname_records:
-            save_to_file(domain, cname_records)
+        if result['chain']:
+            lines = list(result['chain'])
+            if result['loop']:
+                lines.append("(CNAME loop detected)")
+            for rdtype, addresses in result['addresses'].items():
+                lines += [f"{rdtype} {address}" for address in addresses]
+            save_to_file(domain, lines)
         else:
             print(f"No CNAME records found for {domain}")
 
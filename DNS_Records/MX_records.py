@@ -1,11 +1,18 @@
 import dns.resolver
 
+from DNS_Records.dns_cache import get_resolver
+
 class MXRecordFetcher:
     """Class to fetch and save MX records for given domains."""
 
-    def __init__(self):
-        """Initialize DNS resolver."""
-        self.resolver = dns.resolver.Resolver()
+    def __init__(self, resolver=None):
+        """Initialize DNS resolver.
+
+        Args:
+            resolver (dns.resolver.Resolver, optional): Resolver to share with
+                other fetchers. Defaults to the resolver with the shared DNS cache.
+        """
+        self.resolver = resolver or get_resolver()
 
     def get_mx_records(self, domain):
         """Fetches MX records for a given domain using dnspython.
@@ -30,6 +37,18 @@ class MXRecordFetcher:
             print(f"An error occurred: {e}")
             return []
 
+    @staticmethod
+    def from_answer(answer):
+        """Converts a DNSAnswer from DNS_Records.dns_engine to the get_mx_records format.
+
+        Args:
+            answer (DNSAnswer): Answer to an MX query.
+
+        Returns:
+            list: A list of (preference, exchange) tuples.
+        """
+        return [(record.data['preference'], record.data['exchange']) for record in answer.records]
+
     def save_to_file(self, filename, content):
         """Saves content to a file.
 
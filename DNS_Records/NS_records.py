@@ -1,11 +1,18 @@
 import dns.resolver
 
+from DNS_Records.dns_cache import get_resolver
+
 class NSRecordFetcher:
     """Class to fetch and save NS records for given domains."""
 
-    def __init__(self):
-        """Initialize DNS resolver."""
-        self.resolver = dns.resolver.Resolver()
+    def __init__(self, resolver=None):
+        """Initialize DNS resolver.
+
+        Args:
+            resolver (dns.resolver.Resolver, optional): Resolver to share with
+                other fetchers. Defaults to the resolver with the shared DNS cache.
+        """
+        self.resolver = resolver or get_resolver()
 
     def get_ns_records(self, domain):
         """Fetches NS records for a given domain using dnspython.
@@ -31,6 +38,18 @@ class NSRecordFetcher:
             print(f"An error occurred: {e}")
             return []
 
+    @staticmethod
+    def from_answer(answer):
+        """Converts a DNSAnswer from DNS_Records.dns_engine to the get_ns_records format.
+
+        Args:
+            answer (DNSAnswer): Answer to an NS query.
+
+        Returns:
+            list: A list of NS records.
+        """
+        return [record.value for record in answer.records]
+
     def save_to_file(self, filename, domain, content):
         """Saves content to a file.
 
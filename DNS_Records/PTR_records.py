@@ -1,27 +1,89 @@
 import dns.resolver
+import dns.reversename
 import json
+import ipaddress
+
+from DNS_Records.dns_cache import get_resolver
+
+# Largest block reverse_names() will sweep: a /8, or an IPv6 /104
+MAX_SWEEP_ADDRESSES = 1 << 24
+
+
+def reverse_names(cidr):
+    """Returns a generator of the reverse DNS name of every address in a CIDR block.
+
+    Names are built from the address as an integer, one at a time, so even a
+    /16 or an IPv6 /112 costs no more memory than a single name.
+
+    Args:
+        cidr (str): IPv4 or IPv6 network, e.g. '203.0.113.0/24' or '2001:db8::/120'.
+
+    Returns:
+        generator: in-addr.arpa or ip6.arpa names (str), in address order.
+
+    Raises:
+        ValueError: If cidr is not a network or spans more than MAX_SWEEP_ADDRESSES.
+    """
+    network = ipaddress.ip_network(cidr.strip(), strict=False)
+    if network.num_addresses > MAX_SWEEP_ADDRESSES:
+        raise ValueError(f"{cidr} has {network.num_addresses} addresses; sweep at most {MAX_SWEEP_ADDRESSES}")
+    addresses = range(int(network.network_address), int(network.broadcast_address) + 1)
+    if network.version == 4:
+        return (f"{n & 255}.{n >> 8 & 255}.{n >> 16 & 255}.{n >> 24}.in-addr.arpa" for n in addresses)
+    return ('.'.join(f"{n:032x}"[::-1]) + '.ip6.arpa' for n in addresses)
+
+
+def address_from_reverse(name):
+    """Returns the address an in-addr.arpa or ip6.arpa name stands for."""
+    name = name.rstrip('.')
+    if name.endswith('.in-addr.arpa'):
+        return '.'.join(reversed(name[:-len('.in-addr.arpa')].split('.')))
+    nibbles = ''.join(reversed(name[:-len('.ip6.arpa')].split('.')))
+    return str(ipaddress.IPv6Address(int(nibbles, 16)))
+
 
 class PTRRecordFetcher:
     """Class to fetch and save PTR records for given IP addresses."""
 
+    def __init__(self, resolver=None):
+        """Initialize DNS resolver.
+
+        Args:
+            resolver (dns.resolver.Resolver, optional): Resolver to share with
+                other fetchers. Defaults to the resolver with the shared DNS cache.
+        """
+        self.resolver = resolver or get_resolver()
+
     def fetch_ptr_records(self, ip_address):
         """Fetches PTR records for a given IP address using dnspython.
 
         Args:
-            ip_address (str): The IP address for which to fetch PTR records.
+            ip_address (str): The IPv4 or IPv6 address for which to fetch PTR records.
 
         Returns:
             list: A list of PTR records.
         """
-        reversed_ip = '.'.join(reversed(ip_address.split('.'))) + '.in-addr.arpa' 
+        reversed_ip = dns.reversename.from_address(ip_address.strip())
         try:
-            answers = dns.resolver.resolve(reversed_ip, 'PTR')
+            answers = self.resolver.resolve(reversed_ip, 'PTR')
             ptr_records = [answer.to_text() for answer in answers]
             return ptr_records
         except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
             print(f"No PTR records found for {ip_address}")
             return []
 
+    @staticmethod
+    def from_answer(answer):
+        """Converts a DNSAnswer from DNS_Records.dns_engine to the fetch_ptr_records format.
+
+        Args:
+            answer (DNSAnswer): Answer to a PTR query.
+
+        Returns:
+            list: A list of PTR records.
+        """
+        return [record.value for record in answer.records]
+
     def save_to_file(self, ip_address, ptr_records):
         """Saves PTR records to a JSON file.
 
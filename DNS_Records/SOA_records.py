@@ -1,11 +1,18 @@
 import dns.resolver
 
+from DNS_Records.dns_cache import get_resolver
+
 class SOARecordFetcher:
     """Class to fetch and save SOA records for given domains."""
 
-    def __init__(self):
-        """Initialize DNS resolver."""
-        self.resolver = dns.resolver.Resolver()
+    def __init__(self, resolver=None):
+        """Initialize DNS resolver.
+
+        Args:
+            resolver (dns.resolver.Resolver, optional): Resolver to share with
+                other fetchers. Defaults to the resolver with the shared DNS cache.
+        """
+        self.resolver = resolver or get_resolver()
 
     def get_soa_record(self, domain):
         """Fetches SOA record for a given domain using dnspython.
@@ -28,6 +35,18 @@ class SOARecordFetcher:
             print(f"An error occurred: {e}")
             return None
 
+    @staticmethod
+    def from_answer(answer):
+        """Converts a DNSAnswer from DNS_Records.dns_engine to the get_soa_record format.
+
+        Args:
+            answer (DNSAnswer): Answer to an SOA query.
+
+        Returns:
+            str: The SOA record, or None if there is none.
+        """
+        return answer.records[0].value if answer.records else None
+
     def save_to_file(self, filename, domain, content):
         """Saves content to a file.
 
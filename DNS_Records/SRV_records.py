@@ -1,17 +1,30 @@
 import dns.resolver
 import json
-import time
+
+from DNS_Records.dns_cache import get_resolver
 
 class SRVRecordFetcher:
-    # Class definition here...
+    """Class to fetch and save SRV records for given domains."""
+
+    def __init__(self, resolver=None):
+        """Initialize DNS resolver.
 
-    def fetch_srv_records(self, domain, retries=3, delay=1):
+        Args:
+            resolver (dns.resolver.Resolver, optional): Resolver to share with
+                other fetchers. Defaults to the resolver with the shared DNS cache.
+        """
+        self.resolver = resolver or get_resolver()
+
+    def fetch_srv_records(self, domain, retries=3):
         """Fetches SRV records for a given domain with retry mechanism.
 
+        A timed out attempt is retried straight away: the resolver already
+        waited out its own timeout, and a ResolverPool fails over to another
+        upstream rather than waiting on the slow one again.
+
         Args:
             domain (str): The domain name to query for SRV records.
             retries (int): Number of retry attempts (default: 3).
-            delay (float): Delay in seconds between retries (default: 1).
 
         Returns:
             list: A list of dictionaries, each representing an SRV record.
@@ -19,7 +32,7 @@ class SRVRecordFetcher:
         """
         for _ in range(retries):
             try:
-                answers = dns.resolver.resolve(domain, 'SRV')
+                answers = self.resolver.resolve(domain, 'SRV')
                 srv_records = []
                 for record in answers:
                     srv_records.append({
@@ -34,10 +47,26 @@ class SRVRecordFetcher:
                 return []
             except dns.exception.Timeout:
                 print(f"Timeout occurred while fetching SRV records for {domain}. Retrying...")
-                time.sleep(delay)
         print(f"Failed to fetch SRV records for {domain} after {retries} attempts.")
         return []
 
+    @staticmethod
+    def from_answer(answer):
+        """Converts a DNSAnswer from DNS_Records.dns_engine to the fetch_srv_records format.
+
+        Args:
+            answer (DNSAnswer): Answer to an SRV query.
+
+        Returns:
+            list: A list of dictionaries, each representing an SRV record.
+        """
+        return [{
+            "Priority": record.data['priority'],
+            "Weight": record.data['weight'],
+            "Port": record.data['port'],
+            "Target": record.data['target']
+        } for record in answer.records]
+
     def save_to_file(self, filename, srv_records):
         """Saves SRV records to a JSON file.
 
@@ -1,5 +1,7 @@
 import dns.resolver
 
+from DNS_Records.dns_cache import get_resolver
+
 def get_txt_records(domain):
     """
     Fetches TXT records for a given domain using dnspython.
@@ -11,7 +13,7 @@ def get_txt_records(domain):
         list: A list of TXT records.
     """
     try:
-        answers = dns.resolver.resolve(domain, 'TXT')
+        answers = get_resolver().resolve(domain, 'TXT')
         txt_records = [record.strings for record in answers]
         return txt_records
     except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN) as e:
@@ -20,6 +22,18 @@ def get_txt_records(domain):
         print(f"An error occurred: {e}")
         return []
 
+def txt_records_from_answer(answer):
+    """
+    Converts a DNSAnswer from DNS_Records.dns_engine to the get_txt_records format.
+
+    Args:
+        answer (DNSAnswer): Answer to a TXT query.
+
+    Returns:
+        list: A list of TXT records, each a tuple of byte strings.
+    """
+    return [tuple(string.encode('utf-8') for string in record.data['strings']) for record in answer.records]
+
 def fetch_txt_records_for_domain(domain):
     """
     Fetches TXT records for a single domain and saves to file.
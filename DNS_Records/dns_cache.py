@@ -0,0 +1,143 @@
+import json
+import time
+import base64
+import logging
+
+import dns.name
+import dns.rcode
+import dns.message
+import dns.resolver
+import dns.rdatatype
+import dns.rdataclass
+
+DEFAULT_MAX_SIZE = 50000
+
+
+class DNSCache(dns.resolver.LRUCache):
+    """Shared, size-bounded DNS answer cache that can be snapshotted to disk.
+
+    dnspython resolvers consult it before every query. Each answer expires
+    after the smallest TTL in its CNAME chain, and NXDOMAIN/NoAnswer responses
+    are cached negatively for the SOA minimum from their authority section.
+    When the cache is full the least recently used answer is dropped.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        """Initialize the cache.
+
+        Args:
+            max_size (int): Maximum number of cached answers.
+        """
+        super().__init__(max_size)
+
+    def stats(self):
+        """Returns entry, negative entry, hit and miss counts."""
+        with self.lock:
+            negative = sum(1 for node in self.data.values() if node.value.rrset is None)
+            return {'entries': len(self.data), 'negative': negative,
+                    'hits': self.statistics.hits, 'misses': self.statistics.misses}
+
+    def snapshot(self, path):
+        """Saves every unexpired answer to a JSON file.
+
+        Args:
+            path (str): File to write.
+
+        Returns:
+            int: Number of answers saved.
+        """
+        now = time.time()
+        with self.lock:
+            # Oldest first, so loading the snapshot restores the LRU order
+            nodes = []
+            node = self.sentinel.prev
+            while node is not self.sentinel:
+                nodes.append(node)
+                node = node.prev
+            entries = [[node.key[0].to_text(), int(node.key[1]), int(node.key[2]), node.value.expiration,
+                        base64.b64encode(node.value.response.to_wire()).decode('ascii')]
+                       for node in nodes if node.value.expiration > now]
+        with open(path, 'w') as file:
+            json.dump(entries, file)
+        return len(entries)
+
+    def load(self, path):
+        """Adds the unexpired answers of a snapshot to the cache.
+
+        Args:
+            path (str): File written by snapshot.
+
+        Returns:
+            int: Number of answers loaded.
+        """
+        with open(path) as file:
+            entries = json.load(file)
+        now = time.time()
+        loaded = 0
+        for qname, rdtype, rdclass, expiration, wire in entries:
+            if expiration <= now:
+                continue
+            try:
+                qname = dns.name.from_text(qname)
+                response = dns.message.from_wire(base64.b64decode(wire))
+                answer = dns.resolver.Answer(qname, rdtype, rdclass, response)
+            except Exception as e:
+                logging.error(f"Skipping unreadable DNS cache entry for {qname}: {e}")
+                continue
+            answer.expiration = expiration
+            self.put((qname, dns.rdatatype.RdataType(rdtype), dns.rdataclass.RdataClass(rdclass)), answer)
+            loaded += 1
+        return loaded
+
+
+_default_cache = None
+_resolver = None
+
+
+def get_default_cache():
+    """Returns the process-wide DNS cache, creating it on first use."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = DNSCache()
+    return _default_cache
+
+
+def set_default_cache(cache):
+    """Replaces the process-wide DNS cache, e.g. with one of a different size."""
+    global _default_cache
+    _default_cache = cache
+    dns.resolver.get_default_resolver().cache = cache
+
+
+def set_resolver(resolver):
+    """Makes get_resolver() return resolver, e.g. a DNS_Records.resolver_pool.ResolverPool.
+
+    None restores dnspython's default resolver.
+    """
+    global _resolver
+    _resolver = resolver
+
+
+def get_resolver():
+    """Returns dnspython's default resolver with the shared cache installed.
+
+    The module-level helpers and the fetcher classes all resolve through this
+    resolver, so they share one set of cached answers. A resolver installed
+    with set_resolver() takes its place.
+    """
+    if _resolver is not None:
+        return _resolver
+    resolver = dns.resolver.get_default_resolver()
+    if resolver.cache is not get_default_cache():
+        resolver.cache = get_default_cache()
+    return resolver
+
+
+if __name__ == "__main__":
+    resolver = get_resolver()
+    for domain in ['google.com', 'google.com', 'no-such-domain.example', 'no-such-domain.example']:
+        try:
+            print(domain, [record.to_text() for record in resolver.resolve(domain, 'MX')])
+        except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN) as e:
+            print(domain, e)
+    print(get_default_cache().stats())
@@ -0,0 +1,206 @@
+import time
+import asyncio
+from collections import namedtuple
+
+import dns.asyncresolver
+import dns.exception
+import dns.rdatatype
+import dns.resolver
+
+from DNS_Records.dns_cache import get_default_cache, get_resolver
+
+# Record types making up a domain's full DNS profile
+PROFILE_TYPES = ('A', 'AAAA', 'CNAME', 'MX', 'NS', 'SOA', 'TXT', 'SRV')
+
+DEFAULT_TIMEOUT = 2.0
+DEFAULT_LIFETIME = 5.0
+DEFAULT_CONCURRENCY = 500
+
+# One resource record.
+#   name   owner name, e.g. 'google.com.'
+#   rdtype record type, e.g. 'MX'
+#   ttl    TTL of the RRset in seconds
+#   value  presentation form, e.g. '10 smtp.google.com.'
+#   data   parsed fields, e.g. {'preference': 10, 'exchange': 'smtp.google.com.'}
+DNSRecord = namedtuple('DNSRecord', ['name', 'rdtype', 'ttl', 'value', 'data'])
+
+# Outcome of one (name, rdtype) query.
+#   status  'NOERROR', 'NODATA', 'NXDOMAIN', 'TIMEOUT' or 'ERROR'
+#   records list of DNSRecord (empty unless status is 'NOERROR')
+#   ttl     seconds the answer may be cached: the RRset TTL, or for negative
+#           answers the SOA minimum from the authority section (None if unknown)
+#   error   error message for 'TIMEOUT' and 'ERROR'
+DNSAnswer = namedtuple('DNSAnswer', ['name', 'rdtype', 'status', 'records', 'ttl', 'error'])
+
+
+def rdata_fields(rdata):
+    """Returns the parsed fields of one rdata as a JSON-friendly dict."""
+    rdtype = dns.rdatatype.to_text(rdata.rdtype)
+    if rdtype in ('A', 'AAAA'):
+        return {'address': rdata.address}
+    if rdtype in ('CNAME', 'NS', 'PTR'):
+        return {'target': rdata.target.to_text()}
+    if rdtype == 'MX':
+        return {'preference': rdata.preference, 'exchange': rdata.exchange.to_text()}
+    if rdtype == 'SOA':
+        return {'mname': rdata.mname.to_text(), 'rname': rdata.rname.to_text(), 'serial': rdata.serial,
+                'refresh': rdata.refresh, 'retry': rdata.retry, 'expire': rdata.expire, 'minimum': rdata.minimum}
+    if rdtype == 'TXT':
+        return {'strings': [string.decode('utf-8', 'replace') for string in rdata.strings]}
+    if rdtype == 'SRV':
+        return {'priority': rdata.priority, 'weight': rdata.weight, 'port': rdata.port,
+                'target': rdata.target.to_text()}
+    return {}
+
+
+def records_from_rrset(rrset):
+    rdtype = dns.rdatatype.to_text(rrset.rdtype)
+    name = rrset.name.to_text()
+    return [DNSRecord(name, rdtype, rrset.ttl, rdata.to_text(), rdata_fields(rdata)) for rdata in rrset]
+
+
+def negative_ttl(response):
+    """Returns the negative-caching TTL of a response: min(SOA TTL, SOA minimum)."""
+    if response is None:
+        return None
+    for rrset in response.authority:
+        if rrset.rdtype == dns.rdatatype.SOA:
+            return min(rrset.ttl, rrset[0].minimum)
+    return None
+
+
+def answer_from_response(name, rdtype, answer):
+    """Builds a DNSAnswer from a dnspython Answer resolved with raise_on_no_answer=False."""
+    if answer.rrset is None:
+        return DNSAnswer(name, rdtype, 'NODATA', [], negative_ttl(answer.response), None)
+    return DNSAnswer(name, rdtype, 'NOERROR', records_from_rrset(answer.rrset), answer.rrset.ttl, None)
+
+
+class AsyncDNSEngine:
+    """Resolves many (domain, record type) queries concurrently on one event loop.
+
+    Every query goes through one dns.asyncresolver.Resolver and comes back as a
+    DNSAnswer, so a domain's whole profile costs about one round trip instead
+    of one per record type.
+    """
+
+    def __init__(self, nameservers=None, port=53, timeout=DEFAULT_TIMEOUT, lifetime=DEFAULT_LIFETIME,
+                 concurrency=DEFAULT_CONCURRENCY, resolver=None, cache=None):
+        """Initialize the engine.
+
+        Args:
+            nameservers (list, optional): Upstream resolver addresses. Defaults to
+                the system configuration.
+            port (int): Port the upstream resolvers listen on.
+            timeout (float): Seconds to wait for each server.
+            lifetime (float): Total seconds allowed per query, retries included.
+            concurrency (int): Maximum number of queries in flight.
+            resolver (dns.asyncresolver.Resolver, optional): Resolver to use as is.
+            cache (DNS_Records.dns_cache.DNSCache, optional): Answer cache. Defaults
+                to the shared cache the synchronous fetchers use; False disables it.
+        """
+        if resolver is None:
+            resolver = dns.asyncresolver.Resolver()
+            if nameservers:
+                resolver.nameservers = list(nameservers)
+            resolver.port = port
+            resolver.timeout = timeout
+            resolver.lifetime = lifetime
+            resolver.cache = (get_default_cache() if cache is None else cache) or None
+        self.resolver = resolver
+        self.concurrency = concurrency
+        self._semaphore = None
+
+    async def query(self, name, rdtype):
+        """Resolves one name and record type.
+
+        Returns:
+            DNSAnswer: Never raises for DNS failures; they are reported in status.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            try:
+                answer = await self.resolver.resolve(name, rdtype, search=False, raise_on_no_answer=False)
+            except dns.resolver.NXDOMAIN as e:
+                responses = e.kwargs.get('responses') or {}
+                response = next(iter(responses.values()), None)
+                return DNSAnswer(name, rdtype, 'NXDOMAIN', [], negative_ttl(response), None)
+            except (dns.exception.Timeout, dns.resolver.LifetimeTimeout) as e:
+                return DNSAnswer(name, rdtype, 'TIMEOUT', [], None, str(e))
+            except dns.exception.DNSException as e:
+                return DNSAnswer(name, rdtype, 'ERROR', [], None, str(e))
+        return answer_from_response(name, rdtype, answer)
+
+    async def _timed_query(self, name, rdtype):
+        start = time.perf_counter()
+        answer = await self.query(name, rdtype)
+        return answer, time.perf_counter() - start
+
+    async def stream(self, queries, in_flight=DEFAULT_CONCURRENCY):
+        """Resolves (name, rdtype) pairs with at most in_flight queries outstanding.
+
+        Queries are pulled from the iterable only as earlier ones complete, so
+        memory stays flat however long the input is.
+
+        Args:
+            queries (iterable): (name, rdtype) pairs.
+            in_flight (int): Maximum number of outstanding queries.
+
+        Yields:
+            tuple: (DNSAnswer, elapsed) in completion order.
+        """
+        pending = set()
+        for name, rdtype in queries:
+            if len(pending) >= in_flight:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+            pending.add(asyncio.ensure_future(self._timed_query(name, rdtype)))
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+
+    def close(self):
+        """Releases the engine's resources; dnspython opens a socket per query, so there are none."""
+
+    async def resolve_domain(self, domain, rdtypes=PROFILE_TYPES):
+        """Resolves several record types for one domain at once.
+
+        Returns:
+            dict: rdtype -> DNSAnswer.
+        """
+        answers = await asyncio.gather(*(self.query(domain, rdtype) for rdtype in rdtypes))
+        return dict(zip(rdtypes, answers))
+
+    async def resolve_many(self, domains, rdtypes=PROFILE_TYPES):
+        """Resolves several record types for many domains as one concurrent batch.
+
+        Returns:
+            dict: domain -> {rdtype -> DNSAnswer}.
+        """
+        domains = list(domains)
+        profiles = await asyncio.gather(*(self.resolve_domain(domain, rdtypes) for domain in domains))
+        return dict(zip(domains, profiles))
+
+
+def default_engine():
+    """Returns an AsyncDNSEngine using the same upstreams as DNS_Records.dns_cache.get_resolver()."""
+    resolver = get_resolver()
+    if hasattr(resolver, 'as_async'):
+        return AsyncDNSEngine(resolver=resolver.as_async())
+    return AsyncDNSEngine(resolver.nameservers, resolver.port)
+
+
+def resolve_profiles(domains, rdtypes=PROFILE_TYPES, **engine_options):
+    """Synchronous wrapper around AsyncDNSEngine.resolve_many for non-async callers."""
+    return asyncio.run(AsyncDNSEngine(**engine_options).resolve_many(domains, rdtypes))
+
+
+if __name__ == "__main__":
+    domains = ['google.com', 'wikipedia.org', 'amazon.com', 'reddit.com', 'microsoft.com']
+    for domain, profile in resolve_profiles(domains).items():
+        print(domain)
+        for rdtype, answer in profile.items():
+            print(f"  {rdtype:<5} {answer.status:<8} {', '.join(record.value for record in answer.records)}")
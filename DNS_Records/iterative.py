@@ -0,0 +1,231 @@
+import time
+import random
+import asyncio
+
+import dns.name
+import dns.flags
+import dns.rcode
+import dns.message
+import dns.rdatatype
+import dns.rdataclass
+import dns.exception
+import dns.asyncquery
+
+from DNS_Records.dns_engine import AsyncDNSEngine, DNSAnswer, DEFAULT_TIMEOUT, DEFAULT_CONCURRENCY, \
+    negative_ttl, records_from_rrset
+
+# IPv4 addresses of a.root-servers.net to m.root-servers.net
+ROOT_SERVERS = ('198.41.0.4', '170.247.170.2', '192.33.4.12', '199.7.91.13', '192.203.230.10', '192.5.5.241',
+                '192.112.36.4', '198.97.190.53', '192.36.148.17', '192.58.128.30', '193.0.14.129', '199.7.83.42',
+                '202.12.27.33')
+# Referrals followed for one name before giving up
+MAX_REFERRALS = 16
+# CNAMEs followed for one query
+MAX_CNAME_CHAIN = 8
+# Nesting of nameserver address lookups (out-of-bailiwick NS without glue)
+MAX_DEPTH = 4
+# Servers of a zone tried for one query before the lookup fails
+MAX_SERVER_TRIES = 3
+
+
+class DelegationCache:
+    """Nameserver addresses of every zone seen in a run, kept for the TTL of its NS set.
+
+    Shared by all lookups, so once the referral for a TLD or a zone has been
+    seen, later names under it are sent straight to that zone's servers.
+    """
+
+    def __init__(self, root_servers=ROOT_SERVERS):
+        self.root = dns.name.root
+        self.zones = {self.root: (list(root_servers), float('inf'))}
+        self.hits = 0
+        self.misses = 0
+
+    def put(self, zone, addresses, ttl):
+        self.zones[zone] = (list(addresses), time.time() + ttl)
+
+    def closest(self, qname):
+        """Returns (zone, addresses) of the deepest cached zone containing qname."""
+        now = time.time()
+        name = qname
+        while True:
+            entry = self.zones.get(name)
+            if entry is not None:
+                if entry[1] > now:
+                    if name == self.root:
+                        self.misses += 1
+                    else:
+                        self.hits += 1
+                    return name, entry[0]
+                del self.zones[name]
+            name = name.parent()
+
+    def stats(self):
+        return {'zones': len(self.zones) - 1, 'hits': self.hits, 'misses': self.misses}
+
+
+_default_delegations = None
+
+
+def get_delegation_cache():
+    """Returns the process-wide delegation cache (rooted at the public root servers)."""
+    global _default_delegations
+    if _default_delegations is None:
+        _default_delegations = DelegationCache()
+    return _default_delegations
+
+
+class IterativeEngine(AsyncDNSEngine):
+    """Resolves names itself, starting from the root, instead of asking a recursive resolver.
+
+    Every query is sent without recursion to the authoritative servers,
+    following referrals down from the deepest zone already in the delegation
+    cache. Queries that need the same referral while it is outstanding wait
+    for it rather than all asking the parent zone.
+
+    It is a drop-in AsyncDNSEngine for authoritative-truth checks and for
+    bulk jobs that would otherwise hit public resolver rate limits.
+    """
+
+    def __init__(self, root_servers=None, port=53, timeout=DEFAULT_TIMEOUT, concurrency=DEFAULT_CONCURRENCY,
+                 delegations=None):
+        """Initialize the engine.
+
+        Args:
+            root_servers (list, optional): Addresses to start from. Defaults to the
+                public root servers and the process-wide delegation cache.
+            port (int): Port the authoritative servers listen on.
+            timeout (float): Seconds to wait for one server.
+            concurrency (int): Maximum number of queries resolved at once.
+            delegations (DelegationCache, optional): Cache to share between engines.
+        """
+        if delegations is None:
+            delegations = DelegationCache(root_servers) if root_servers else get_delegation_cache()
+        self.delegations = delegations
+        self.port = port
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.sent = 0
+        self._semaphore = None
+        self._referrals = {}
+
+    async def _ask(self, servers, qname, rdtype):
+        """Sends a non-recursive query to up to MAX_SERVER_TRIES of servers; None if none answered."""
+        request = dns.message.make_query(qname, rdtype)
+        request.flags &= ~dns.flags.RD
+        for server in random.sample(servers, min(len(servers), MAX_SERVER_TRIES)):
+            self.sent += 1
+            try:
+                response = await dns.asyncquery.udp(request, server, self.timeout, self.port)
+                if response.flags & dns.flags.TC:
+                    response = await dns.asyncquery.tcp(request, server, self.timeout, self.port)
+            except (dns.exception.DNSException, OSError):
+                continue
+            if response.rcode() in (dns.rcode.NOERROR, dns.rcode.NXDOMAIN):
+                return response
+        return None
+
+    async def _server_addresses(self, ns_rrset, response, depth):
+        """Addresses of the nameservers in a referral: the glue, or else looked up in turn."""
+        names = {rdata.target for rdata in ns_rrset}
+        addresses = [rdata.address for rrset in response.additional
+                     if rrset.rdtype == dns.rdatatype.A and rrset.name in names for rdata in rrset]
+        if addresses or depth >= MAX_DEPTH:
+            return addresses
+        for name in names:
+            response = await self._resolve(name, dns.rdatatype.A, depth + 1)
+            if response is not None:
+                rrset = response.get_rrset(response.answer, name, dns.rdataclass.IN, dns.rdatatype.A)
+                if rrset is not None:
+                    return [rdata.address for rdata in rrset]
+        return []
+
+    async def _resolve(self, qname, rdtype, depth=0):
+        """Follows referrals from the closest cached zone; returns the final response or None."""
+        for _ in range(MAX_REFERRALS):
+            zone, servers = self.delegations.closest(qname)
+            # Top-level lookups of names at or below the same child zone share one referral; nameserver
+            # address lookups (depth > 0) never wait, so a referral cannot end up waiting on itself
+            key = None
+            if depth == 0 and len(qname) > len(zone):
+                key = (zone, dns.name.Name(qname.labels[-len(zone) - 1:]))
+            pending = self._referrals.get(key) if key is not None else None
+            if pending is not None:
+                await asyncio.shield(pending)
+                if self.delegations.closest(qname)[0] != zone:
+                    continue
+            waiter = None
+            if key is not None and pending is None:
+                waiter = self._referrals[key] = asyncio.get_running_loop().create_future()
+            try:
+                response = await self._ask(servers, qname, rdtype)
+                if response is None:
+                    return None
+                if response.answer or response.rcode() == dns.rcode.NXDOMAIN or response.flags & dns.flags.AA:
+                    return response
+                ns_rrset = next((rrset for rrset in response.authority if rrset.rdtype == dns.rdatatype.NS
+                                 and rrset.name != zone and rrset.name.is_subdomain(zone)
+                                 and qname.is_subdomain(rrset.name)), None)
+                if ns_rrset is None:
+                    # Neither an answer nor a referral: a lame server's empty reply
+                    return response
+                addresses = await self._server_addresses(ns_rrset, response, depth)
+                if not addresses:
+                    return None
+                self.delegations.put(ns_rrset.name, addresses, ns_rrset.ttl)
+            finally:
+                if waiter is not None:
+                    del self._referrals[key]
+                    waiter.set_result(None)
+        return None
+
+    async def query(self, name, rdtype):
+        """Resolves one name and record type iteratively.
+
+        Returns:
+            DNSAnswer: Never raises for DNS failures; they are reported in status.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            try:
+                qname = dns.name.from_text(name)
+                qtype = dns.rdatatype.from_text(rdtype)
+            except dns.exception.DNSException as e:
+                return DNSAnswer(name, rdtype, 'ERROR', [], None, str(e))
+            for _ in range(MAX_CNAME_CHAIN):
+                response = await self._resolve(qname, qtype)
+                if response is None:
+                    return DNSAnswer(name, rdtype, 'TIMEOUT', [], None,
+                                     f"no authoritative server answered for {qname}")
+                # The answer may carry the whole chain when the targets are in the same zone
+                followed = False
+                for _ in range(MAX_CNAME_CHAIN):
+                    rrset = response.get_rrset(response.answer, qname, dns.rdataclass.IN, qtype)
+                    if rrset is not None:
+                        return DNSAnswer(name, rdtype, 'NOERROR', records_from_rrset(rrset), rrset.ttl, None)
+                    cname = response.get_rrset(response.answer, qname, dns.rdataclass.IN, dns.rdatatype.CNAME)
+                    if cname is None or qtype == dns.rdatatype.CNAME:
+                        break
+                    qname = cname[0].target
+                    followed = True
+                if not followed:
+                    status = 'NXDOMAIN' if response.rcode() == dns.rcode.NXDOMAIN else 'NODATA'
+                    return DNSAnswer(name, rdtype, status, [], negative_ttl(response), None)
+                # Otherwise the chain leaves this response: resolve its target from its own zone
+            return DNSAnswer(name, rdtype, 'ERROR', [], None, "CNAME chain too long")
+
+    def stats(self):
+        return {'queries_sent': self.sent, **self.delegations.stats()}
+
+
+def resolve_iteratively(domains, rdtypes=('A',), **engine_options):
+    """Synchronous wrapper around IterativeEngine.resolve_many for non-async callers."""
+    return asyncio.run(IterativeEngine(**engine_options).resolve_many(domains, rdtypes))
+
+
+if __name__ == "__main__":
+    engine_domains = ['google.com', 'github.com', 'wikipedia.org', 'amazon.com', 'python.org']
+    for domain, profile in resolve_iteratively(engine_domains, ('A', 'NS')).items():
+        for record_type, answer in profile.items():
+            print(f"{domain:<15} {record_type:<3} {answer.status:<8} {', '.join(r.value for r in answer.records)}")
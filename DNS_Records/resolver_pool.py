@@ -0,0 +1,334 @@
+import time
+import random
+import asyncio
+import threading
+import collections
+import concurrent.futures
+
+import dns.name
+import dns.flags
+import dns.query
+import dns.rcode
+import dns.message
+import dns.resolver
+import dns.exception
+import dns.rdatatype
+import dns.rdataclass
+import dns.asyncquery
+
+from DNS_Records.dns_cache import get_default_cache
+
+DEFAULT_TIMEOUT = 2.0
+DEFAULT_LIFETIME = 5.0
+# Weight of the newest sample in the latency and error rate averages
+EWMA_ALPHA = 0.2
+# Latency percentile after which a duplicate query goes to a second upstream
+HEDGE_PERCENTILE = 0.95
+# Samples kept per upstream to estimate the hedge percentile
+LATENCY_WINDOW = 256
+# Samples needed before the percentile is trusted; until then hedge at a quarter of the timeout
+MIN_SAMPLES = 20
+MIN_HEDGE_DELAY = 0.005
+
+
+class UpstreamError(Exception):
+    """An upstream failed to answer usefully (SERVFAIL, REFUSED, a network error)."""
+
+
+class Upstream:
+    """One upstream resolver and its latency and error statistics."""
+
+    def __init__(self, address, port=53):
+        self.address = address
+        self.port = port
+        self.latency = None
+        self.error_rate = 0.0
+        self.queries = 0
+        self.failures = 0
+        self.hedges = 0
+        self.samples = collections.deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def record_success(self, latency):
+        with self._lock:
+            self.queries += 1
+            self.samples.append(latency)
+            self.latency = latency if self.latency is None else (
+                EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.latency)
+            self.error_rate *= 1 - EWMA_ALPHA
+
+    def record_failure(self):
+        with self._lock:
+            self.queries += 1
+            self.failures += 1
+            self.error_rate = EWMA_ALPHA + (1 - EWMA_ALPHA) * self.error_rate
+
+    def score(self, timeout):
+        """Expected cost of a query: latency, with failures counted as a full timeout."""
+        latency = self.latency if self.latency is not None else 0.0
+        return latency * (1 - self.error_rate) + timeout * self.error_rate
+
+    def hedge_delay(self, timeout):
+        """Seconds to wait for this upstream before hedging: its latency percentile."""
+        with self._lock:
+            if len(self.samples) < MIN_SAMPLES:
+                return timeout / 4
+            ordered = sorted(self.samples)
+        return max(MIN_HEDGE_DELAY, ordered[min(len(ordered) - 1, int(len(ordered) * HEDGE_PERCENTILE))])
+
+    def stats(self):
+        with self._lock:
+            return {'address': self.address, 'port': self.port, 'queries': self.queries,
+                    'failures': self.failures, 'hedges': self.hedges,
+                    'latency_ms': None if self.latency is None else round(self.latency * 1000, 3),
+                    'error_rate': round(self.error_rate, 4)}
+
+
+class ResolverPool:
+    """Spreads queries over several upstream resolvers and hedges slow ones.
+
+    Each query goes to the better of two randomly picked upstreams, judged by
+    their latency EWMA and error rate. If it has not answered by that
+    upstream's p95 latency, a duplicate goes to a second upstream and the
+    first answer wins; failed upstreams are skipped in favour of the next.
+
+    It can stand in for dns.resolver.Resolver wherever only resolve() is
+    used (the DNS_Records fetchers), and shares their TTL-aware cache.
+    """
+
+    def __init__(self, nameservers, port=53, timeout=DEFAULT_TIMEOUT, lifetime=DEFAULT_LIFETIME, cache=None,
+                 max_workers=128):
+        """Initialize the pool.
+
+        Args:
+            nameservers (list): Upstream resolver addresses.
+            port (int): Port the upstream resolvers listen on.
+            timeout (float): Seconds to wait for one upstream.
+            lifetime (float): Total seconds allowed per query, hedges and failovers included.
+            cache (DNS_Records.dns_cache.DNSCache, optional): Answer cache. Defaults to
+                the shared cache; False disables it.
+            max_workers (int): Threads available for queries in flight.
+        """
+        if not nameservers:
+            raise ValueError("ResolverPool needs at least one nameserver")
+        self.upstreams = [Upstream(address, port) for address in nameservers]
+        self.nameservers = list(nameservers)
+        self.port = port
+        self.timeout = timeout
+        self.lifetime = lifetime
+        self.cache = (get_default_cache() if cache is None else cache) or None
+        self._executor = None
+        self._max_workers = max_workers
+
+    def ranked(self):
+        """Returns the upstreams in the order to try them for one query."""
+        upstreams = list(self.upstreams)
+        if len(upstreams) > 1:
+            # Power of two choices: spreads load but still favours the faster, healthier upstream
+            first, second = random.sample(upstreams, 2)
+            best = min(first, second, key=lambda upstream: upstream.score(self.timeout))
+            upstreams.remove(best)
+            upstreams.sort(key=lambda upstream: upstream.score(self.timeout))
+            upstreams.insert(0, best)
+        return upstreams
+
+    def stats(self):
+        return [upstream.stats() for upstream in self.upstreams]
+
+    def as_async(self):
+        """Returns an AsyncResolverPool over the same upstreams, statistics and cache."""
+        pool = AsyncResolverPool(self.nameservers, self.port, self.timeout, self.lifetime, self.cache or False)
+        pool.upstreams = self.upstreams
+        return pool
+
+    def _cached(self, qname, rdtype, rdclass, raise_on_no_answer):
+        if not self.cache:
+            return None
+        answer = self.cache.get((qname, rdtype, rdclass))
+        if answer is not None:
+            if answer.rrset is None and raise_on_no_answer:
+                raise dns.resolver.NoAnswer(response=answer.response)
+            return answer
+        answer = self.cache.get((qname, dns.rdatatype.ANY, rdclass))
+        if answer is not None and answer.response.rcode() == dns.rcode.NXDOMAIN:
+            raise dns.resolver.NXDOMAIN(qnames=[qname], responses={qname: answer.response})
+        return None
+
+    def _answer(self, qname, rdtype, rdclass, response, raise_on_no_answer):
+        """Turns a response into an Answer the way dns.resolver.Resolver does, caching it."""
+        rcode = response.rcode()
+        if rcode == dns.rcode.NXDOMAIN:
+            if self.cache:
+                self.cache.put((qname, dns.rdatatype.ANY, rdclass),
+                               dns.resolver.Answer(qname, dns.rdatatype.ANY, rdclass, response))
+            raise dns.resolver.NXDOMAIN(qnames=[qname], responses={qname: response})
+        answer = dns.resolver.Answer(qname, rdtype, rdclass, response)
+        if self.cache:
+            self.cache.put((qname, rdtype, rdclass), answer)
+        if answer.rrset is None and raise_on_no_answer:
+            raise dns.resolver.NoAnswer(response=response)
+        return answer
+
+    @staticmethod
+    def _prepare(qname, rdtype, rdclass):
+        if isinstance(qname, str):
+            qname = dns.name.from_text(qname)
+        rdtype = dns.rdatatype.RdataType.make(rdtype)
+        rdclass = dns.rdataclass.RdataClass.make(rdclass)
+        return qname, rdtype, rdclass, dns.message.make_query(qname, rdtype, rdclass)
+
+    def _check(self, upstream, response, start):
+        if response.rcode() not in (dns.rcode.NOERROR, dns.rcode.NXDOMAIN):
+            upstream.record_failure()
+            raise UpstreamError(f"{upstream.address} answered {dns.rcode.to_text(response.rcode())}")
+        upstream.record_success(time.perf_counter() - start)
+        return response
+
+    def _query_upstream(self, upstream, request):
+        start = time.perf_counter()
+        try:
+            response = dns.query.udp(request, upstream.address, self.timeout, upstream.port)
+            if response.flags & dns.flags.TC:
+                response = dns.query.tcp(request, upstream.address, self.timeout, upstream.port)
+        except (dns.exception.DNSException, OSError) as e:
+            upstream.record_failure()
+            raise UpstreamError(f"{upstream.address}: {e}") from e
+        return self._check(upstream, response, start)
+
+    def resolve(self, qname, rdtype='A', rdclass='IN', tcp=False, source=None, raise_on_no_answer=True,
+                source_port=0, lifetime=None, search=None):
+        """Resolves a query like dns.resolver.Resolver.resolve.
+
+        Raises:
+            dns.resolver.NXDOMAIN, dns.resolver.NoAnswer: As dnspython does.
+            dns.resolver.NoNameservers: If every upstream failed.
+            dns.resolver.LifetimeTimeout: If no upstream answered within the lifetime.
+        """
+        qname, rdtype, rdclass, request = self._prepare(qname, rdtype, rdclass)
+        answer = self._cached(qname, rdtype, rdclass, raise_on_no_answer)
+        if answer is not None:
+            return answer
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(self._max_workers)
+        lifetime = lifetime or self.lifetime
+        deadline = time.perf_counter() + lifetime
+        candidates = collections.deque(self.ranked())
+        errors = []
+        running = {}
+
+        def launch():
+            upstream = candidates.popleft()
+            running[self._executor.submit(self._query_upstream, upstream, request)] = upstream
+            return upstream
+
+        primary = launch()
+        hedge_at = time.perf_counter() + primary.hedge_delay(self.timeout)
+        while running:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            wait_until = min(deadline, hedge_at) if candidates and len(running) == 1 else deadline
+            done, _ = concurrent.futures.wait(running, timeout=max(0.0, wait_until - now),
+                                              return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                upstream = running.pop(future)
+                try:
+                    response = future.result()
+                except UpstreamError as e:
+                    errors.append((upstream.address, False, upstream.port, e, None))
+                    continue
+                return self._answer(qname, rdtype, rdclass, response, raise_on_no_answer)
+            if not candidates:
+                continue
+            if not running:
+                # Every upstream tried so far failed: fail over to the next one
+                primary = launch()
+                hedge_at = time.perf_counter() + primary.hedge_delay(self.timeout)
+            elif not done and time.perf_counter() >= hedge_at:
+                primary.hedges += 1
+                launch()
+        if running:
+            raise dns.resolver.LifetimeTimeout(timeout=lifetime, errors=errors)
+        raise dns.resolver.NoNameservers(request=request, errors=errors)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+class AsyncResolverPool(ResolverPool):
+    """ResolverPool for asyncio code; stands in for dns.asyncresolver.Resolver (e.g. in AsyncDNSEngine)."""
+
+    async def _query_upstream(self, upstream, request):
+        start = time.perf_counter()
+        try:
+            response = await dns.asyncquery.udp(request, upstream.address, self.timeout, upstream.port)
+            if response.flags & dns.flags.TC:
+                response = await dns.asyncquery.tcp(request, upstream.address, self.timeout, upstream.port)
+        except (dns.exception.DNSException, OSError) as e:
+            upstream.record_failure()
+            raise UpstreamError(f"{upstream.address}: {e}") from e
+        return self._check(upstream, response, start)
+
+    async def resolve(self, qname, rdtype='A', rdclass='IN', tcp=False, source=None, raise_on_no_answer=True,
+                      source_port=0, lifetime=None, search=None):
+        """Resolves a query like dns.asyncresolver.Resolver.resolve; see ResolverPool.resolve."""
+        qname, rdtype, rdclass, request = self._prepare(qname, rdtype, rdclass)
+        answer = self._cached(qname, rdtype, rdclass, raise_on_no_answer)
+        if answer is not None:
+            return answer
+        lifetime = lifetime or self.lifetime
+        deadline = time.perf_counter() + lifetime
+        candidates = collections.deque(self.ranked())
+        errors = []
+        running = {}
+
+        def launch():
+            upstream = candidates.popleft()
+            running[asyncio.ensure_future(self._query_upstream(upstream, request))] = upstream
+            return upstream
+
+        primary = launch()
+        hedge_at = time.perf_counter() + primary.hedge_delay(self.timeout)
+        try:
+            while running:
+                now = time.perf_counter()
+                if now >= deadline:
+                    break
+                wait_until = min(deadline, hedge_at) if candidates and len(running) == 1 else deadline
+                done, _ = await asyncio.wait(running, timeout=max(0.0, wait_until - now),
+                                             return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    upstream = running.pop(task)
+                    try:
+                        response = task.result()
+                    except UpstreamError as e:
+                        errors.append((upstream.address, False, upstream.port, e, None))
+                        continue
+                    return self._answer(qname, rdtype, rdclass, response, raise_on_no_answer)
+                if not candidates:
+                    continue
+                if not running:
+                    primary = launch()
+                    hedge_at = time.perf_counter() + primary.hedge_delay(self.timeout)
+                elif not done and time.perf_counter() >= hedge_at:
+                    primary.hedges += 1
+                    launch()
+        finally:
+            for task in running:
+                task.cancel()
+        if running:
+            raise dns.resolver.LifetimeTimeout(timeout=lifetime, errors=errors)
+        raise dns.resolver.NoNameservers(request=request, errors=errors)
+
+
+if __name__ == "__main__":
+    pool = ResolverPool(['1.1.1.1', '8.8.8.8', '9.9.9.9'], cache=False)
+    for domain in ['google.com', 'wikipedia.org', 'amazon.com', 'reddit.com', 'microsoft.com'] * 10:
+        try:
+            pool.resolve(domain, 'A')
+        except dns.exception.DNSException as e:
+            print(f"{domain}: {e}")
+    for upstream in pool.stats():
+        print(upstream)
@@ -0,0 +1,250 @@
+import asyncio
+import ipaddress
+
+from DNS_Records.dns_engine import AsyncDNSEngine, DEFAULT_CONCURRENCY
+
+# RFC 7208 4.6.4: at most 10 mechanisms and modifiers that need DNS lookups per evaluation
+MAX_LOOKUPS = 10
+# RFC 7208 4.6.4: at most 10 MX hosts are looked up for one 'mx' mechanism
+MAX_MX_HOSTS = 10
+# Mechanisms and modifiers that count against MAX_LOOKUPS
+LOOKUP_TERMS = ('include', 'a', 'mx', 'ptr', 'exists', 'redirect')
+
+
+def parse_dual_cidr(spec):
+    """Splits 'domain/24//64' into (domain or None, IPv4 prefix length, IPv6 prefix length)."""
+    spec, _, cidr6 = spec.partition('//')
+    spec, _, cidr4 = spec.partition('/')
+    return spec or None, int(cidr4) if cidr4 else 32, int(cidr6) if cidr6 else 128
+
+
+class SPFFlattener:
+    """Expands SPF records into the address ranges they authorize.
+
+    Every domain's expansion is memoized, so an include shared by thousands
+    of domains (_spf.google.com, spf.protection.outlook.com, sendgrid.net)
+    is resolved once per flattener however many records reference it. The
+    includes of one record are expanded concurrently.
+    """
+
+    def __init__(self, engine=None, max_lookups=MAX_LOOKUPS):
+        """Initialize the flattener.
+
+        Args:
+            engine (DNS_Records.dns_engine.AsyncDNSEngine, optional): Engine to resolve with.
+                Defaults to one on the system resolvers and the shared DNS cache.
+            max_lookups (int): DNS lookup limit per evaluation; records over it are a permerror.
+        """
+        self.engine = engine or AsyncDNSEngine()
+        self.max_lookups = max_lookups
+        self.expansions = {}
+        # domain -> domains its expansion is waiting on, to catch include loops
+        self._awaiting = {}
+
+    async def spf_record(self, domain):
+        """Returns (the domain's SPF record or None, error or None)."""
+        answer = await self.engine.query(domain, 'TXT')
+        if answer.status in ('TIMEOUT', 'ERROR'):
+            return None, f"temperror: TXT lookup for {domain} failed: {answer.error}"
+        records = [''.join(record.data['strings']) for record in answer.records if record.rdtype == 'TXT']
+        records = [record for record in records if record.lower().split(' ', 1)[0] == 'v=spf1']
+        if len(records) > 1:
+            return None, f"permerror: {domain} has {len(records)} SPF records"
+        return (records[0] if records else None), None
+
+    async def addresses(self, domain, cidr4, cidr6):
+        """Networks of the A and AAAA records of domain, widened to the given prefix lengths."""
+        answers = await asyncio.gather(self.engine.query(domain, 'A'), self.engine.query(domain, 'AAAA'))
+        networks = set()
+        for answer, prefix in zip(answers, (cidr4, cidr6)):
+            for record in answer.records:
+                if record.rdtype in ('A', 'AAAA'):
+                    networks.add(ipaddress.ip_network(f"{record.value}/{prefix}", strict=False))
+        return networks
+
+    async def mx_addresses(self, domain, cidr4, cidr6):
+        answer = await self.engine.query(domain, 'MX')
+        hosts = [record.data['exchange'] for record in answer.records if record.rdtype == 'MX'][:MAX_MX_HOSTS]
+        networks = set()
+        for host_networks in await asyncio.gather(*(self.addresses(host, cidr4, cidr6) for host in hosts)):
+            networks |= host_networks
+        return networks
+
+    def _reaches(self, start, target):
+        """True if start is (transitively) waiting on target's expansion."""
+        seen, stack = set(), [start]
+        while stack:
+            domain = stack.pop()
+            if domain == target:
+                return True
+            if domain not in seen:
+                seen.add(domain)
+                stack.extend(self._awaiting.get(domain, ()))
+        return False
+
+    async def expand(self, domain, parent=None):
+        """Returns the memoized expansion of domain's SPF record.
+
+        Args:
+            domain (str): Domain whose SPF record to expand.
+            parent (str, optional): Domain whose include or redirect led here.
+
+        Returns:
+            dict: 'networks' (set of ip_network), 'lookups' (DNS lookups the record
+            and everything under it cost), 'unresolved' (terms that cannot be turned
+            into addresses, such as exists: and ptr), 'errors' and 'found'.
+        """
+        domain = domain.rstrip('.').lower()
+        if parent is not None:
+            if self._reaches(domain, parent):
+                return {'networks': set(), 'lookups': 0, 'unresolved': [], 'found': False,
+                        'errors': [f"permerror: include loop through {domain}"]}
+            self._awaiting.setdefault(parent, set()).add(domain)
+        try:
+            if domain not in self.expansions:
+                self.expansions[domain] = asyncio.ensure_future(self._expand(domain))
+            return await self.expansions[domain]
+        finally:
+            if parent is not None:
+                self._awaiting[parent].discard(domain)
+
+    async def _expand(self, domain):
+        record, error = await self.spf_record(domain)
+        result = {'networks': set(), 'lookups': 0, 'unresolved': [], 'errors': [], 'found': record is not None}
+        if error:
+            result['errors'].append(error)
+        if record is None:
+            return result
+        jobs = []
+        redirect = None
+        has_all = False
+        for term in record.split()[1:]:
+            qualifier = '+'
+            if term[0] in '+-~?':
+                qualifier, term = term[0], term[1:]
+            name, sep, value = term.partition(':')
+            if not sep and '=' in term:
+                name, _, value = term.partition('=')
+                name = name.lower()
+                if name == 'redirect':
+                    redirect = value
+                continue
+            if not sep and '/' in name:
+                name, value = name.split('/', 1)
+                value = '/' + value
+            name = name.lower()
+            if name in LOOKUP_TERMS:
+                result['lookups'] += 1
+            if name == 'all':
+                has_all = True
+            elif '%' in value:
+                result['unresolved'].append(term)
+            elif name in ('ip4', 'ip6'):
+                try:
+                    network = ipaddress.ip_network(value, strict=False)
+                except ValueError:
+                    result['errors'].append(f"permerror: bad {name} network {value!r} in {domain}")
+                    continue
+                if qualifier == '+':
+                    result['networks'].add(network)
+            elif name in ('ptr', 'exists'):
+                result['unresolved'].append(term)
+            elif name == 'include':
+                # Only a pass qualifier authorizes the include's addresses, but its lookups count regardless
+                jobs.append((self.expand(value, domain), qualifier == '+'))
+            elif name in ('a', 'mx'):
+                try:
+                    target, cidr4, cidr6 = parse_dual_cidr(value)
+                except ValueError:
+                    result['errors'].append(f"permerror: bad prefix length in {term!r} in {domain}")
+                    continue
+                if cidr4 > 32 or cidr6 > 128:
+                    result['errors'].append(f"permerror: bad prefix length in {term!r} in {domain}")
+                elif qualifier == '+':
+                    lookup = self.addresses if name == 'a' else self.mx_addresses
+                    jobs.append((lookup(target or domain, cidr4, cidr6), True))
+            else:
+                result['errors'].append(f"permerror: unknown mechanism {term!r} in {domain}")
+        if redirect and not has_all:
+            result['lookups'] += 1
+            jobs.append((self.expand(redirect, domain), True))
+        outcomes = await asyncio.gather(*(job for job, _ in jobs))
+        for (_, authorizes), outcome in zip(jobs, outcomes):
+            if isinstance(outcome, dict):
+                result['lookups'] += outcome['lookups']
+                result['unresolved'].extend(outcome['unresolved'])
+                result['errors'].extend(outcome['errors'])
+                if not outcome['found'] and not outcome['errors']:
+                    result['errors'].append("permerror: include or redirect target has no SPF record")
+                outcome = outcome['networks']
+            if authorizes:
+                result['networks'] |= outcome
+        return result
+
+    async def flatten(self, domain):
+        """Flattens domain's SPF record into merged CIDRs.
+
+        Returns:
+            dict: 'domain', 'status' ('pass' if the record is valid, 'none' without
+            a record, 'permerror' or 'temperror'), 'lookups', 'ip4' and 'ip6' (merged
+            CIDRs), 'unresolved' and 'errors'.
+        """
+        expansion = await self.expand(domain)
+        errors = list(expansion['errors'])
+        if expansion['lookups'] > self.max_lookups:
+            errors.insert(0, f"permerror: {expansion['lookups']} DNS lookups, more than {self.max_lookups}")
+        status = 'pass' if expansion['found'] else 'none'
+        if errors:
+            status = 'temperror' if all(error.startswith('temperror') for error in errors) else 'permerror'
+        networks = expansion['networks']
+        return {
+            'domain': domain,
+            'status': status,
+            'lookups': expansion['lookups'],
+            'ip4': [str(network) for network in ipaddress.collapse_addresses(
+                network for network in networks if network.version == 4)],
+            'ip6': [str(network) for network in ipaddress.collapse_addresses(
+                network for network in networks if network.version == 6)],
+            'unresolved': expansion['unresolved'],
+            'errors': errors,
+        }
+
+    async def stream(self, domains, in_flight=DEFAULT_CONCURRENCY):
+        """Flattens many domains with at most in_flight expansions running.
+
+        Yields:
+            dict: One flatten() result per domain, in completion order.
+        """
+        pending = set()
+        for domain in domains:
+            if len(pending) >= in_flight:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+            pending.add(asyncio.ensure_future(self.flatten(domain)))
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+
+
+def flatten_spf(domains, **engine_options):
+    """Flattens the SPF records of several domains, sharing one memo of include expansions.
+
+    Args:
+        domains (list): Domains whose SPF records to flatten.
+        **engine_options: Passed to AsyncDNSEngine (nameservers, port, ...).
+
+    Returns:
+        dict: domain -> SPFFlattener.flatten() result.
+    """
+    async def run():
+        flattener = SPFFlattener(AsyncDNSEngine(**engine_options))
+        return {result['domain']: result async for result in flattener.stream(domains)}
+
+    return asyncio.run(run())
+
+
+if __name__ == "__main__":
+    for domain, flattened in flatten_spf(['google.com', 'microsoft.com', 'github.com']).items():
+        print(domain, flattened['status'], flattened['lookups'], flattened['ip4'] + flattened['ip6'])
@@ -0,0 +1,87 @@
+import random
+import asyncio
+
+# Tags combined with each word when permutations are enabled, e.g. api-dev, dev-api
+PERMUTATION_TAGS = ('dev', 'test', 'staging', 'stage', 'prod', 'qa', 'uat', 'api', 'admin', 'internal', 'old', 'new')
+# Numeric suffixes tried for each word, e.g. mail1, mail2
+PERMUTATION_NUMBERS = range(1, 4)
+# Random names queried to tell whether a parent answers for every name
+WILDCARD_PROBES = 3
+
+
+def permutations(word, tags=PERMUTATION_TAGS, numbers=PERMUTATION_NUMBERS):
+    """Yields common variations of a subdomain label: numbered and tagged forms."""
+    for number in numbers:
+        yield f"{word}{number}"
+    for tag in tags:
+        if tag != word:
+            yield f"{word}-{tag}"
+            yield f"{tag}-{word}"
+
+
+def candidate_labels(words, permute=False):
+    """Yields subdomain labels from a stream of words, optionally with their permutations.
+
+    Words are consumed lazily, so a wordlist never has to fit in memory.
+
+    Args:
+        words (iterable): Wordlist entries, e.g. Toolkit.bulk.read_targets(path).
+        permute (bool): Also yield the permutations() of every word.
+
+    Yields:
+        str: Lowercase labels (may contain dots for deeper names, e.g. 'api.dev').
+    """
+    for word in words:
+        word = word.strip().strip('.').lower()
+        if not word:
+            continue
+        yield word
+        if permute:
+            yield from permutations(word)
+
+
+async def wildcard_fingerprint(engine, parent, rdtype='A', probes=WILDCARD_PROBES):
+    """Checks whether parent answers for names that cannot exist, and with what.
+
+    Args:
+        engine (DNS_Records.dns_engine.AsyncDNSEngine): Engine to query with.
+        parent (str): Domain whose subdomains are being enumerated.
+        rdtype (str): Record type the enumeration resolves.
+        probes (int): Number of random names to query.
+
+    Returns:
+        frozenset: Values the wildcard answers with; empty if parent has no wildcard.
+    """
+    names = [f"{random.getrandbits(64):016x}.{parent}" for _ in range(probes)]
+    answers = await asyncio.gather(*(engine.query(name, rdtype) for name in names))
+    return frozenset(record.value for answer in answers for record in answer.records if record.rdtype == rdtype)
+
+
+class WildcardFilter:
+    """Remembers each parent's wildcard fingerprint so every parent is probed only once."""
+
+    def __init__(self, engine, rdtype='A'):
+        self.engine = engine
+        self.rdtype = rdtype
+        self.fingerprints = {}
+        self._probing = {}
+
+    async def fingerprint(self, parent):
+        """Returns the wildcard fingerprint of parent, probing it on first use."""
+        parent = parent.rstrip('.').lower()
+        fingerprint = self.fingerprints.get(parent)
+        if fingerprint is not None:
+            return fingerprint
+        if parent not in self._probing:
+            self._probing[parent] = asyncio.ensure_future(wildcard_fingerprint(self.engine, parent, self.rdtype))
+        fingerprint = self.fingerprints[parent] = await self._probing[parent]
+        self._probing.pop(parent, None)
+        return fingerprint
+
+    async def is_wildcard(self, answer):
+        """True if answer carries nothing but what its parent's wildcard answers with."""
+        values = {record.value for record in answer.records if record.rdtype == self.rdtype}
+        if not values:
+            return False
+        fingerprint = await self.fingerprint(answer.name.rstrip('.').split('.', 1)[1])
+        return values <= fingerprint
@@ -0,0 +1,426 @@
+import math
+import time
+import random
+import socket
+import struct
+import asyncio
+import collections
+
+import dns.name
+import dns.rcode
+import dns.message
+import dns.rdatatype
+import dns.asyncquery
+import dns.resolver
+
+from DNS_Records.dns_engine import (AsyncDNSEngine, DNSAnswer, DNSRecord, DEFAULT_TIMEOUT, records_from_rrset,
+                                    negative_ttl)
+
+DEFAULT_SOCKETS = 4
+# Receive buffer per socket, so bursts of answers are not dropped before they are read
+SOCKET_BUFFER = 4 * 1024 * 1024
+DEFAULT_RETRIES = 2
+DEFAULT_MAX_IN_FLIGHT = 20000
+# Queries outstanding on one socket, a quarter of the 16-bit transaction ID space so free IDs are quick to draw
+MAX_PENDING_PER_SOCKET = 16384
+TICK_INTERVAL = 0.05
+
+# Query header after the transaction ID: RD flag set, one question, no other records
+QUERY_HEADER = struct.pack('!HHHHH', 0x0100, 1, 0, 0, 0)
+
+# Record types whose rdata the fast parser decodes itself; anything else goes through dnspython
+FAST_TYPES = {
+    dns.rdatatype.A, dns.rdatatype.AAAA, dns.rdatatype.CNAME, dns.rdatatype.NS, dns.rdatatype.PTR,
+    dns.rdatatype.MX, dns.rdatatype.SRV,
+}
+
+# Fields of a pending query entry
+CALLBACK, WIRE, QUESTION, NAME, RDTYPE, QTYPE, TRIES, START = range(8)
+
+
+def encode_name(name):
+    """Returns the uncompressed wire form of a domain name."""
+    try:
+        labels = name.rstrip('.').encode('ascii').split(b'.')
+    except UnicodeEncodeError:
+        return dns.name.from_text(name).to_wire()
+    wire = bytearray()
+    for label in labels:
+        if not 0 < len(label) < 64:
+            return dns.name.from_text(name).to_wire()
+        wire.append(len(label))
+        wire += label
+    wire.append(0)
+    return bytes(wire)
+
+
+def read_name(data, offset):
+    """Decodes a possibly compressed name.
+
+    Returns:
+        tuple: (name text with trailing dot, offset just past the name in place).
+    """
+    labels = []
+    end = None
+    jumps = 0
+    while True:
+        length = data[offset]
+        if length >= 0xC0:
+            if end is None:
+                end = offset + 2
+            jumps += 1
+            if jumps > 64:
+                raise ValueError("compression loop")
+            offset = ((length & 0x3F) << 8) | data[offset + 1]
+            continue
+        offset += 1
+        if length == 0:
+            break
+        labels.append(data[offset:offset + length].decode('ascii'))
+        offset += length
+    return '.'.join(labels) + '.', offset if end is None else end
+
+
+def skip_name(data, offset):
+    while True:
+        length = data[offset]
+        if length >= 0xC0:
+            return offset + 2
+        offset += 1 + length
+        if length == 0:
+            return offset
+
+
+def decode_rdata(data, qtype, offset, length):
+    """Returns (presentation value, parsed fields) of one rdata in the fast path."""
+    if qtype == dns.rdatatype.A:
+        address = socket.inet_ntoa(data[offset:offset + length])
+        return address, {'address': address}
+    if qtype == dns.rdatatype.AAAA:
+        address = socket.inet_ntop(socket.AF_INET6, data[offset:offset + length])
+        return address, {'address': address}
+    if qtype == dns.rdatatype.MX:
+        preference, = struct.unpack_from('!H', data, offset)
+        exchange, _ = read_name(data, offset + 2)
+        return f"{preference} {exchange}", {'preference': preference, 'exchange': exchange}
+    if qtype == dns.rdatatype.SRV:
+        priority, weight, port = struct.unpack_from('!HHH', data, offset)
+        target, _ = read_name(data, offset + 6)
+        return f"{priority} {weight} {port} {target}", {'priority': priority, 'weight': weight, 'port': port,
+                                                        'target': target}
+    target, _ = read_name(data, offset)
+    return target, {'target': target}
+
+
+def parse_response(data, name, rdtype, qtype):
+    """Builds a DNSAnswer straight from response bytes.
+
+    Common record types are decoded in place; other types and anything the
+    fast parser cannot read fall back to dnspython.
+    """
+    if qtype in FAST_TYPES:
+        try:
+            return parse_fast(data, name, rdtype, qtype)
+        except (ValueError, IndexError, struct.error, UnicodeDecodeError, OSError):
+            pass
+    return parse_message(dns.message.from_wire(data), name, rdtype, qtype)
+
+
+def parse_fast(data, name, rdtype, qtype):
+    rcode = data[3] & 0x0F
+    question_count, answer_count, authority_count, _ = struct.unpack_from('!HHHH', data, 4)
+    offset = 12
+    for _ in range(question_count):
+        offset = skip_name(data, offset) + 4
+    records = []
+    ttl = None
+    for _ in range(answer_count):
+        owner_offset = offset
+        offset = skip_name(data, offset)
+        record_type, _, record_ttl, length = struct.unpack_from('!HHIH', data, offset)
+        offset += 10
+        if record_type == qtype:
+            if data[owner_offset] == 0xC0 and data[owner_offset + 1] == 12:
+                # Compressed pointer to the question, i.e. the queried name itself
+                owner = name if name.endswith('.') else name + '.'
+            else:
+                owner, _ = read_name(data, owner_offset)
+            value, fields = decode_rdata(data, qtype, offset, length)
+            records.append(DNSRecord(owner, rdtype, record_ttl, value, fields))
+            ttl = record_ttl if ttl is None else min(ttl, record_ttl)
+        offset += length
+    if rcode == dns.rcode.NOERROR and records:
+        if len(records) > 1:
+            # dnspython reports one TTL per RRset, the smallest of its records
+            records = [record._replace(ttl=ttl) for record in records]
+        return DNSAnswer(name, rdtype, 'NOERROR', records, ttl, None)
+    if rcode not in (dns.rcode.NOERROR, dns.rcode.NXDOMAIN):
+        return DNSAnswer(name, rdtype, 'ERROR', [], None, dns.rcode.to_text(rcode))
+    negative = None
+    for _ in range(authority_count):
+        offset = skip_name(data, offset)
+        record_type, _, record_ttl, length = struct.unpack_from('!HHIH', data, offset)
+        offset += 10
+        if record_type == dns.rdatatype.SOA:
+            # The SOA minimum is the last field of its rdata
+            minimum, = struct.unpack_from('!I', data, offset + length - 4)
+            negative = min(record_ttl, minimum)
+        offset += length
+    return DNSAnswer(name, rdtype, 'NXDOMAIN' if rcode == dns.rcode.NXDOMAIN else 'NODATA', [], negative, None)
+
+
+def parse_message(message, name, rdtype, qtype):
+    rcode = message.rcode()
+    if rcode == dns.rcode.NXDOMAIN:
+        return DNSAnswer(name, rdtype, 'NXDOMAIN', [], negative_ttl(message), None)
+    if rcode != dns.rcode.NOERROR:
+        return DNSAnswer(name, rdtype, 'ERROR', [], None, dns.rcode.to_text(rcode))
+    rrsets = [rrset for rrset in message.answer if rrset.rdtype == qtype]
+    if not rrsets:
+        return DNSAnswer(name, rdtype, 'NODATA', [], negative_ttl(message), None)
+    records = [record for rrset in rrsets for record in records_from_rrset(rrset)]
+    return DNSAnswer(name, rdtype, 'NOERROR', records, min(rrset.ttl for rrset in rrsets), None)
+
+
+class RawUDPEngine(AsyncDNSEngine):
+    """Pipelined DNS engine that multiplexes many queries over a few UDP sockets.
+
+    Queries are built from preallocated wire templates and sent without
+    dnspython's per-query socket and message objects. Each socket drains
+    every queued response per wakeup, responses are matched back by
+    transaction ID and question, and unanswered queries are resent by a
+    timer wheel. Truncated responses are retried over TCP.
+
+    It is a drop-in AsyncDNSEngine for bulk work where queries per second
+    matter. It skips the shared DNS cache and the resolver's search list.
+    """
+
+    def __init__(self, nameservers=None, port=53, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES,
+                 sockets=DEFAULT_SOCKETS, concurrency=DEFAULT_MAX_IN_FLIGHT):
+        """Initialize the engine.
+
+        Args:
+            nameservers (list, optional): Upstream resolver addresses. Defaults to
+                the system configuration.
+            port (int): Port the upstream resolvers listen on.
+            timeout (float): Seconds to wait before resending a query.
+            retries (int): Times a query is resent before it times out.
+            sockets (int): UDP sockets queries are spread over, round robin
+                across the nameservers. More are opened when concurrency needs
+                them, so no socket has over MAX_PENDING_PER_SOCKET queries.
+            concurrency (int): Maximum number of queries in flight.
+        """
+        self.nameservers = list(nameservers or dns.resolver.get_default_resolver().nameservers)
+        self.port = port
+        self.timeout = timeout
+        self.retries = retries
+        self.socket_count = max(sockets, len(self.nameservers), math.ceil(concurrency / MAX_PENDING_PER_SOCKET))
+        self.concurrency = concurrency
+        # Queries the sockets can hold; stream() clamps its in_flight to it
+        self.capacity = self.socket_count * MAX_PENDING_PER_SOCKET
+        self.sockets = []
+        self.loop = None
+        self.pending = [{} for _ in range(self.socket_count)]
+        self.outstanding = 0
+        self.sent = 0
+        self.retransmits = 0
+        self._next_socket = 0
+        self._type_tails = {}
+        self._ticks_per_timeout = max(1, math.ceil(timeout / TICK_INTERVAL))
+        self._wheel = [[] for _ in range(self._ticks_per_timeout + 1)]
+        self._tick = 0
+        self._ticking = False
+        self._opening = None
+        self._slots = None
+
+    async def open(self):
+        """Opens the socket pool; called automatically by the first query."""
+        if self._opening is None:
+            self._opening = asyncio.ensure_future(self._open())
+        await self._opening
+
+    async def _open(self):
+        self.loop = asyncio.get_running_loop()
+        for index in range(self.socket_count):
+            nameserver = self.nameservers[index % len(self.nameservers)]
+            family = socket.AF_INET6 if ':' in nameserver else socket.AF_INET
+            sock = socket.socket(family, socket.SOCK_DGRAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER)
+            sock.setblocking(False)
+            sock.connect((nameserver, self.port))
+            self.loop.add_reader(sock.fileno(), self._read_ready, index)
+            self.sockets.append(sock)
+        self._slots = asyncio.Semaphore(min(self.concurrency, self.capacity))
+
+    def close(self):
+        """Closes the socket pool."""
+        for sock in self.sockets:
+            self.loop.remove_reader(sock.fileno())
+            sock.close()
+        self.sockets = []
+        self._opening = None
+
+    def _send(self, index, wire):
+        try:
+            self.sockets[index].send(wire)
+        except OSError:
+            # A full send buffer or an ICMP error from an earlier query; the timer wheel resends
+            pass
+
+    def _read_ready(self, index):
+        sock = self.sockets[index]
+        for _ in range(1024):
+            try:
+                data = sock.recv(4096)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                # ICMP port unreachable and the like; unanswered queries time out on their own
+                continue
+            self._on_response(index, data)
+
+    def _question(self, name, rdtype):
+        tail = self._type_tails.get(rdtype)
+        if tail is None:
+            qtype = dns.rdatatype.from_text(rdtype)
+            tail = self._type_tails[rdtype] = (qtype, struct.pack('!HH', qtype, 1))
+        return tail[0], encode_name(name.lower()) + tail[1]
+
+    def _submit(self, name, rdtype, callback):
+        qtype, question = self._question(name, rdtype)
+        index = self._next_socket
+        self._next_socket = (index + 1) % self.socket_count
+        if len(self.pending[index]) >= MAX_PENDING_PER_SOCKET:
+            index = min(range(self.socket_count), key=lambda i: len(self.pending[i]))
+        pending = self.pending[index]
+        txid = random.getrandbits(16)
+        while txid in pending:
+            txid = random.getrandbits(16)
+        wire = struct.pack('!H', txid) + QUERY_HEADER + question
+        entry = [callback, wire, question, name, rdtype, qtype, 1, time.perf_counter()]
+        pending[txid] = entry
+        self.outstanding += 1
+        self.sent += 1
+        self._send(index, wire)
+        self._schedule(index, txid, entry)
+
+    def _schedule(self, index, txid, entry):
+        slot = (self._tick + self._ticks_per_timeout) % len(self._wheel)
+        self._wheel[slot].append((index, txid, entry))
+        if not self._ticking:
+            self._ticking = True
+            asyncio.get_running_loop().call_later(TICK_INTERVAL, self._on_tick)
+
+    def _on_tick(self):
+        self._tick += 1
+        slot = self._tick % len(self._wheel)
+        expired, self._wheel[slot] = self._wheel[slot], []
+        for index, txid, entry in expired:
+            pending = self.pending[index]
+            if pending.get(txid) is not entry:
+                continue
+            if entry[TRIES] <= self.retries:
+                entry[TRIES] += 1
+                self.retransmits += 1
+                self._send(index, entry[WIRE])
+                self._wheel[(self._tick + self._ticks_per_timeout) % len(self._wheel)].append((index, txid, entry))
+                continue
+            del pending[txid]
+            self.outstanding -= 1
+            elapsed = time.perf_counter() - entry[START]
+            entry[CALLBACK](DNSAnswer(entry[NAME], entry[RDTYPE], 'TIMEOUT', [], None,
+                                      f"no response after {entry[TRIES]} attempts"), elapsed)
+        if self.outstanding:
+            asyncio.get_running_loop().call_later(TICK_INTERVAL, self._on_tick)
+        else:
+            self._ticking = False
+
+    def _on_response(self, index, data):
+        if len(data) < 12:
+            return
+        pending = self.pending[index]
+        txid = (data[0] << 8) | data[1]
+        entry = pending.get(txid)
+        if entry is None:
+            return
+        question = entry[QUESTION]
+        echoed = data[12:12 + len(question)]
+        if echoed != question and echoed.lower() != question:
+            # Not an answer to this query (stale or spoofed); keep waiting
+            return
+        del pending[txid]
+        if data[2] & 0x02:
+            # Truncated: the query stays outstanding until TCP answers it
+            asyncio.ensure_future(self._retry_tcp(index, entry))
+            return
+        self.outstanding -= 1
+        try:
+            answer = parse_response(data, entry[NAME], entry[RDTYPE], entry[QTYPE])
+        except Exception as e:
+            answer = DNSAnswer(entry[NAME], entry[RDTYPE], 'ERROR', [], None, str(e))
+        entry[CALLBACK](answer, time.perf_counter() - entry[START])
+
+    async def _retry_tcp(self, index, entry):
+        nameserver = self.nameservers[index % len(self.nameservers)]
+        try:
+            request = dns.message.make_query(entry[NAME], entry[RDTYPE])
+            response = await dns.asyncquery.tcp(request, nameserver, timeout=self.timeout * (self.retries + 1),
+                                                port=self.port)
+            answer = parse_message(response, entry[NAME], entry[RDTYPE], entry[QTYPE])
+        except Exception as e:
+            answer = DNSAnswer(entry[NAME], entry[RDTYPE], 'ERROR', [], None, str(e))
+        self.outstanding -= 1
+        entry[CALLBACK](answer, time.perf_counter() - entry[START])
+
+    async def query(self, name, rdtype):
+        """Resolves one name and record type.
+
+        Returns:
+            DNSAnswer: Never raises for DNS failures; they are reported in status.
+        """
+        await self.open()
+        async with self._slots:
+            future = asyncio.get_running_loop().create_future()
+            self._submit(name, rdtype, lambda answer, elapsed: future.done() or future.set_result(answer))
+            return await future
+
+    async def stream(self, queries, in_flight=DEFAULT_MAX_IN_FLIGHT):
+        """Resolves (name, rdtype) pairs with at most in_flight queries outstanding.
+
+        Unlike AsyncDNSEngine.stream no task or future is created per query;
+        answers are handed over by callback. in_flight is clamped to the
+        engine's capacity, since each socket has only 65,536 transaction IDs.
+
+        Yields:
+            tuple: (DNSAnswer, elapsed) in completion order.
+        """
+        await self.open()
+        in_flight = min(in_flight, self.capacity)
+        answers = collections.deque()
+        ready = asyncio.Event()
+
+        def deliver(answer, elapsed):
+            answers.append((answer, elapsed))
+            ready.set()
+
+        queries = iter(queries)
+        exhausted = False
+        submitted = 0
+        while True:
+            while not exhausted and self.outstanding < in_flight:
+                try:
+                    name, rdtype = next(queries)
+                except StopIteration:
+                    exhausted = True
+                    break
+                self._submit(name, rdtype, deliver)
+                submitted += 1
+            if not answers:
+                if exhausted and submitted == 0:
+                    return
+                ready.clear()
+                await ready.wait()
+                continue
+            while answers:
+                submitted -= 1
+                yield answers.popleft()
@@ -0,0 +1,96 @@
+import dns.name
+import dns.query
+import dns.exception
+import dns.rdatatype
+import dns.resolver
+
+from DNS_Records.dns_cache import get_resolver
+from DNS_Records.dns_engine import DNSAnswer, records_from_rrset
+
+# Seconds to wait for each message of a transfer, and for the whole transfer
+TRANSFER_TIMEOUT = 10.0
+TRANSFER_LIFETIME = 600.0
+
+
+def stream_zone(zone, server, port=53, timeout=TRANSFER_TIMEOUT, lifetime=TRANSFER_LIFETIME):
+    """Transfers a zone with AXFR and yields its record sets as they arrive.
+
+    Records are grouped by owner name as they come off the wire; only the
+    current owner's records are held, so a zone of any size streams in
+    constant memory. The closing SOA of the transfer is not repeated.
+
+    Args:
+        zone (str): Zone to transfer, e.g. 'example.com'.
+        server (str): IP address of a nameserver of the zone.
+        port (int): Port the nameserver listens on.
+        timeout (float): Seconds to wait for each message.
+        lifetime (float): Seconds the whole transfer may take.
+
+    Yields:
+        DNSAnswer: One NOERROR answer per (owner name, record type).
+
+    Raises:
+        dns.exception.DNSException: If the transfer is refused or malformed.
+        OSError: If the server cannot be reached.
+    """
+    origin = dns.name.from_text(zone)
+    owner = None
+    pending = {}
+    soa_seen = False
+
+    def flush():
+        for rrsets in pending.values():
+            records = [record for rrset in rrsets for record in records_from_rrset(rrset)]
+            ttl = min(rrset.ttl for rrset in rrsets)
+            yield DNSAnswer(records[0].name, records[0].rdtype, 'NOERROR', records, ttl, None)
+        pending.clear()
+
+    for message in dns.query.xfr(server, origin, timeout=timeout, port=port, lifetime=lifetime, relativize=False):
+        for rrset in message.answer:
+            if rrset.rdtype == dns.rdatatype.SOA and rrset.name == origin:
+                if soa_seen:
+                    continue
+                soa_seen = True
+            if rrset.name != owner:
+                yield from flush()
+                owner = rrset.name
+            pending.setdefault(rrset.rdtype, []).append(rrset)
+    yield from flush()
+
+
+def nameserver_addresses(domain, resolver=None):
+    """Returns the addresses of domain's nameservers, IPv4 first.
+
+    Lookup failures leave the list short rather than being printed, as
+    NSRecordFetcher would, so they cannot mix into a transfer's output.
+
+    Args:
+        domain (str): Zone whose nameservers to look up.
+        resolver (dns.resolver.Resolver, optional): Resolver to use. Defaults to
+            the resolver with the shared DNS cache.
+
+    Returns:
+        list: (nameserver, address) tuples.
+    """
+    resolver = resolver or get_resolver()
+    try:
+        nameservers = [answer.target.to_text() for answer in resolver.resolve(domain, 'NS')]
+    except dns.exception.DNSException:
+        return []
+    addresses = []
+    for nameserver in nameservers:
+        for rdtype in ('A', 'AAAA'):
+            try:
+                answers = resolver.resolve(nameserver, rdtype)
+            except dns.exception.DNSException:
+                continue
+            addresses.extend((nameserver, answer.address) for answer in answers)
+    addresses.sort(key=lambda entry: ':' in entry[1])
+    return addresses
+
+
+if __name__ == "__main__":
+    # zonetransfer.me allows AXFR for testing
+    for ns_name, ns_address in nameserver_addresses('zonetransfer.me')[:1]:
+        for answer in stream_zone('zonetransfer.me', ns_address):
+            print(f"{answer.name:<40} {answer.rdtype:<6} {', '.join(r.value for r in answer.records)}")
@@ -1,9 +1,9 @@
 import asyncio
 import json
 import re
-import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
+from Toolkit.http_client import get_session
 
 # ANSI color codes for colored output
 RED = '\033[31m'
@@ -25,7 +25,7 @@ def fetch_page_content(url):
         bytes: The content of the web page.
     """
     try:
-        response = requests.get(url, verify=True)
+        response = get_session().get(url, verify=True)
         if response.status_code == 200:
             return response.content
         else:
@@ -48,7 +48,7 @@ async def js_crawl(js_urls):
 
     async def fetch(js_url):
         try:
-            response = requests.get(js_url, headers=USER_AGENT, verify=True, timeout=10)
+            response = get_session().get(js_url, headers=USER_AGENT, verify=True, timeout=10)
             if response.status_code == 200:
                 js_data = response.content.decode()
                 matches = re.findall(r'(?:http[s]?://|\/)[\w\-\._~:\/?#[\]@!$&\'()*+,;=]+', js_data)
@@ -245,7 +245,7 @@ async def check_wayback_availability(url):
     avail_data = {'url': url}
     
     try:
-        response = requests.get(wayback_url, params=avail_data, timeout=10)
+        response = get_session().get(wayback_url, params=avail_data, timeout=10)
         if response.status_code == 200:
             json_data = response.json()
             avail_snapshots = json_data.get('archived_snapshots')
@@ -260,9 +260,9 @@ async def check_wayback_availability(url):
         print(f"Error checking Wayback Machine availability: {exc}")
         return None
 
-async def main():
-    
-    target_url = input(f"{YELLOW}Enter the URL to crawl: {WHITE}")
+async def main(target_url=None):
+    if target_url is None:
+        target_url = input(f"{YELLOW}Enter the URL to crawl: {WHITE}")
     filename = target_url.replace('http://', '').replace('https://', '').replace('/', '_') + "_Crawler.json"
     result = await crawl(target_url)
     print(f"{GREEN}Crawling completed.{WHITE}")
@@ -1,9 +1,14 @@
 import requests
+from Toolkit.http_client import get_session
+
+def get_header_info(url, session=None):
+    """Returns the response headers of a HEAD request to url."""
+    response = (session or get_session()).head(url)
+    return dict(response.headers)
 
 def save_header_info(url):
     try:
-        response = requests.head(url)
-        headers = response.headers
+        headers = get_header_info(url)
         file_name = url.replace("://", "_").replace("/", "_").replace(".", "_") + "_header.txt"
         with open(file_name, "w") as file:
             file.write("Header Information for " + url + "\n")
@@ -3,23 +3,28 @@ import asyncio
 from aioipapi import location
 import ipapi
 import aiohttp
+from Toolkit.http_client import get_async_session, close_async_session
 
 class IPGeolocationAPI:
-    def __init__(self):
+    def __init__(self, session=None):
         self.apis = [
             'https://ipinfo.io/{ip}/json',
             'https://freegeoip.app/json/{ip}',
             # Add more APIs here if needed
         ]
+        # Optional aiohttp.ClientSession; otherwise the event loop's pooled session is used
+        self.session = session
+
+    async def fetch_json(self, url):
+        session = self.session or await get_async_session()
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+            response.raise_for_status()  # Raise an exception for non-200 status codes
+            return await response.json()
 
     async def get_ipinfo_location_async(self, ip_address):
         try:
             url = self.apis[0].format(ip=ip_address)
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=5) as response:
-                    response.raise_for_status()  # Raise an exception for non-200 status codes
-                    data = await response.json()
-                    return data
+            return await self.fetch_json(url)
         except aiohttp.ClientError as e:
             logging.warning("Error from ipinfo API: %s", e)
             return {"error": str(e)}
@@ -27,11 +32,7 @@ class IPGeolocationAPI:
     async def get_freegeoip_location_async(self, ip_address):
         try:
             url = self.apis[1].format(ip=ip_address)
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=5) as response:
-                    response.raise_for_status()  # Raise an exception for non-200 status codes
-                    data = await response.json()
-                    return data
+            return await self.fetch_json(url)
         except aiohttp.ClientError as e:
             logging.warning("Error from freegeoip API: %s", e)
             return {"error": str(e)}
@@ -50,14 +51,22 @@ class IPGeolocationAPI:
             logging.warning("Error from ipapi.location: %s", e)
             return {"error": str(e)}
 
-    async def get_ip_location(self, ip_address):
-        results = {
+    async def collect_locations(self, ip_address):
+        return {
             "[1]": await self.get_ipinfo_location_async(ip_address),
             "[2]": await self.get_freegeoip_location_async(ip_address),
             "[3]": await self.get_aioipapi_location_async(ip_address),
             "[4]": await self.get_ipapi_async(ip_address),
         }
 
+    async def get_ip_location(self, ip_address):
+        try:
+            results = await self.collect_locations(ip_address)
+        finally:
+            # Entry point for a one-off event loop, so release its pooled session
+            if self.session is None:
+                await close_async_session()
+
         # Save results to a text file
         filename = f"{ip_address}_IP_location.txt"
         with open(filename, 'w', encoding='utf-8') as file:
@@ -1,43 +1,56 @@
 import requests
 import json
 from bs4 import BeautifulSoup
+from Toolkit.http_client import get_session
 
-def parse_robots_txt(url):
-    """Parses the robots.txt file of a website.
+def get_robot_info(url, session=None):
+    """Fetches and parses the robots.txt file of a website.
 
     Args:
         url (str): The URL of the website to parse robots.txt from.
+        session (requests.Session, optional): Session to use instead of the shared one.
 
     Returns:
         dict: Parsed data from the robots.txt file.
+
+    Raises:
+        requests.exceptions.RequestException: If robots.txt cannot be fetched.
     """
     robots_url = url.rstrip('/') + '/robots.txt'
 
-    try:
-        response = requests.get(robots_url)
-        response.raise_for_status()  # Raise an exception for bad status codes
+    response = (session or get_session()).get(robots_url)
+    response.raise_for_status()  # Raise an exception for bad status codes
+
+    soup = BeautifulSoup(response.content, 'html.parser')
+
+    user_agent_blocks = []
+    current_user_agent = None
 
-        soup = BeautifulSoup(response.content, 'html.parser')
+    for line in soup.text.splitlines():
+        line = line.strip()
 
-        user_agent_blocks = []
-        current_user_agent = None
+        if line.startswith('User-agent:'):
+            current_user_agent = {'name': line.split(':')[1].strip(), 'allowed': [], 'disallowed': []}
+            user_agent_blocks.append(current_user_agent)
 
-        for line in soup.text.splitlines():
-            line = line.strip()
+        elif line.startswith('Allow:'):
+            if current_user_agent:
+                current_user_agent['allowed'].append(line.split(':')[1].strip())
 
-            if line.startswith('User-agent:'):
-                current_user_agent = {'name': line.split(':')[1].strip(), 'allowed': [], 'disallowed': []}
-                user_agent_blocks.append(current_user_agent)
+        elif line.startswith('Disallow:'):
+            if current_user_agent:
+                current_user_agent['disallowed'].append(line.split(':')[1].strip())
 
-            elif line.startswith('Allow:'):
-                if current_user_agent:
-                    current_user_agent['allowed'].append(line.split(':')[1].strip())
+    return {'robot_info_robots_txt': user_agent_blocks}
 
-            elif line.startswith('Disallow:'):
-                if current_user_agent:
-                    current_user_agent['disallowed'].append(line.split(':')[1].strip())
+def parse_robots_txt(url):
+    """Parses the robots.txt file of a website and saves it to a file.
 
-        combined_data = {'robot_info_robots_txt': user_agent_blocks}
+    Args:
+        url (str): The URL of the website to parse robots.txt from.
+    """
+    try:
+        combined_data = get_robot_info(url)
         save_robot_info(url, combined_data)
         print("Robot information saved successfully.")
 
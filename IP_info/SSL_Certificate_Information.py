@@ -27,8 +27,9 @@ def get_whois_info(domain):
     except Exception as e:
         return f"Error getting Whois information: {str(e)}"
 
-def ssl_main():
-    domain = input("Enter domain name (e.g., example.com): ")
+def ssl_main(domain=None):
+    if domain is None:
+        domain = input("Enter domain name (e.g., example.com): ")
     cert_info = get_ssl_certificate_info(domain)
     whois_info = get_whois_info(domain)
     save_certificate_info_to_file(domain, cert_info, whois_info)
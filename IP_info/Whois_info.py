@@ -2,13 +2,17 @@ import whois
 import sys
 from urllib.parse import urlparse
 
+def get_whois_info(url):
+    """Returns (domain, WHOIS record) for a URL or bare domain."""
+    if not url.startswith("http://") and not url.startswith("https://"):
+        url = "http://" + url  # Adding prefix if not present
+    parsed_url = urlparse(url)
+    domain = parsed_url.netloc
+    return domain, whois.whois(domain)
+
 def whois_info(url):
     try:
-        if not url.startswith("http://") and not url.startswith("https://"):
-            url = "http://" + url  # Adding prefix if not present
-        parsed_url = urlparse(url)
-        domain = parsed_url.netloc
-        domain_info = whois.whois(domain)
+        domain, domain_info = get_whois_info(url)
         if domain_info:
             output_filename = f"{domain}_Whois.txt"
             with open(output_filename, 'w') as f:
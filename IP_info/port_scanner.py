@@ -2,29 +2,46 @@ import asyncio
 
 DEFAULT_TIMEOUT = 3
 
-async def check_port_async(target_ip, port, timeout, filename):
-    """Attempt to connect to a port asynchronously and report status."""
+async def probe_port(target_ip, port, timeout):
+    """Return True if a TCP connection to the port succeeds within timeout."""
     try:
         conn = asyncio.open_connection(target_ip, port)
-        _, _ = await asyncio.wait_for(conn, timeout=timeout)
+        _, writer = await asyncio.wait_for(conn, timeout=timeout)
+        writer.close()
+        return True
+    except (asyncio.TimeoutError, ConnectionRefusedError):
+        return False
+    except Exception as e:
+        return False
+
+async def check_port_async(target_ip, port, timeout, filename):
+    """Attempt to connect to a port asynchronously and report status."""
+    if await probe_port(target_ip, port, timeout):
         print(f"Port {port} is open")
         with open(filename, 'a') as outfile:
             outfile.write(f"\nPort {port} is open")
-    except (asyncio.TimeoutError, ConnectionRefusedError):
-        pass
-    except Exception as e:
-        pass
+
+async def find_open_ports(target_ip, start_port, end_port, timeout=DEFAULT_TIMEOUT):
+    """Scan a port range asynchronously and return the open ports in order."""
+    ports = range(start_port, end_port + 1)
+    results = await asyncio.gather(*(probe_port(target_ip, port, timeout) for port in ports))
+    return [port for port, is_open in zip(ports, results) if is_open]
 
 async def scan_ports_async(target_ip, start_port, end_port, timeout, filename):
     """Scan a port range asynchronously."""
     tasks = [check_port_async(target_ip, port, timeout, filename) for port in range(start_port, end_port + 1)]
     await asyncio.gather(*tasks)
 
-def port_scanner_async():
-    target_ip = input("Enter target IPv4 address or hostname: ")
-    start_port = int(input("Enter start port (0-65535): "))
-    end_port = int(input(f"Enter end port ({start_port}-65535): "))
-    timeout = int(input("Enter connection timeout (in seconds, default is 3): ") or DEFAULT_TIMEOUT)
+def port_scanner_async(target_ip=None, start_port=None, end_port=None, timeout=None):
+    """Scan ports on a target, prompting for any argument that is not given."""
+    if target_ip is None:
+        target_ip = input("Enter target IPv4 address or hostname: ")
+    if start_port is None:
+        start_port = int(input("Enter start port (0-65535): "))
+    if end_port is None:
+        end_port = int(input(f"Enter end port ({start_port}-65535): "))
+    if timeout is None:
+        timeout = int(input("Enter connection timeout (in seconds, default is 3): ") or DEFAULT_TIMEOUT)
     filename = f'{target_ip}_port_scanner.txt'
 
     try:
@@ -17,6 +17,7 @@ import random
 import matplotlib.colors as mcolors
 import http.server
 import socketserver
+from Toolkit.http_client import get_session
 
 
 logging.basicConfig(filename='sitemap.log', level=logging.ERROR)
@@ -28,11 +29,11 @@ class LinkExtractor:
         self.depth = depth
         self.visited = set()
         self.all_links = set()
-        self.session = requests.Session()
+        self.session = get_session()
         self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=60)  # Adjust workers as needed
 
     def close_session(self):
-        self.session.close()
+        # The session is shared with other tools, so only the workers are shut down
         self.executor.shutdown()
 
     def get_internal_links(self, url):
@@ -129,9 +130,13 @@ def serve_html_file(filename):
         httpd.serve_forever()
 
 
-def sitemap_main():
-    url = input('\t Enter URL: ')
-    depth = int(input('\t Enter depth: '))
+def sitemap_main(url=None, depth=None):
+    # Only clear the screen and serve the graph when driven from the menu
+    interactive = url is None
+    if url is None:
+        url = input('\t Enter URL: ')
+    if depth is None:
+        depth = int(input('\t Enter depth: '))
     try:
         if not url.startswith(('http://', 'https://')):
             url = 'http://' + url  # Add http:// prefix if missing
@@ -141,6 +146,9 @@ def sitemap_main():
         file_name = extractor.save_links_to_file()
         extractor.visualize_sitemap()
         extractor.close_session()
+        if not interactive:
+            print(f"{len(extractor.all_links)} links found and saved to {file_name}")
+            return
         os.system('cls')
         os.system('clear')
         print(f"\n\t{len(extractor.all_links)} links found and saved to {file_name}\n")
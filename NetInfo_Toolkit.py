@@ -1,26 +1,34 @@
 import os
+import sys
 import time
-import json   
-import asyncio 
+import json
+import asyncio
 import logging
-from ipwhois import IPWhois
-from imp.ASN_info  import BGP
-from IP_info.sitemap import sitemap_main
-from IP_info.Whois_info import whois_info
-from IP_info.Crawler import main as crawler_fetcher
-from IP_info.Robot_info import parse_robots_txt
-from IP_info.IP_location import IPGeolocationAPI
-from IP_info.HEADER_info import save_header_info
-from DNS_Records.A_records import  get_a_records
-from DNS_Records.NS_records import NSRecordFetcher
-from DNS_Records.MX_records import MXRecordFetcher
-from DNS_Records.SOA_records import SOARecordFetcher
-from DNS_Records.PTR_records import PTRRecordFetcher
-from DNS_Records.SRV_records import SRVRecordFetcher
-from IP_info.SSL_Certificate_Information import ssl_main
-from DNS_Records.CNAME_records import fetch_cname_records
-from DNS_Records.TXT_records import fetch_txt_records_for_domain
-from  IP_info.port_scanner import port_scanner_async as port_scanner
+import argparse
+from Toolkit.registry import COMMANDS
+from Toolkit.bulk import bulk_main, DEFAULT_WORKERS
+from IP_info.port_scanner import DEFAULT_TIMEOUT
+
+# Tool modules pull in heavy dependencies (matplotlib, networkx, bs4, aiohttp...),
+# so each one is only imported the first time its command is used.
+IPWhois = COMMANDS['ip_whois']
+BGP = COMMANDS['bgp']
+sitemap_main = COMMANDS['sitemap']
+whois_info = COMMANDS['whois_info']
+crawler_fetcher = COMMANDS['crawler']
+parse_robots_txt = COMMANDS['robots_txt']
+IPGeolocationAPI = COMMANDS['ip_location']
+save_header_info = COMMANDS['header_info']
+get_a_records = COMMANDS['a_records']
+NSRecordFetcher = COMMANDS['ns_records']
+MXRecordFetcher = COMMANDS['mx_records']
+SOARecordFetcher = COMMANDS['soa_records']
+PTRRecordFetcher = COMMANDS['ptr_records']
+SRVRecordFetcher = COMMANDS['srv_records']
+ssl_main = COMMANDS['ssl_info']
+fetch_cname_records = COMMANDS['cname_records']
+fetch_txt_records_for_domain = COMMANDS['txt_records']
+port_scanner = COMMANDS['port_scanner']
 
 def safe_filename(name):
     return name.replace(':', '_')
@@ -31,8 +39,9 @@ def save_file(content, filename):
         json.dump(content, file, indent=4)
 
 
-def IP_info():
-    IP = input("Enter the IP address: ")
+def IP_info(IP=None):
+    if IP is None:
+        IP = input("Enter the IP address: ")
     output_filename = f"{safe_filename(IP)}_IP_info.json"
     try:
         obj = IPWhois(IP)
@@ -51,6 +60,300 @@ def IP_info():
         logging.error(f"Unexpected error occurred: {e}")
 
 
+def split_prefix(target):
+    """Split an 'IP/CIDR' target into the two arguments BGP().IP_Prefix expects."""
+    ip_address, _, cidr = target.partition('/')
+    return ip_address, cidr
+
+
+def bulk_operations(start_port=1, end_port=1024, timeout=DEFAULT_TIMEOUT, depth=1):
+    """Maps each menu choice to a prompt-free callable taking a single target.
+
+    Args:
+        start_port (int): First port scanned by option 2.
+        end_port (int): Last port scanned by option 2.
+        timeout (int): Connection timeout in seconds for option 2.
+        depth (int): Crawl depth for option 7.
+
+    Returns:
+        dict: Menu choice -> callable(target).
+    """
+    return {
+        '1': IP_info,
+        '2': lambda target: port_scanner(target, start_port, end_port, timeout),
+        '3': whois_info,
+        '4': lambda target: asyncio.run(crawler_fetcher(target)),
+        '5': save_header_info,
+        '6': parse_robots_txt,
+        '7': lambda target: sitemap_main(target, depth),
+        '8': ssl_main,
+        '9': lambda target: BGP().ASN_Prefixes(target),
+        '10': lambda target: BGP().ASN_Peers(target),
+        '11': lambda target: BGP().ASN_Upstreams(target),
+        '12': lambda target: BGP().ASN_Downstreams(target),
+        '13': lambda target: BGP().ASN_IXs(target),
+        '14': lambda target: BGP().IP_Prefix(*split_prefix(target)),
+        '15': lambda target: BGP().ASN_Info(target),
+        '16': lambda target: BGP().IX(target),
+        '17': lambda target: BGP().Search(target),
+        '18': get_a_records,
+        '19': fetch_cname_records,
+        '20': lambda target: MXRecordFetcher().fetch_and_save_mx_records(target),
+        '21': lambda target: SOARecordFetcher().fetch_and_save_soa_records(target),
+        '22': lambda target: NSRecordFetcher().fetch_and_save_ns_records(target),
+        '23': lambda target: PTRRecordFetcher().fetch_and_save_ptr_records(target),
+        '24': lambda target: SRVRecordFetcher().fetch_and_save_srv_records(target),
+        '25': fetch_txt_records_for_domain,
+        '26': lambda target: asyncio.run(IPGeolocationAPI().get_ip_location(target)),
+    }
+
+
+def split_list(value):
+    """Splits a comma-separated option into its non-empty items."""
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Network Information Toolkit")
+    parser.add_argument('--bulk', metavar='FILE',
+                        help="Run without prompts over the targets in FILE ('-' for stdin), one per line.")
+    parser.add_argument('--ops', default='',
+                        help="Comma-separated menu choices to run for each target, e.g. 18,20,25.")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"Maximum number of operations in flight (default: {DEFAULT_WORKERS}).")
+    parser.add_argument('--ports', default='1-1024',
+                        help="Port range scanned by option 2 (default: 1-1024).")
+    parser.add_argument('--timeout', type=int, default=DEFAULT_TIMEOUT,
+                        help=f"Connection timeout in seconds for option 2 (default: {DEFAULT_TIMEOUT}).")
+    parser.add_argument('--depth', type=int, default=1,
+                        help="Crawl depth for option 7 (default: 1).")
+    parser.add_argument('--store', metavar='PATH',
+                        help="Write results to one result store instead of a file per target "
+                             "(.db for SQLite, .ndjson for append-only NDJSON).")
+    parser.add_argument('--http-timeout', type=float,
+                        help="Default timeout in seconds for HTTP requests (default: 10).")
+    parser.add_argument('--http-connections', type=int,
+                        help="Kept-alive HTTP connections per host (default: 64).")
+    parser.add_argument('--ndjson', action='store_true',
+                        help="Stream every result to stdout as one JSON line as soon as it is produced "
+                             "(progress messages go to stderr).")
+    parser.add_argument('--profile', metavar='TARGET',
+                        help="Run every lookup for one domain concurrently and save one merged document.")
+    parser.add_argument('--enrich', metavar='FILE',
+                        help="Enrich the domains in FILE ('-' for stdin): IPs, PTR, geolocation, prefixes and ASNs.")
+    parser.add_argument('--enrich-output', default='enrichment.json',
+                        help="File the enrichment graph is saved to (default: enrichment.json).")
+    parser.add_argument('--mail-infra', metavar='FILE',
+                        help="Map the MX and NS hosts of the domains in FILE ('-' for stdin) to their IPs, PTR and "
+                             "ASNs, looking each shared host up once.")
+    parser.add_argument('--mail-infra-output', default='mail_infrastructure.json',
+                        help="File the mail infrastructure map is saved to (default: mail_infrastructure.json).")
+    parser.add_argument('--bgp', metavar='FILE',
+                        help="Fetch ASN views for every ASN in FILE ('-' for stdin) with the async BGP client. "
+                             "--ops picks views among 9-13 and 15 (default: all six).")
+    parser.add_argument('--bgp-rate', type=float, default=5,
+                        help="BGP requests per second per endpoint family (default: 5, 0 for no limit).")
+    parser.add_argument('--bgp-cache', metavar='PATH',
+                        help="On-disk BGP response cache (default: ~/.cache/netinfo/bgp_cache.db).")
+    parser.add_argument('--no-bgp-cache', action='store_true', help="Always fetch BGP data from the API.")
+    parser.add_argument('--resolve', metavar='FILE',
+                        help="Resolve every domain in FILE ('-' for stdin) with bounded in-flight queries, "
+                             "streaming compact tab-separated answers.")
+    parser.add_argument('--ptr-sweep', metavar='CIDRS',
+                        help="Comma-separated IPv4/IPv6 blocks (e.g. 198.51.100.0/22,2001:db8::/120) whose PTR "
+                             "records to sweep, writing only the hits.")
+    parser.add_argument('--spf', metavar='FILE',
+                        help="Flatten the SPF record of every domain in FILE ('-' for stdin) into merged CIDRs.")
+    parser.add_argument('--subdomains', metavar='DOMAINS',
+                        help="Comma-separated domains whose subdomains to brute-force from --wordlist.")
+    parser.add_argument('--wordlist', metavar='FILE',
+                        help="Subdomain labels for --subdomains, one per line ('-' for stdin).")
+    parser.add_argument('--permute', action='store_true',
+                        help="Also try numbered and tagged permutations of every word (e.g. api2, api-dev).")
+    parser.add_argument('--watch', metavar='FILE',
+                        help="Watch the --types records of every domain in FILE ('-' for stdin), re-resolving "
+                             "each at its TTL expiry and emitting NDJSON change events.")
+    parser.add_argument('--watch-duration', type=float,
+                        help="Seconds --watch runs for (default: until interrupted).")
+    parser.add_argument('--refresh', metavar='FILE',
+                        help="Refresh the --types records of every domain in FILE ('-' for stdin), re-querying a "
+                             "domain only when its SOA serial changed since the snapshot in --store.")
+    parser.add_argument('--axfr', metavar='FILE',
+                        help="Fetch the zones in FILE ('-' for stdin) by AXFR from their nameservers, querying the "
+                             "--types records one at a time for zones that refuse the transfer.")
+    parser.add_argument('--axfr-servers', metavar='IPS',
+                        help="Comma-separated nameserver addresses to transfer from instead of each zone's NS.")
+    parser.add_argument('--types',
+                        help="Comma-separated record types for --resolve, --watch, --refresh or --axfr, e.g. "
+                             "A,AAAA,MX (default: A; NS,MX,TXT,SRV,A for --refresh, plus CNAME for --axfr).")
+    parser.add_argument('--resolve-output', default='-',
+                        help="File for --resolve answers, --ptr-sweep/--subdomains hits, --watch events and "
+                             "--spf/--refresh/--axfr results (default: stdout).")
+    parser.add_argument('--in-flight', type=int, default=1000,
+                        help="Maximum number of outstanding DNS queries (default: 1000).")
+    parser.add_argument('--raw-udp', action='store_true',
+                        help="Resolve with the pipelined raw UDP engine for the highest queries per second.")
+    parser.add_argument('--iterative', action='store_true',
+                        help="Resolve --resolve queries from the root servers down to each zone's own nameservers "
+                             "instead of through recursive resolvers (--nameservers then act as root hints).")
+    parser.add_argument('--nameservers', default='',
+                        help="Comma-separated upstream DNS resolvers, load-balanced by latency with hedged "
+                             "queries (default: system configuration).")
+    parser.add_argument('--dns-port', type=int, default=53, help="Port of the upstream DNS resolvers (default: 53).")
+    parser.add_argument('--dns-cache', metavar='PATH',
+                        help="Load the shared DNS cache from PATH at start and snapshot it back on exit.")
+    parser.add_argument('--dns-cache-size', type=int,
+                        help="Maximum number of answers in the shared DNS cache (default: 50000).")
+    parser.add_argument('--serve', action='store_true',
+                        help="Run as a resident HTTP/JSON API with warm resolvers, sessions and caches.")
+    parser.add_argument('--host', default='127.0.0.1', help="Address the API listens on (default: 127.0.0.1).")
+    parser.add_argument('--port', type=int, default=8765, help="Port the API listens on (default: 8765).")
+    parser.add_argument('--cache-ttl', type=float, default=300,
+                        help="Seconds the API keeps a result before fetching it again (default: 300).")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.http_timeout or args.http_connections:
+        from Toolkit import http_client
+        http_client.configure(timeout=args.http_timeout, pool_per_host=args.http_connections)
+    if args.no_bgp_cache or args.bgp_cache:
+        from imp.bgp_cache import BGPCache, set_default_cache
+        set_default_cache(False if args.no_bgp_cache else BGPCache(args.bgp_cache))
+    dns_cache = None
+    if args.dns_cache:
+        from DNS_Records.dns_cache import DNSCache, DEFAULT_MAX_SIZE, set_default_cache
+        dns_cache = DNSCache(args.dns_cache_size or DEFAULT_MAX_SIZE)
+        if os.path.exists(args.dns_cache):
+            print(f"Loaded {dns_cache.load(args.dns_cache)} cached DNS answers from {args.dns_cache}",
+                  file=sys.stderr)
+        set_default_cache(dns_cache)
+    elif args.dns_cache_size:
+        from DNS_Records.dns_cache import get_default_cache
+        get_default_cache().set_max_size(args.dns_cache_size)
+    if args.nameservers:
+        from DNS_Records.dns_cache import set_resolver
+        from DNS_Records.resolver_pool import ResolverPool
+        set_resolver(ResolverPool(split_list(args.nameservers), args.dns_port))
+    store = None
+    if args.store:
+        from Toolkit.result_store import open_store
+        store = open_store(args.store)
+    try:
+        if args.ndjson:
+            from Toolkit.output import ndjson_stdout
+            with ndjson_stdout() as writer:
+                run_mode(args, store, writer)
+        else:
+            run_mode(args, store)
+    finally:
+        if store is not None:
+            store.close()
+        if dns_cache is not None:
+            print(f"Saved {dns_cache.snapshot(args.dns_cache)} DNS answers to {args.dns_cache}", file=sys.stderr)
+
+
+def run_mode(args, store, writer=None):
+    if args.profile:
+        from Toolkit.recon import profile_main
+        profile_main(args.profile, store=store, writer=writer)
+        return
+    if args.enrich:
+        from Toolkit.bulk import read_targets
+        from Toolkit.enrichment import enrich_main
+        enrich_main(read_targets(args.enrich), args.enrich_output, args.workers, store=store, writer=writer)
+        return
+    if args.mail_infra:
+        from Toolkit.bulk import read_targets
+        from Toolkit.enrichment import mail_infra_main
+        mail_infra_main(read_targets(args.mail_infra), args.mail_infra_output, args.workers, store=store,
+                        writer=writer)
+        return
+    if args.bgp:
+        from Toolkit.bulk import read_targets
+        from Toolkit.bgp_bulk import bgp_main
+        choices = split_list(args.ops)
+        bgp_main(read_targets(args.bgp), choices, args.workers, args.bgp_rate, store, writer)
+        return
+    if args.resolve:
+        from Toolkit.bulk import read_targets
+        from Toolkit.dns_bulk import dns_bulk_main
+        dns_bulk_main(read_targets(args.resolve), split_list(args.types or 'A'), args.resolve_output, args.in_flight,
+                      split_list(args.nameservers), args.dns_port, store, writer, raw_udp=args.raw_udp,
+                      iterative=args.iterative)
+        return
+    if args.ptr_sweep:
+        from Toolkit.ptr_sweep import ptr_sweep_main
+        ptr_sweep_main(split_list(args.ptr_sweep), args.resolve_output, args.in_flight, split_list(args.nameservers),
+                       args.dns_port, store, writer, raw_udp=args.raw_udp)
+        return
+    if args.watch:
+        from Toolkit.bulk import read_targets
+        from Toolkit.dns_watch import dns_watch_main
+        dns_watch_main(read_targets(args.watch), split_list(args.types or 'A'), args.resolve_output, args.in_flight,
+                       split_list(args.nameservers), args.dns_port, store, writer, args.watch_duration, args.raw_udp)
+        return
+    if args.spf:
+        from Toolkit.bulk import read_targets
+        from Toolkit.spf_flatten import spf_main
+        spf_main(read_targets(args.spf), args.resolve_output, args.in_flight, split_list(args.nameservers),
+                 args.dns_port, store, writer)
+        return
+    if args.refresh:
+        if store is None:
+            print("--refresh keeps its snapshots in a result store; pass --store")
+            return
+        from Toolkit.bulk import read_targets
+        from Toolkit.zone_refresh import refresh_main, REFRESH_TYPES
+        refresh_main(read_targets(args.refresh), store, split_list(args.types or '') or REFRESH_TYPES,
+                     args.resolve_output, args.in_flight, split_list(args.nameservers), args.dns_port, writer,
+                     raw_udp=args.raw_udp)
+        return
+    if args.axfr:
+        from Toolkit.bulk import read_targets
+        from Toolkit.zone_transfer import axfr_main, FALLBACK_TYPES
+        axfr_main(read_targets(args.axfr), store, split_list(args.types or '') or FALLBACK_TYPES, args.resolve_output,
+                  args.in_flight, split_list(args.nameservers), args.dns_port, writer,
+                  split_list(args.axfr_servers or ''), raw_udp=args.raw_udp)
+        return
+    if args.subdomains:
+        if not args.wordlist:
+            print("--subdomains needs a --wordlist")
+            return
+        from Toolkit.subdomain_enum import subdomain_main
+        subdomain_main(split_list(args.subdomains), args.wordlist, args.permute, args.resolve_output, args.in_flight,
+                       split_list(args.nameservers), args.dns_port, store, writer, raw_udp=args.raw_udp)
+        return
+    if args.serve:
+        from Toolkit.daemon import serve
+        serve(args.host, args.port, args.cache_ttl, store)
+        return
+    if args.bulk is None:
+        while True:
+            all_main()
+
+    choices = split_list(args.ops)
+    if not choices:
+        print("Bulk mode needs at least one operation, e.g. --ops 18,20,25")
+        return
+    if store is None and writer is None:
+        start_port, _, end_port = args.ports.partition('-')
+        operations = bulk_operations(int(start_port), int(end_port or start_port), args.timeout, args.depth)
+        bulk_main(args.bulk, operations, choices, args.workers)
+        return
+
+    # With a store or NDJSON output, run the data-returning operations so nothing is written per target
+    from Toolkit.service import NetInfoService
+    service = NetInfoService()
+    options = {'ports': args.ports, 'timeout': args.timeout, 'depth': args.depth}
+    operations = {choice: (lambda target, choice=choice: service.run(choice, target, **options)[0])
+                  for choice in service.operations}
+    try:
+        bulk_main(args.bulk, operations, choices, args.workers, store=store, writer=writer)
+    finally:
+        service.close()
+
 
 
 def all_main():
@@ -210,5 +513,4 @@ def all_main():
 
 
 if __name__ == "__main__":
-    while True:
-        all_main()
+    main()
@@ -0,0 +1,67 @@
+"""Bulk ASN lookups through the asynchronous BGPView client."""
+import time
+import asyncio
+
+from Toolkit.registry import RECORD_TYPES
+
+# Menu choice -> BGP view, for the options that take an ASN
+ASN_CHOICES = {
+    '9': 'ASN_Prefixes',
+    '10': 'ASN_Peers',
+    '11': 'ASN_Upstreams',
+    '12': 'ASN_Downstreams',
+    '13': 'ASN_IXs',
+    '15': 'ASN_Info',
+}
+
+
+def bgp_main(asns, choices=None, concurrency=10, rate_limit=5, store=None, writer=None):
+    """Fetches the chosen ASN views for every ASN concurrently.
+
+    Results go to the result store and/or NDJSON writer when given, otherwise
+    to the same per-ASN files the menu options write.
+
+    Args:
+        asns (iterable): ASNs such as 'AS13335'.
+        choices (list, optional): Menu choices among 9-13 and 15. Defaults to all six.
+        concurrency (int): Maximum number of requests in flight.
+        rate_limit (float): Requests per second per endpoint family.
+        store (Toolkit.result_store.ResultStore, optional): Store for the results.
+        writer (Toolkit.output.NDJSONWriter, optional): Streams each result.
+    """
+    from imp.ASN_info import AsyncBGP, BGP
+
+    choices = choices or list(ASN_CHOICES)
+    invalid = [choice for choice in choices if choice not in ASN_CHOICES]
+    if invalid:
+        print(f"Invalid ASN choice(s): {', '.join(invalid)}. Choose among {', '.join(ASN_CHOICES)}.")
+        return
+    view_choices = {ASN_CHOICES[choice]: choice for choice in choices}
+    saver = BGP() if store is None and writer is None else None
+    counts = {'ok': 0, 'failed': 0}
+
+    def on_result(view, asn, data, error, elapsed):
+        choice = view_choices[view]
+        counts['ok' if error is None else 'failed'] += 1
+        if writer is not None:
+            writer.emit(choice, RECORD_TYPES[choice], asn, data, error, elapsed)
+        if error is not None:
+            print(f"[FAILED] {view} {asn}: {error}")
+            return
+        if store is not None:
+            store.write(asn, RECORD_TYPES[choice], data)
+        if saver is not None:
+            saver.save_to_file(f"{saver.safe_filename(asn)}_{view}.json", asn, data)
+
+    async def run():
+        from Toolkit.http_client import close_async_session
+        try:
+            await AsyncBGP(concurrency, rate_limit).asn_views(asns, list(view_choices), on_result)
+        finally:
+            await close_async_session()
+
+    start = time.perf_counter()
+    asns = list(asns)
+    asyncio.run(run())
+    print(f"Fetched {counts['ok']} views for {len(asns)} ASNs ({counts['failed']} failed) "
+          f"in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,110 @@
+import sys
+import time
+import logging
+import concurrent.futures
+
+from Toolkit.registry import RECORD_TYPES
+
+DEFAULT_WORKERS = 8
+
+
+def read_targets(source):
+    """Yields targets lazily from a file, one per line.
+
+    Args:
+        source (str): Path of the target file, or '-' to read from stdin.
+
+    Yields:
+        str: Each non-empty target; lines starting with '#' are skipped.
+    """
+    stream = sys.stdin if source == '-' else open(source, encoding='utf-8')
+    try:
+        for line in stream:
+            target = line.strip()
+            if target and not target.startswith('#'):
+                yield target
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def run_task(choice, operation, target):
+    """Runs a single operation against a target and times it.
+
+    Returns:
+        tuple: (choice, target, result, error, elapsed) where error is None on success.
+    """
+    start = time.perf_counter()
+    result = error = None
+    try:
+        result = operation(target)
+    except Exception as e:
+        logging.error(f"Operation {choice} failed for {target}: {e}")
+        error = e
+    return choice, target, result, error, time.perf_counter() - start
+
+
+def run_bulk(targets, operations, choices, workers=DEFAULT_WORKERS):
+    """Runs every chosen operation against every target with bounded concurrency.
+
+    Targets are consumed lazily and at most ``workers * 2`` tasks are queued at
+    any time, so memory stays flat however long the target stream is.
+
+    Args:
+        targets (iterable): Targets to process.
+        operations (dict): Maps menu choices to callables taking one target.
+        choices (list): Menu choices to run for each target.
+        workers (int): Maximum number of operations running at once.
+
+    Yields:
+        tuple: (choice, target, result, error, elapsed) as each task completes.
+    """
+    tasks = ((choice, target) for target in targets for choice in choices)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for choice, target in tasks:
+            if len(pending) >= workers * 2:
+                done, pending = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(executor.submit(run_task, choice, operations[choice], target))
+        for future in concurrent.futures.as_completed(pending):
+            yield future.result()
+
+
+def bulk_main(source, operations, choices, workers=DEFAULT_WORKERS, store=None, writer=None):
+    """Runs a bulk job and prints one status line per completed task.
+
+    Args:
+        source (str): Path of the target file, or '-' for stdin.
+        operations (dict): Maps menu choices to callables taking one target.
+        choices (list): Menu choices to run for each target.
+        workers (int): Maximum number of operations running at once.
+        store (Toolkit.result_store.ResultStore, optional): Store that every
+            non-None result is written to, keyed by target and record type.
+        writer (Toolkit.output.NDJSONWriter, optional): Emits one JSON line per
+            task instead of the status line.
+    """
+    invalid = [choice for choice in choices if choice not in operations]
+    if invalid:
+        print(f"Invalid choice(s): {', '.join(invalid)}. Choose numbers between 1 and {len(operations)}.")
+        return
+
+    succeeded = failed = 0
+    start = time.perf_counter()
+    for choice, target, result, error, elapsed in run_bulk(read_targets(source), operations, choices, workers):
+        if error is None:
+            succeeded += 1
+            if store is not None and result is not None:
+                store.write(target, RECORD_TYPES[choice], result)
+        else:
+            failed += 1
+        if writer is not None:
+            writer.emit(choice, RECORD_TYPES[choice], target, result, error, elapsed)
+        elif error is None:
+            print(f"[OK] {choice} {target} ({elapsed:.2f}s)", flush=True)
+        else:
+            print(f"[FAILED] {choice} {target} ({elapsed:.2f}s): {error}", flush=True)
+    total = time.perf_counter() - start
+    print(f"Completed {succeeded + failed} tasks ({succeeded} ok, {failed} failed) in {total:.2f}s")
@@ -0,0 +1,122 @@
+"""Local HTTP/JSON API over NetInfoService.
+
+Endpoints:
+    GET  /operations                         Menu choices and their command names.
+    GET  /stats                              Result, DNS cache and upstream resolver statistics.
+    GET  /profile?target=example.com         Full recon profile of a domain.
+    GET  /run?op=20&target=google.com        Run an operation (extra query
+                                             parameters such as ports, timeout,
+                                             depth or refresh=1 are passed on).
+    POST /run  {"op": "20", "target": "google.com"}
+"""
+import json
+import time
+import asyncio
+import logging
+import http.server
+from urllib.parse import urlparse, parse_qsl
+
+from DNS_Records.dns_cache import get_default_cache
+from Toolkit.registry import MENU_CHOICES, RECORD_TYPES
+from Toolkit.service import NetInfoService
+from Toolkit.recon import profile_target
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+
+class NetInfoRequestHandler(http.server.BaseHTTPRequestHandler):
+    # Set on the server class by serve()
+    service = None
+    store = None
+
+    def send_json(self, status, content):
+        body = json.dumps(content, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == '/operations':
+            self.send_json(200, MENU_CHOICES)
+        elif url.path == '/stats':
+            stats = {**self.service.results.stats(), 'dns_cache': get_default_cache().stats()}
+            if hasattr(self.service.resolver, 'stats'):
+                stats['upstreams'] = self.service.resolver.stats()
+            self.send_json(200, stats)
+        elif url.path == '/run':
+            self.run_operation(dict(parse_qsl(url.query)))
+        elif url.path == '/profile':
+            target = dict(parse_qsl(url.query)).get('target')
+            if not target:
+                self.send_json(400, {'error': "Parameter 'target' is required."})
+                return
+            self.send_json(200, asyncio.run(profile_target(target, self.service)))
+        else:
+            self.send_json(404, {'error': f"Unknown path '{url.path}'"})
+
+    def do_POST(self):
+        if urlparse(self.path).path != '/run':
+            self.send_json(404, {'error': f"Unknown path '{self.path}'"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            params = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError as e:
+            self.send_json(400, {'error': f"Invalid JSON body: {e}"})
+            return
+        if not isinstance(params, dict):
+            self.send_json(400, {'error': "Body must be a JSON object."})
+            return
+        self.run_operation(params)
+
+    def run_operation(self, params):
+        choice = str(params.pop('op', ''))
+        target = params.pop('target', None)
+        refresh = str(params.pop('refresh', '')).lower() in ('1', 'true', 'yes')
+        if choice not in MENU_CHOICES:
+            self.send_json(400, {'error': "Parameter 'op' must be a menu choice between 1 and 26."})
+            return
+        if not target:
+            self.send_json(400, {'error': "Parameter 'target' is required."})
+            return
+
+        start = time.perf_counter()
+        try:
+            result, cached = self.service.run(choice, target, refresh=refresh, **params)
+        except Exception as e:
+            logging.error(f"Operation {choice} failed for {target}: {e}")
+            self.send_json(500, {'op': choice, 'target': target, 'error': str(e)})
+            return
+        if self.store is not None and not cached:
+            self.store.write(target, RECORD_TYPES[choice], result)
+        self.send_json(200, {
+            'op': choice,
+            'target': target,
+            'cached': cached,
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 3),
+            'result': result,
+        })
+
+    def log_message(self, format, *args):
+        logging.info("%s - %s", self.address_string(), format % args)
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, result_ttl=None, store=None):
+    """Serves the API until interrupted, keeping one warm NetInfoService.
+
+    Freshly fetched results are also written to the result store, if given.
+    """
+    service = NetInfoService() if result_ttl is None else NetInfoService(result_ttl=result_ttl)
+    handler = type('Handler', (NetInfoRequestHandler,), {'service': service, 'store': store})
+    with http.server.ThreadingHTTPServer((host, port), handler) as httpd:
+        print(f"NetInfo API listening on http://{host}:{port}/ (Ctrl+C to stop)")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("\nShutting down.")
+        finally:
+            service.close()
@@ -0,0 +1,98 @@
+"""Measures DNS queries per second of the dnspython-based and raw UDP engines.
+
+Both engines resolve the same synthetic names against one nameserver. With
+--stub, a minimal responder is started on localhost in its own process, so
+the numbers show the client side cost rather than a real resolver's.
+
+Usage:
+    python -m Toolkit.dns_bench --stub [--queries 100000] [--in-flight 2000]
+    python -m Toolkit.dns_bench --nameserver 127.0.0.1 --port 5353
+"""
+import time
+import socket
+import struct
+import asyncio
+import argparse
+import multiprocessing
+
+ENGINES = ('async', 'raw')
+
+
+def serve_stub(sock):
+    """Answers every A query with 127.0.0.1 and everything else with no data, as fast as it can."""
+    answer = b'\xc0\x0c' + struct.pack('!HHIH', 1, 1, 300, 4) + socket.inet_aton('127.0.0.1')
+    while True:
+        data, addr = sock.recvfrom(512)
+        if len(data) < 17:
+            continue
+        is_a = data[-4:-2] == b'\x00\x01'
+        header = data[:2] + b'\x81\x80' + struct.pack('!HHHH', 1, 1 if is_a else 0, 0, 0)
+        sock.sendto(header + data[12:] + (answer if is_a else b''), addr)
+
+
+def start_stub():
+    """Starts the stub responder in a child process and returns (process, port)."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+    sock.bind(('127.0.0.1', 0))
+    process = multiprocessing.Process(target=serve_stub, args=(sock,), daemon=True)
+    process.start()
+    port = sock.getsockname()[1]
+    sock.close()
+    return process, port
+
+
+def run_engine(name, nameserver, port, queries, in_flight):
+    """Resolves `queries` synthetic A records with one engine.
+
+    Returns:
+        tuple: (seconds elapsed, answers per status).
+    """
+    from DNS_Records.dns_engine import AsyncDNSEngine
+    from DNS_Records.udp_engine import RawUDPEngine
+
+    async def run():
+        if name == 'raw':
+            engine = RawUDPEngine([nameserver], port, concurrency=in_flight)
+        else:
+            engine = AsyncDNSEngine([nameserver], port, concurrency=in_flight, cache=False)
+        counts = {}
+        names = ((f"d{index}.bench.test", 'A') for index in range(queries))
+        start = time.perf_counter()
+        try:
+            async for answer, _ in engine.stream(names, in_flight):
+                counts[answer.status] = counts.get(answer.status, 0) + 1
+        finally:
+            engine.close()
+        return time.perf_counter() - start, counts
+
+    return asyncio.run(run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DNS engine throughput benchmark")
+    parser.add_argument('--stub', action='store_true', help="Start a local stub responder to query.")
+    parser.add_argument('--nameserver', default='127.0.0.1', help="Nameserver to query (default: 127.0.0.1).")
+    parser.add_argument('--port', type=int, default=53, help="Nameserver port (default: 53).")
+    parser.add_argument('--queries', type=int, default=100000, help="Queries per engine (default: 100000).")
+    parser.add_argument('--in-flight', type=int, default=2000, help="Outstanding queries (default: 2000).")
+    parser.add_argument('--engines', default=','.join(ENGINES),
+                        help=f"Comma-separated engines to run (default: {','.join(ENGINES)}).")
+    args = parser.parse_args()
+
+    stub = None
+    if args.stub:
+        stub, args.port = start_stub()
+        print(f"Stub responder listening on 127.0.0.1:{args.port}")
+    try:
+        for name in (engine.strip() for engine in args.engines.split(',') if engine.strip()):
+            elapsed, counts = run_engine(name, args.nameserver, args.port, args.queries, args.in_flight)
+            summary = ', '.join(f"{status} {count}" for status, count in sorted(counts.items()))
+            print(f"{name:<6} {args.queries} queries in {elapsed:6.2f}s  {args.queries / elapsed:9.0f} qps  ({summary})")
+    finally:
+        if stub is not None:
+            stub.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Streaming bulk DNS resolution for very large domain lists."""
+import sys
+import time
+import asyncio
+
+from Toolkit.registry import RECORD_TYPES
+
+DEFAULT_IN_FLIGHT = 1000
+PROGRESS_INTERVAL = 5
+
+# Record type -> menu choice of the matching lookup (AAAA shares option 18 with A)
+RDTYPE_CHOICES = {
+    'A': '18',
+    'AAAA': '18',
+    'CNAME': '19',
+    'MX': '20',
+    'SOA': '21',
+    'NS': '22',
+    'PTR': '23',
+    'SRV': '24',
+    'TXT': '25',
+}
+
+
+def compact_line(answer):
+    """Formats an answer as one tab-separated line: name, type, status, TTL, then each value."""
+    fields = [answer.name, answer.rdtype, answer.status, '' if answer.ttl is None else str(answer.ttl)]
+    fields.extend(record.value for record in answer.records)
+    return '\t'.join(fields) + '\n'
+
+
+def open_engine(nameservers=None, port=53, in_flight=DEFAULT_IN_FLIGHT, raw_udp=False, iterative=False):
+    """Returns the DNS engine for a bulk run.
+
+    Args:
+        nameservers (list, optional): Upstream resolvers. Defaults to the system configuration.
+            Several are load-balanced by latency, with hedged queries to a second one.
+        port (int): Port the upstream resolvers listen on.
+        in_flight (int): Maximum number of outstanding queries.
+        raw_udp (bool): Use the pipelined raw UDP engine instead of dnspython's resolver.
+        iterative (bool): Resolve from the root servers (or nameservers, taken as root
+            hints) instead of through recursive resolvers.
+
+    Returns:
+        AsyncDNSEngine: An engine whose stream() resolves (name, rdtype) pairs.
+    """
+    from DNS_Records.dns_engine import AsyncDNSEngine
+
+    if iterative:
+        from DNS_Records.iterative import IterativeEngine
+        return IterativeEngine(nameservers, port, concurrency=in_flight)
+    if raw_udp:
+        from DNS_Records.udp_engine import RawUDPEngine
+        return RawUDPEngine(nameservers, port, concurrency=in_flight)
+    if nameservers and len(nameservers) > 1:
+        from DNS_Records.resolver_pool import AsyncResolverPool
+        return AsyncDNSEngine(concurrency=in_flight, resolver=AsyncResolverPool(nameservers, port))
+    return AsyncDNSEngine(nameservers, port, concurrency=in_flight)
+
+
+def dns_bulk_main(domains, rdtypes=('A',), output='-', in_flight=DEFAULT_IN_FLIGHT, nameservers=None, port=53,
+                  store=None, writer=None, progress_interval=PROGRESS_INTERVAL, raw_udp=False, iterative=False):
+    """Resolves the chosen record types for a stream of domains and writes answers as they arrive.
+
+    Answers go to the result store and/or NDJSON writer when given, otherwise
+    to output as compact tab-separated lines. Progress and queries per second
+    are reported on stderr.
+
+    Args:
+        domains (iterable): Domains, consumed lazily (e.g. Toolkit.bulk.read_targets).
+        rdtypes (tuple): Record types to resolve for every domain.
+        output (str): File for the compact lines, '-' for stdout.
+        in_flight (int): Maximum number of outstanding queries.
+        nameservers (list, optional): Upstream resolvers. Defaults to the system configuration.
+            Several are load-balanced by latency, with hedged queries to a second one.
+        port (int): Port the upstream resolvers listen on.
+        store (Toolkit.result_store.ResultStore, optional): Store for the answers.
+        writer (Toolkit.output.NDJSONWriter, optional): Streams each answer.
+        progress_interval (float): Seconds between progress lines.
+        raw_udp (bool): Use the pipelined raw UDP engine instead of dnspython's
+            resolver, for the highest queries per second.
+        iterative (bool): Query the authoritative servers directly, starting from the root.
+
+    Returns:
+        dict: Number of answers per status.
+    """
+    rdtypes = [rdtype.upper() for rdtype in rdtypes]
+    invalid = [rdtype for rdtype in rdtypes if rdtype not in RDTYPE_CHOICES]
+    if invalid:
+        print(f"Unsupported record type(s): {', '.join(invalid)}. Choose among {', '.join(RDTYPE_CHOICES)}.",
+              file=sys.stderr)
+        return {}
+    stream = None
+    if store is None and writer is None:
+        stream = sys.stdout if output == '-' else open(output, 'w', encoding='utf-8')
+    counts = {}
+    start = last_report = time.perf_counter()
+
+    def handle(answer, elapsed):
+        nonlocal last_report
+        counts[answer.status] = counts.get(answer.status, 0) + 1
+        if stream is not None:
+            stream.write(compact_line(answer))
+        else:
+            choice = RDTYPE_CHOICES[answer.rdtype]
+            data = {'rdtype': answer.rdtype, 'status': answer.status, 'ttl': answer.ttl,
+                    'records': [record.value for record in answer.records]}
+            if writer is not None:
+                writer.emit(choice, RECORD_TYPES[choice], answer.name, data, answer.error, elapsed)
+            if store is not None and answer.error is None:
+                store.write(answer.name, RECORD_TYPES[choice], data)
+        now = time.perf_counter()
+        if now - last_report >= progress_interval:
+            last_report = now
+            done = sum(counts.values())
+            print(f"{done} queries, {done / (now - start):.0f} qps", file=sys.stderr)
+
+    async def run():
+        engine = open_engine(nameservers, port, in_flight, raw_udp, iterative)
+        queries = ((domain, rdtype) for domain in domains for rdtype in rdtypes)
+        try:
+            async for answer, elapsed in engine.stream(queries, in_flight):
+                handle(answer, elapsed)
+        finally:
+            engine.close()
+
+    try:
+        asyncio.run(run())
+    finally:
+        if stream is not None and stream is not sys.stdout:
+            stream.close()
+    total = sum(counts.values())
+    elapsed = time.perf_counter() - start
+    summary = ', '.join(f"{status} {count}" for status, count in sorted(counts.items()))
+    print(f"Resolved {total} queries in {elapsed:.2f}s ({total / elapsed if elapsed else 0:.0f} qps): {summary}",
+          file=sys.stderr)
+    return counts
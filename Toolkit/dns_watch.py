@@ -0,0 +1,203 @@
+"""TTL-driven DNS change monitoring: each record set is re-resolved when its TTL runs out."""
+import sys
+import time
+import heapq
+import asyncio
+
+from Toolkit.dns_bulk import open_engine, RDTYPE_CHOICES, DEFAULT_IN_FLIGHT
+from Toolkit.output import NDJSONWriter
+from Toolkit.registry import RECORD_TYPES
+
+# Bounds on the re-check interval, whatever the TTL says
+MIN_INTERVAL = 30
+MAX_INTERVAL = 86400
+# Re-check interval after a timeout or server failure
+RETRY_INTERVAL = 60
+# Seconds past the TTL before re-resolving, so caches along the way have expired too
+EXPIRY_MARGIN = 1
+# Longest the scheduler sleeps before looking at the queue again
+SCHEDULER_TICK = 1.0
+
+
+def snapshot(answer):
+    """The comparable part of an answer: its status and the set of record values."""
+    return answer.status, frozenset(record.value for record in answer.records)
+
+
+def next_check(answer, now):
+    """Epoch time at which answer's record set should be resolved again."""
+    if answer.status in ('TIMEOUT', 'ERROR') or answer.ttl is None:
+        return now + RETRY_INTERVAL
+    return now + min(MAX_INTERVAL, max(MIN_INTERVAL, answer.ttl + EXPIRY_MARGIN))
+
+
+class DNSWatcher:
+    """Re-resolves (domain, rdtype) pairs at their TTL expiry and reports what changed.
+
+    Pairs wait in a heap ordered by the time they are due, so each one is
+    queried about once per TTL: long-lived records are left alone and
+    short-lived ones are caught soon after they change.
+    """
+
+    def __init__(self, engine, store=None, writer=None, in_flight=DEFAULT_IN_FLIGHT):
+        """Initialize the watcher.
+
+        Args:
+            engine (DNS_Records.dns_engine.AsyncDNSEngine): Engine to resolve with.
+            store (Toolkit.result_store.ResultStore, optional): Supplies the last known
+                answers at start and receives every changed one.
+            writer (Toolkit.output.NDJSONWriter, optional): Receives the change events.
+            in_flight (int): Maximum number of outstanding queries.
+        """
+        self.engine = engine
+        self.store = store
+        self.writer = writer
+        self.in_flight = in_flight
+        self.queue = []
+        self.last = {}
+        self.queries = 0
+        self.changes = 0
+        self._sequence = 0
+
+    def load_last(self, rdtypes):
+        """Seeds the last known answers from the store, so the first round already reports changes."""
+        if self.store is None:
+            return
+        wanted = set(rdtypes)
+        for record_type in {RECORD_TYPES[RDTYPE_CHOICES[rdtype]] for rdtype in rdtypes}:
+            for record in self.store.query(record_type=record_type):
+                data = record['data']
+                if isinstance(data, dict) and data.get('rdtype') in wanted:
+                    self.last[(record['target'], data['rdtype'])] = (data['status'], frozenset(data['records']))
+
+    def schedule(self, domain, rdtype, due):
+        self._sequence += 1
+        heapq.heappush(self.queue, (due, self._sequence, domain, rdtype))
+
+    async def check(self, domain, rdtype):
+        """Resolves one pair, reports a change if there is one and schedules the next check."""
+        answer = await self.engine.query(domain, rdtype)
+        now = time.time()
+        self.queries += 1
+        self.schedule(domain, rdtype, next_check(answer, now))
+        if answer.status in ('TIMEOUT', 'ERROR'):
+            return
+        key = (domain, rdtype)
+        current = snapshot(answer)
+        previous = self.last.get(key)
+        if previous == current:
+            return
+        self.last[key] = current
+        data = {'rdtype': rdtype, 'status': answer.status, 'ttl': answer.ttl,
+                'records': [record.value for record in answer.records]}
+        if self.store is not None:
+            self.store.write(domain, RECORD_TYPES[RDTYPE_CHOICES[rdtype]], data, now)
+        if previous is None:
+            # First sighting: a baseline, not a change
+            return
+        self.changes += 1
+        if self.writer is not None:
+            self.writer.emit(None, 'dns_change', domain, {
+                **data,
+                'previous_status': previous[0],
+                'added': sorted(current[1] - previous[1]),
+                'removed': sorted(previous[1] - current[1]),
+            })
+
+    async def run(self, duration=None):
+        """Processes the queue until it is empty or duration seconds have passed."""
+        stop = None if duration is None else time.time() + duration
+        slots = asyncio.Semaphore(self.in_flight)
+        tasks = set()
+
+        async def bounded(domain, rdtype):
+            try:
+                await self.check(domain, rdtype)
+            finally:
+                slots.release()
+
+        while self.queue or tasks:
+            now = time.time()
+            if stop is not None and now >= stop:
+                break
+            if not self.queue or self.queue[0][0] > now:
+                wait = SCHEDULER_TICK if not self.queue else min(SCHEDULER_TICK, self.queue[0][0] - now)
+                await asyncio.sleep(wait if stop is None else max(0.0, min(wait, stop - now)))
+                continue
+            _, _, domain, rdtype = heapq.heappop(self.queue)
+            await slots.acquire()
+            task = asyncio.ensure_future(bounded(domain, rdtype))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        for task in tasks:
+            task.cancel()
+
+
+def dns_watch_main(domains, rdtypes=('A',), output='-', in_flight=DEFAULT_IN_FLIGHT, nameservers=None, port=53,
+                   store=None, writer=None, duration=None, raw_udp=False):
+    """Watches the chosen record types of each domain and emits an event whenever one changes.
+
+    Every (domain, rdtype) pair is resolved once at start and then again
+    whenever its TTL runs out. Answers are compared with the last one seen
+    (from the store, when given, so changes between runs are caught too);
+    only changed answers are written to the store and reported, as NDJSON
+    'dns_change' lines with the added and removed values.
+
+    Args:
+        domains (iterable): Domains to watch.
+        rdtypes (tuple): Record types to watch for every domain.
+        output (str): File for the change events when no writer is given, '-' for stdout.
+        in_flight (int): Maximum number of outstanding queries.
+        nameservers (list, optional): Upstream resolvers. Defaults to the system configuration.
+        port (int): Port the upstream resolvers listen on.
+        store (Toolkit.result_store.ResultStore, optional): Last known and changed answers.
+        writer (Toolkit.output.NDJSONWriter, optional): Receives the change events.
+        duration (float, optional): Seconds to watch for. Defaults to until interrupted.
+        raw_udp (bool): Use the pipelined raw UDP engine.
+
+    Returns:
+        DNSWatcher: The watcher, with its query and change counts.
+    """
+    rdtypes = [rdtype.upper() for rdtype in rdtypes]
+    invalid = [rdtype for rdtype in rdtypes if rdtype not in RDTYPE_CHOICES]
+    if invalid:
+        print(f"Unsupported record type(s): {', '.join(invalid)}. Choose among {', '.join(RDTYPE_CHOICES)}.",
+              file=sys.stderr)
+        return None
+    stream = None
+    if writer is None:
+        stream = sys.stdout if output == '-' else open(output, 'a', encoding='utf-8')
+        writer = NDJSONWriter(stream)
+    start = time.time()
+    watcher = None
+    watched = 0
+
+    async def run():
+        nonlocal watcher, watched
+        engine = open_engine(nameservers, port, in_flight, raw_udp)
+        watcher = DNSWatcher(engine, store, writer, in_flight)
+        watcher.load_last(rdtypes)
+        for domain in domains:
+            for rdtype in rdtypes:
+                watcher.schedule(domain, rdtype, start)
+                watched += 1
+        try:
+            await watcher.run(duration)
+        finally:
+            engine.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if stream is not None and stream is not sys.stdout:
+            stream.close()
+    if watcher is not None:
+        print(f"Watched {watched} record sets for {time.time() - start:.0f}s: {watcher.queries} queries, "
+              f"{watcher.changes} changes", file=sys.stderr)
+    return watcher
+
+
+if __name__ == "__main__":
+    dns_watch_main(['google.com', 'github.com', 'wikipedia.org'], ('A', 'MX', 'NS'), duration=600)
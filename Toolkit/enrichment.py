@@ -0,0 +1,313 @@
+"""Enrichment pipeline: domain -> IPs -> PTR / geolocation / BGP prefix -> ASN.
+
+Stages are declared as a DAG over node kinds. Every (kind, value) node is
+expanded exactly once per run, so an IP shared by many domains is enriched
+once and later domains simply link to it. Independent stages run concurrently.
+
+MAIL_PIPELINE maps mail and DNS infrastructure the same way: domain -> MX and
+NS hosts -> IPs -> PTR / ASN, with each host resolved once for the whole batch.
+"""
+import json
+import time
+import asyncio
+import logging
+
+DEFAULT_WORKERS = 16
+
+
+def resolve_addresses(service, domain):
+    return service.run('18', domain)[0]
+
+
+def mail_exchangers(service, domain):
+    return service.run('20', domain)[0]
+
+
+def nameservers(service, domain):
+    return service.run('22', domain)[0]
+
+
+def reverse_dns(service, ip_address):
+    return service.run('23', ip_address)[0]
+
+
+def geolocate(service, ip_address):
+    return service.run('26', ip_address)[0]
+
+
+def bgp_routes(service, ip_address):
+    return service.bgp_view('IP', ip_address)
+
+
+def asn_info(service, asn):
+    return service.run('15', asn)[0]
+
+
+def prefix_info(service, prefix):
+    return service.run('14', prefix)[0]
+
+
+def address_children(result):
+    addresses = set(result.get('a_records', []))
+    addresses.update(result.get('ipv4_addresses', []), result.get('ipv6_addresses', []))
+    return [('ip', address) for address in sorted(addresses)]
+
+
+def host_name(name):
+    return name.rstrip('.').lower()
+
+
+def mx_children(result):
+    # A null MX ('.') names no host
+    hosts = {host_name(record['exchange']) for record in result.get('mx_records', [])}
+    return [('host', host) for host in sorted(hosts) if host]
+
+
+def ns_children(result):
+    hosts = {host_name(name) for name in result.get('ns_records', [])}
+    return [('host', host) for host in sorted(hosts) if host]
+
+
+def route_children(result):
+    children = set()
+    for prefix in (result.get('data') or {}).get('prefixes', []):
+        children.add(('prefix', prefix['prefix']))
+        if prefix.get('asn'):
+            children.add(('asn', f"AS{prefix['asn']['asn']}"))
+    return sorted(children)
+
+
+# Stage -> (lookup(service, value), children(result) -> [(kind, value)])
+STAGES = {
+    'a_records': (resolve_addresses, address_children),
+    'mx_records': (mail_exchangers, mx_children),
+    'ns_records': (nameservers, ns_children),
+    'ptr_records': (reverse_dns, None),
+    'ip_location': (geolocate, None),
+    'bgp_routes': (bgp_routes, route_children),
+    'asn_info': (asn_info, None),
+    'prefix_info': (prefix_info, None),
+}
+
+# Stage -> menu choice it runs, reported as 'op' in NDJSON output
+STAGE_CHOICES = {
+    'a_records': '18',
+    'mx_records': '20',
+    'ns_records': '22',
+    'ptr_records': '23',
+    'ip_location': '26',
+    'asn_info': '15',
+    'prefix_info': '14',
+}
+
+# Node kind -> stages run on every node of that kind
+PIPELINE = {
+    'domain': ['a_records'],
+    'ip': ['ptr_records', 'ip_location', 'bgp_routes'],
+    'asn': ['asn_info'],
+    'prefix': ['prefix_info'],
+}
+
+# Mail and DNS infrastructure: the ASN comes from the IP's BGP routes, without further lookups
+MAIL_PIPELINE = {
+    'domain': ['mx_records', 'ns_records'],
+    'host': ['a_records'],
+    'ip': ['ptr_records', 'bgp_routes'],
+    'asn': [],
+    'prefix': [],
+}
+
+# Node kind -> key under which a parent lists its children of that kind
+LINK_KEYS = {'host': 'hosts', 'ip': 'ips', 'asn': 'asns', 'prefix': 'prefixes'}
+
+
+class EnrichmentPipeline:
+    """Expands targets through a pipeline DAG (PIPELINE by default), memoizing every node."""
+
+    def __init__(self, service, workers=DEFAULT_WORKERS, writer=None, pipeline=PIPELINE):
+        """Initialize the pipeline.
+
+        Args:
+            service (Toolkit.service.NetInfoService): Service running the lookups.
+            workers (int): Maximum number of lookups in flight.
+            writer (Toolkit.output.NDJSONWriter, optional): Emits every stage
+                result as soon as it is ready.
+            pipeline (dict): Node kind -> stages run on every node of that kind.
+        """
+        self.service = service
+        self.workers = workers
+        self.writer = writer
+        self.pipeline = pipeline
+        self.nodes = {kind: {} for kind in pipeline}
+        self.memo_hits = 0
+        self._tasks = {}
+        self._semaphore = None
+
+    async def visit(self, kind, value):
+        """Expands a node, or waits on the expansion already started for it."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.workers)
+        task = self._tasks.get((kind, value))
+        if task is None:
+            task = self._tasks[(kind, value)] = asyncio.ensure_future(self._expand(kind, value))
+        else:
+            self.memo_hits += 1
+        await task
+
+    async def _expand(self, kind, value):
+        node = self.nodes[kind].setdefault(value, {})
+        await asyncio.gather(*(self._run_stage(stage, value, node) for stage in self.pipeline[kind]))
+
+    async def _run_stage(self, stage, value, node):
+        lookup, children = STAGES[stage]
+        async with self._semaphore:
+            start = time.perf_counter()
+            try:
+                result = await asyncio.to_thread(lookup, self.service, value)
+            except Exception as e:
+                logging.error(f"Enrichment stage '{stage}' failed for {value}: {e}")
+                node.setdefault('errors', {})[stage] = str(e)
+                if self.writer is not None:
+                    self.writer.emit(STAGE_CHOICES.get(stage), stage, value, None, e, time.perf_counter() - start)
+                return
+        if self.writer is not None:
+            self.writer.emit(STAGE_CHOICES.get(stage), stage, value, result, None, time.perf_counter() - start)
+        node[stage] = result
+        if children is None:
+            return
+        links = children(result)
+        for child_kind, child_value in links:
+            node.setdefault(LINK_KEYS[child_kind], []).append(child_value)
+        await asyncio.gather(*(self.visit(child_kind, child_value) for child_kind, child_value in links))
+
+    async def enrich(self, domains):
+        """Enriches every domain and returns the shared node graph."""
+        await asyncio.gather(*(self.visit('domain', domain) for domain in domains))
+        return self.nodes
+
+
+def run_pipeline(pipeline_stages, domains, workers=DEFAULT_WORKERS, service=None, writer=None):
+    """Runs an EnrichmentPipeline over domains, with a service of its own unless one is given.
+
+    Returns:
+        tuple: (the pipeline, its node graph).
+    """
+    if service is None:
+        from Toolkit.service import NetInfoService
+        service = NetInfoService()
+        owns_service = True
+    else:
+        owns_service = False
+
+    pipeline = EnrichmentPipeline(service, workers, writer, pipeline_stages)
+    try:
+        nodes = asyncio.run(pipeline.enrich(list(domains)))
+    finally:
+        if owns_service:
+            service.close()
+    return pipeline, nodes
+
+
+def join_infrastructure(nodes):
+    """Joins the shared host and IP nodes of a MAIL_PIPELINE graph back onto each domain.
+
+    Returns:
+        dict: domain -> {'mx': [{'host', 'preference', 'addresses'}], 'ns': [{'host', 'addresses'}]},
+        each address being {'ip', 'ptr_records', 'asns'}, plus 'errors' when a lookup failed.
+    """
+    def addresses(host):
+        joined = []
+        for ip_address in nodes['host'].get(host, {}).get('ips', []):
+            ip_node = nodes['ip'].get(ip_address, {})
+            joined.append({
+                'ip': ip_address,
+                'ptr_records': ip_node.get('ptr_records', {}).get('ptr_records', []),
+                'asns': ip_node.get('asns', []),
+            })
+        return joined
+
+    infrastructure = {}
+    for domain, node in nodes['domain'].items():
+        mx_records = node.get('mx_records', {}).get('mx_records', [])
+        ns_records = node.get('ns_records', {}).get('ns_records', [])
+        # Skips a null MX ('.'), which names no host, as mx_children does
+        joined = {
+            'mx': [{'host': host_name(record['exchange']), 'preference': record['preference'],
+                    'addresses': addresses(host_name(record['exchange']))}
+                   for record in sorted(mx_records, key=lambda record: record['preference'])
+                   if host_name(record['exchange'])],
+            'ns': [{'host': host_name(name), 'addresses': addresses(host_name(name))}
+                   for name in ns_records if host_name(name)],
+        }
+        if node.get('errors'):
+            joined['errors'] = node['errors']
+        infrastructure[domain] = joined
+    return infrastructure
+
+
+def enrich_main(domains, output_filename='enrichment.json', workers=DEFAULT_WORKERS, service=None, store=None,
+                writer=None):
+    """Enriches a list of domains and saves the node graph.
+
+    Args:
+        domains (iterable): Domains to enrich.
+        output_filename (str): File the graph is saved to when no store is given.
+        workers (int): Maximum number of lookups in flight.
+        service (Toolkit.service.NetInfoService, optional): Service to reuse.
+        store (Toolkit.result_store.ResultStore, optional): Store that receives
+            one record per node, typed by node kind.
+        writer (Toolkit.output.NDJSONWriter, optional): Streams every stage
+            result while the run is in progress.
+    """
+    start = time.perf_counter()
+    pipeline, nodes = run_pipeline(PIPELINE, domains, workers, service, writer)
+    if store is not None:
+        for kind, values in nodes.items():
+            for value, node in values.items():
+                store.write(value, kind, node)
+        output_filename = store.path
+    else:
+        with open(output_filename, 'w') as file:
+            json.dump(nodes, file, indent=4, default=str)
+    counts = ', '.join(f"{len(values)} {kind}s" for kind, values in nodes.items())
+    print(f"Enriched {counts} in {time.perf_counter() - start:.2f}s "
+          f"({pipeline.memo_hits} shared nodes reused). Saved to {output_filename}")
+    return nodes
+
+
+def mail_infra_main(domains, output_filename='mail_infrastructure.json', workers=DEFAULT_WORKERS, service=None,
+                    store=None, writer=None):
+    """Maps the mail exchangers and nameservers of a list of domains, with each host resolved once.
+
+    The MX and NS hosts of the whole batch are deduplicated: every host's
+    addresses, and every address's PTR records and ASNs, are looked up once
+    however many domains share it, then joined back onto each domain.
+
+    Args:
+        domains (iterable): Domains to map.
+        output_filename (str): File the per-domain map is saved to when no store is given.
+        workers (int): Maximum number of lookups in flight.
+        service (Toolkit.service.NetInfoService, optional): Service to reuse.
+        store (Toolkit.result_store.ResultStore, optional): Store that receives one
+            'mail_infrastructure' record per domain.
+        writer (Toolkit.output.NDJSONWriter, optional): Streams every stage
+            result while the run is in progress.
+
+    Returns:
+        dict: domain -> join_infrastructure() entry.
+    """
+    start = time.perf_counter()
+    pipeline, nodes = run_pipeline(MAIL_PIPELINE, domains, workers, service, writer)
+    infrastructure = join_infrastructure(nodes)
+    if store is not None:
+        for domain, joined in infrastructure.items():
+            store.write(domain, 'mail_infrastructure', joined)
+        output_filename = store.path
+    else:
+        with open(output_filename, 'w') as file:
+            json.dump(infrastructure, file, indent=4, default=str)
+    lookups = sum(len(values) * len(MAIL_PIPELINE[kind]) for kind, values in nodes.items())
+    print(f"Mapped {len(nodes['domain'])} domains onto {len(nodes['host'])} hosts and {len(nodes['ip'])} IPs "
+          f"with {lookups} lookups in {time.perf_counter() - start:.2f}s "
+          f"({pipeline.memo_hits} shared nodes reused). Saved to {output_filename}")
+    return infrastructure
@@ -0,0 +1,95 @@
+"""Shared HTTP clients so every module reuses TCP/TLS connections.
+
+get_session() returns one process-wide requests.Session with per-host
+keep-alive pools and a default timeout. get_async_session() returns one
+aiohttp.ClientSession per event loop whose connector pools connections and
+caches DNS lookups. configure() changes the limits before first use.
+"""
+import asyncio
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_TIMEOUT = 10
+DEFAULT_POOL_HOSTS = 100
+DEFAULT_POOL_PER_HOST = 64
+DEFAULT_DNS_CACHE_TTL = 300
+
+settings = {
+    'timeout': DEFAULT_TIMEOUT,
+    'pool_hosts': DEFAULT_POOL_HOSTS,
+    'pool_per_host': DEFAULT_POOL_PER_HOST,
+    'dns_cache_ttl': DEFAULT_DNS_CACHE_TTL,
+}
+
+_session = None
+_session_lock = threading.Lock()
+_async_sessions = {}
+
+
+def configure(timeout=None, pool_hosts=None, pool_per_host=None, dns_cache_ttl=None):
+    """Overrides client limits. Sessions created afterwards use the new values.
+
+    Args:
+        timeout (float, optional): Default request timeout in seconds.
+        pool_hosts (int, optional): Number of hosts with a kept-alive pool.
+        pool_per_host (int, optional): Connections kept per host.
+        dns_cache_ttl (int, optional): Seconds the async connector caches DNS answers.
+    """
+    for key, value in (('timeout', timeout), ('pool_hosts', pool_hosts),
+                       ('pool_per_host', pool_per_host), ('dns_cache_ttl', dns_cache_ttl)):
+        if value is not None:
+            settings[key] = value
+
+
+class PooledSession(requests.Session):
+    """requests.Session that applies the configured timeout unless one is given."""
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', settings['timeout'])
+        return super().request(method, url, **kwargs)
+
+
+def get_session():
+    """Returns the shared, thread-safe requests session."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = PooledSession()
+            adapter = HTTPAdapter(pool_connections=settings['pool_hosts'],
+                                  pool_maxsize=settings['pool_per_host'])
+            _session.mount('http://', adapter)
+            _session.mount('https://', adapter)
+        return _session
+
+
+async def get_async_session():
+    """Returns the aiohttp session of the running event loop, creating it on first use."""
+    import aiohttp
+    loop = asyncio.get_running_loop()
+    session = _async_sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(limit=settings['pool_hosts'] * settings['pool_per_host'],
+                                         limit_per_host=settings['pool_per_host'],
+                                         ttl_dns_cache=settings['dns_cache_ttl'])
+        session = aiohttp.ClientSession(connector=connector,
+                                        timeout=aiohttp.ClientTimeout(total=settings['timeout']))
+        _async_sessions[loop] = session
+    return session
+
+
+async def close_async_session():
+    """Closes the running event loop's aiohttp session, if it has one."""
+    session = _async_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+
+def close():
+    """Closes the shared requests session."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,64 @@
+"""Streaming NDJSON output: one JSON object per result, written as soon as it is ready.
+
+Every line has the same keys:
+    op           Menu choice that produced the result, or null for internal stages.
+    record_type  Stable name of the result shape, e.g. 'mx_records' (see RECORD_TYPES).
+    target       Domain, IP, ASN or URL the result describes.
+    timestamp    Epoch seconds when the result was emitted.
+    elapsed_ms   Time the lookup took.
+    ok           False when the lookup raised.
+    data         The result, or null on error.
+    error        Error message, or null on success.
+"""
+import sys
+import json
+import time
+import threading
+import contextlib
+
+
+class NDJSONWriter:
+    """Thread-safe writer of one JSON line per result."""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def emit(self, op, record_type, target, data=None, error=None, elapsed=None):
+        """Writes and flushes one result line.
+
+        Args:
+            op (str): Menu choice, or None for stages that are not menu options.
+            record_type (str): Name of the result shape.
+            target (str): What the result describes.
+            data: JSON-serializable result.
+            error (Exception or str, optional): Failure, if the lookup raised.
+            elapsed (float, optional): Seconds the lookup took.
+        """
+        line = json.dumps({
+            'op': op,
+            'record_type': record_type,
+            'target': target,
+            'timestamp': time.time(),
+            'elapsed_ms': None if elapsed is None else round(elapsed * 1000, 3),
+            'ok': error is None,
+            'data': None if error is not None else data,
+            'error': None if error is None else str(error),
+        }, default=str)
+        with self._lock:
+            self.stream.write(line + '\n')
+            self.stream.flush()
+            self.count += 1
+
+
+@contextlib.contextmanager
+def ndjson_stdout():
+    """Yields an NDJSONWriter on stdout and sends everything else printed to stderr.
+
+    The fetchers report progress with print(); diverting it keeps stdout pure
+    NDJSON for jq, Kafka producers and other consumers.
+    """
+    writer = NDJSONWriter(sys.stdout)
+    with contextlib.redirect_stdout(sys.stderr):
+        yield writer
@@ -0,0 +1,88 @@
+"""Reverse DNS sweeps of whole IPv4 and IPv6 CIDR blocks."""
+import sys
+import time
+import asyncio
+
+from DNS_Records.PTR_records import reverse_names, address_from_reverse
+from Toolkit.dns_bulk import open_engine, DEFAULT_IN_FLIGHT, PROGRESS_INTERVAL
+from Toolkit.registry import RECORD_TYPES
+
+
+def ptr_sweep_main(cidrs, output='-', in_flight=DEFAULT_IN_FLIGHT, nameservers=None, port=53, store=None,
+                   writer=None, progress_interval=PROGRESS_INTERVAL, raw_udp=False):
+    """Resolves the PTR record of every address in the given blocks and writes only the hits.
+
+    Reverse names are generated lazily, so a block never sits in memory as a
+    list of addresses, and at most in_flight queries are outstanding. Each hit
+    goes to the result store and/or NDJSON writer when given, otherwise to
+    output as a tab-separated line: address, TTL, then each name.
+
+    Args:
+        cidrs (iterable): IPv4 or IPv6 networks, e.g. '198.51.100.0/22' or '2001:db8::/120'.
+        output (str): File for the hits, '-' for stdout.
+        in_flight (int): Maximum number of outstanding queries.
+        nameservers (list, optional): Upstream resolvers. Defaults to the system configuration.
+        port (int): Port the upstream resolvers listen on.
+        store (Toolkit.result_store.ResultStore, optional): Store for the hits.
+        writer (Toolkit.output.NDJSONWriter, optional): Streams each hit.
+        progress_interval (float): Seconds between progress lines.
+        raw_udp (bool): Use the pipelined raw UDP engine for the highest queries per second.
+
+    Returns:
+        dict: Number of answers per status.
+    """
+    generators = []
+    for cidr in cidrs:
+        try:
+            generators.append(reverse_names(cidr))
+        except ValueError as e:
+            print(f"Skipping {cidr}: {e}", file=sys.stderr)
+    stream = None
+    if store is None and writer is None:
+        stream = sys.stdout if output == '-' else open(output, 'w', encoding='utf-8')
+    counts = {}
+    start = last_report = time.perf_counter()
+
+    def handle(answer, elapsed):
+        nonlocal last_report
+        counts[answer.status] = counts.get(answer.status, 0) + 1
+        if answer.records:
+            address = address_from_reverse(answer.name)
+            names = [record.value for record in answer.records]
+            if stream is not None:
+                stream.write('\t'.join([address, str(answer.ttl)] + names) + '\n')
+            if writer is not None:
+                writer.emit('23', RECORD_TYPES['23'], address, {'ptr_records': names}, None, elapsed)
+            if store is not None:
+                store.write(address, RECORD_TYPES['23'], {'ptr_records': names})
+        now = time.perf_counter()
+        if now - last_report >= progress_interval:
+            last_report = now
+            done = sum(counts.values())
+            print(f"{done} addresses, {counts.get('NOERROR', 0)} hits, {done / (now - start):.0f} qps",
+                  file=sys.stderr)
+
+    async def run():
+        engine = open_engine(nameservers, port, in_flight, raw_udp)
+        queries = ((name, 'PTR') for names in generators for name in names)
+        try:
+            async for answer, elapsed in engine.stream(queries, in_flight):
+                handle(answer, elapsed)
+        finally:
+            engine.close()
+
+    try:
+        asyncio.run(run())
+    finally:
+        if stream is not None and stream is not sys.stdout:
+            stream.close()
+    total = sum(counts.values())
+    elapsed = time.perf_counter() - start
+    summary = ', '.join(f"{status} {count}" for status, count in sorted(counts.items()))
+    print(f"Swept {total} addresses in {elapsed:.2f}s ({total / elapsed if elapsed else 0:.0f} qps): {summary}",
+          file=sys.stderr)
+    return counts
+
+
+if __name__ == "__main__":
+    ptr_sweep_main(['192.0.2.0/24', '2001:db8::/120'], in_flight=500)
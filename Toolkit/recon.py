@@ -0,0 +1,146 @@
+"""Full recon profile: every lookup for one target, run concurrently."""
+import json
+import time
+import asyncio
+import logging
+from urllib.parse import urlparse
+
+# Profile step -> (menu choice, extra options). Each step gets the bare domain,
+# except 'headers' which gets a URL.
+PROFILE_STEPS = {
+    'whois': ('3', {}),
+    'headers': ('5', {}),
+    # WHOIS already runs as its own step, so only fetch the certificate here
+    'ssl_certificate': ('8', {'whois': False}),
+    'a_records': ('18', {}),
+}
+
+# Steps answered together by one async DNS engine batch: step -> (menu choice, record type)
+DNS_STEPS = {
+    'cname_records': ('19', 'CNAME'),
+    'mx_records': ('20', 'MX'),
+    'soa_record': ('21', 'SOA'),
+    'ns_records': ('22', 'NS'),
+    'srv_records': ('24', 'SRV'),
+    'txt_records': ('25', 'TXT'),
+}
+
+# Steps run once for every address the 'a_records' step finds.
+ADDRESS_STEPS = {
+    'ptr_records': '23',
+    'ip_location': '26',
+}
+
+
+def split_target(target):
+    """Returns (domain, url) for a bare domain or a URL."""
+    url = target if target.startswith(('http://', 'https://')) else 'https://' + target
+    return urlparse(url).hostname, url
+
+
+async def profile_target(target, service, writer=None):
+    """Runs WHOIS, headers, SSL, every DNS record type and geolocation for a target at once.
+
+    Blocking lookups run in worker threads and the DNS record types go out as
+    one async batch, so the profile takes about as long as its slowest lookup
+    rather than the sum of all of them. Address based
+    steps (PTR, geolocation) start as soon as the A lookup returns.
+
+    Args:
+        target (str): Domain or URL to profile.
+        service (Toolkit.service.NetInfoService): Service whose warm resolvers,
+            sessions and result cache the lookups use.
+        writer (Toolkit.output.NDJSONWriter, optional): Emits each step's
+            result as soon as that step finishes.
+
+    Returns:
+        dict: One document with every step's result, error and timing.
+    """
+    domain, url = split_target(target)
+    document = {'target': target, 'domain': domain, 'results': {}, 'errors': {}, 'timings_ms': {}}
+
+    async def run_step(name, record_type, choice, argument, **options):
+        start = time.perf_counter()
+        result = error = None
+        try:
+            result, _ = await asyncio.to_thread(service.run, choice, argument, **options)
+        except Exception as e:
+            logging.error(f"Profile step '{name}' failed for {argument}: {e}")
+            document['errors'][name] = str(e)
+            error = e
+        elapsed = time.perf_counter() - start
+        document['timings_ms'][name] = round(elapsed * 1000, 3)
+        if writer is not None:
+            writer.emit(choice, record_type, argument, result, error, elapsed)
+        return result
+
+    tasks = {
+        name: asyncio.create_task(run_step(name, name, choice, url if name == 'headers' else domain, **options))
+        for name, (choice, options) in PROFILE_STEPS.items()
+    }
+
+    async def run_dns_steps():
+        start = time.perf_counter()
+        rdtypes = tuple(rdtype for _, rdtype in DNS_STEPS.values())
+        try:
+            results = await asyncio.to_thread(service.dns_profile, domain, rdtypes)
+            error = None
+        except Exception as e:
+            logging.error(f"Profile DNS steps failed for {domain}: {e}")
+            results, error = {}, e
+        elapsed = time.perf_counter() - start
+        for name, (choice, _) in DNS_STEPS.items():
+            document['results'][name] = results.get(choice)
+            document['timings_ms'][name] = round(elapsed * 1000, 3)
+            if error is not None:
+                document['errors'][name] = str(error)
+            if writer is not None:
+                writer.emit(choice, name, domain, results.get(choice), error, elapsed)
+
+    async def run_address_steps():
+        a_records = await tasks['a_records'] or {}
+        addresses = sorted(set(a_records.get('a_records', []) + a_records.get('ipv4_addresses', [])
+                               + a_records.get('ipv6_addresses', [])))
+        jobs = [(name, choice, address) for address in addresses for name, choice in ADDRESS_STEPS.items()]
+        results = await asyncio.gather(*(run_step(f"{name}[{address}]", name, choice, address)
+                                         for name, choice, address in jobs))
+        for (name, _, address), result in zip(jobs, results):
+            document['results'].setdefault(name, {})[address] = result
+
+    start = time.perf_counter()
+    await asyncio.gather(run_dns_steps(), run_address_steps(), *tasks.values())
+    for name, task in tasks.items():
+        document['results'][name] = task.result()
+    document['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 3)
+    return document
+
+
+def profile_main(target, service=None, store=None, writer=None):
+    """Profiles a target and saves the merged document.
+
+    The document goes to the result store as a 'profile' record when one is
+    given, otherwise to '<domain>_profile.json'. With a writer, each step is
+    also streamed as NDJSON while the profile runs.
+    """
+    if service is None:
+        from Toolkit.service import NetInfoService
+        service = NetInfoService()
+        owns_service = True
+    else:
+        owns_service = False
+    try:
+        document = asyncio.run(profile_target(target, service, writer))
+    finally:
+        if owns_service:
+            service.close()
+
+    if store is not None:
+        store.write(document['domain'], 'profile', document)
+        destination = store.path
+    else:
+        destination = f"{document['domain']}_profile.json"
+        with open(destination, 'w') as file:
+            json.dump(document, file, indent=4, default=str)
+    print(f"Profile for {target} saved to {destination} ({document['elapsed_ms'] / 1000:.2f}s, "
+          f"{len(document['errors'])} failed steps)")
+    return document
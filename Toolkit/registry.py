@@ -0,0 +1,115 @@
+import importlib
+
+
+class LazyCommand:
+    """A tool entry point whose module is imported the first time it is used."""
+
+    def __init__(self, module, attribute):
+        """Initialize the command.
+
+        Args:
+            module (str): Dotted name of the module that defines the command.
+            attribute (str): Name of the function or class inside the module.
+        """
+        self.module = module
+        self.attribute = attribute
+        self._target = None
+
+    @property
+    def loaded(self):
+        return self._target is not None
+
+    def load(self):
+        """Imports the module on first use and returns the command object."""
+        if self._target is None:
+            self._target = getattr(importlib.import_module(self.module), self.attribute)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+    def __repr__(self):
+        return f"LazyCommand({self.module!r}, {self.attribute!r})"
+
+
+# Every tool the menu can dispatch to, keyed by a stable command name.
+COMMANDS = {
+    'ip_whois': LazyCommand('ipwhois', 'IPWhois'),
+    'port_scanner': LazyCommand('IP_info.port_scanner', 'port_scanner_async'),
+    'whois_info': LazyCommand('IP_info.Whois_info', 'whois_info'),
+    'crawler': LazyCommand('IP_info.Crawler', 'main'),
+    'header_info': LazyCommand('IP_info.HEADER_info', 'save_header_info'),
+    'robots_txt': LazyCommand('IP_info.Robot_info', 'parse_robots_txt'),
+    'sitemap': LazyCommand('IP_info.sitemap', 'sitemap_main'),
+    'ssl_info': LazyCommand('IP_info.SSL_Certificate_Information', 'ssl_main'),
+    'bgp': LazyCommand('imp.ASN_info', 'BGP'),
+    'a_records': LazyCommand('DNS_Records.A_records', 'get_a_records'),
+    'cname_records': LazyCommand('DNS_Records.CNAME_records', 'fetch_cname_records'),
+    'mx_records': LazyCommand('DNS_Records.MX_records', 'MXRecordFetcher'),
+    'soa_records': LazyCommand('DNS_Records.SOA_records', 'SOARecordFetcher'),
+    'ns_records': LazyCommand('DNS_Records.NS_records', 'NSRecordFetcher'),
+    'ptr_records': LazyCommand('DNS_Records.PTR_records', 'PTRRecordFetcher'),
+    'srv_records': LazyCommand('DNS_Records.SRV_records', 'SRVRecordFetcher'),
+    'txt_records': LazyCommand('DNS_Records.TXT_records', 'fetch_txt_records_for_domain'),
+    'ip_location': LazyCommand('IP_info.IP_location', 'IPGeolocationAPI'),
+}
+
+# Menu choice -> command it needs.
+MENU_CHOICES = {
+    '1': 'ip_whois',
+    '2': 'port_scanner',
+    '3': 'whois_info',
+    '4': 'crawler',
+    '5': 'header_info',
+    '6': 'robots_txt',
+    '7': 'sitemap',
+    '8': 'ssl_info',
+    '9': 'bgp',
+    '10': 'bgp',
+    '11': 'bgp',
+    '12': 'bgp',
+    '13': 'bgp',
+    '14': 'bgp',
+    '15': 'bgp',
+    '16': 'bgp',
+    '17': 'bgp',
+    '18': 'a_records',
+    '19': 'cname_records',
+    '20': 'mx_records',
+    '21': 'soa_records',
+    '22': 'ns_records',
+    '23': 'ptr_records',
+    '24': 'srv_records',
+    '25': 'txt_records',
+    '26': 'ip_location',
+}
+
+# Menu choice -> record type its results are stored and emitted under.
+RECORD_TYPES = {
+    '1': 'ip_info',
+    '2': 'open_ports',
+    '3': 'whois',
+    '4': 'crawl',
+    '5': 'headers',
+    '6': 'robots_txt',
+    '7': 'sitemap',
+    '8': 'ssl_certificate',
+    '9': 'asn_prefixes',
+    '10': 'asn_peers',
+    '11': 'asn_upstreams',
+    '12': 'asn_downstreams',
+    '13': 'asn_ixs',
+    '14': 'ip_prefix',
+    '15': 'asn_info',
+    '16': 'ix_info',
+    '17': 'search',
+    '18': 'a_records',
+    '19': 'cname_records',
+    '20': 'mx_records',
+    '21': 'soa_record',
+    '22': 'ns_records',
+    '23': 'ptr_records',
+    '24': 'srv_records',
+    '25': 'txt_records',
+    '26': 'ip_location',
+}
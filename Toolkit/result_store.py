@@ -0,0 +1,214 @@
+"""Pluggable result stores so bulk runs write one indexed store instead of a file per target.
+
+Usage:
+    python -m Toolkit.result_store results.db [--target google.com] [--type mx_records] [--since 2024-01-01]
+"""
+import os
+import json
+import time
+import sqlite3
+import argparse
+import threading
+from datetime import datetime
+
+DEFAULT_BATCH_SIZE = 500
+
+
+class ResultStore:
+    """Base class: buffers records and writes them in batches.
+
+    Subclasses implement _write_batch() and query().
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def write(self, target, record_type, data, timestamp=None):
+        """Queues one record, flushing once a full batch is pending.
+
+        Args:
+            target (str): Domain, IP, ASN or URL the record describes.
+            record_type (str): Kind of record, e.g. 'mx_records' or 'asn_info'.
+            data: JSON-serializable result.
+            timestamp (float, optional): Epoch seconds. Defaults to now.
+        """
+        record = (target, record_type, time.time() if timestamp is None else timestamp,
+                  json.dumps(data, default=str))
+        with self._lock:
+            self._pending.append(record)
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._pending:
+            self._write_batch(self._pending)
+            self._pending = []
+
+    def _write_batch(self, records):
+        raise NotImplementedError
+
+    def query(self, target=None, record_type=None, since=None, until=None):
+        """Yields matching records as dicts, oldest first.
+
+        Args:
+            target (str, optional): Only records for this target.
+            record_type (str, optional): Only records of this type.
+            since (float, optional): Only records at or after this epoch time.
+            until (float, optional): Only records before this epoch time.
+        """
+        raise NotImplementedError
+
+    def latest(self, record_type):
+        """Returns the newest data of the given type for every target.
+
+        Args:
+            record_type (str): Kind of record, e.g. 'zone_snapshot'.
+
+        Returns:
+            dict: target -> data of its most recent record.
+        """
+        return {record['target']: record['data'] for record in self.query(record_type=record_type)}
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SQLiteStore(ResultStore):
+    """Results in one SQLite table indexed by target, record type and timestamp."""
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        super().__init__(batch_size)
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "id INTEGER PRIMARY KEY, target TEXT NOT NULL, record_type TEXT NOT NULL, "
+                "timestamp REAL NOT NULL, data TEXT NOT NULL)")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS results_target ON results (target, record_type, timestamp)")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS results_type ON results (record_type, timestamp)")
+
+    def _write_batch(self, records):
+        # One transaction per batch
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO results (target, record_type, timestamp, data) VALUES (?, ?, ?, ?)", records)
+
+    def query(self, target=None, record_type=None, since=None, until=None):
+        self.flush()
+        clauses, params = [], []
+        for clause, value in (("target = ?", target), ("record_type = ?", record_type),
+                              ("timestamp >= ?", since), ("timestamp < ?", until)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        sql = "SELECT target, record_type, timestamp, data FROM results"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        with self._lock:
+            rows = self.connection.execute(sql + " ORDER BY timestamp, id", params).fetchall()
+        for row_target, row_type, timestamp, data in rows:
+            yield {'target': row_target, 'record_type': row_type, 'timestamp': timestamp, 'data': json.loads(data)}
+
+    def latest(self, record_type):
+        self.flush()
+        # SQLite returns the bare columns of the row holding the MAX()
+        sql = "SELECT target, data, MAX(timestamp) FROM results WHERE record_type = ? GROUP BY target"
+        with self._lock:
+            rows = self.connection.execute(sql, (record_type,)).fetchall()
+        return {target: json.loads(data) for target, data, _ in rows}
+
+    def close(self):
+        super().close()
+        self.connection.close()
+
+
+class NDJSONStore(ResultStore):
+    """Append-only newline-delimited JSON file, one record per line."""
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        super().__init__(batch_size)
+        self.path = path
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def _write_batch(self, records):
+        # data is already serialized, so splice it in rather than encoding it twice
+        self.file.write(''.join(
+            f'{{"target": {json.dumps(target)}, "record_type": {json.dumps(record_type)}, '
+            f'"timestamp": {timestamp!r}, "data": {data}}}\n'
+            for target, record_type, timestamp, data in records))
+        self.file.flush()
+
+    def query(self, target=None, record_type=None, since=None, until=None):
+        self.flush()
+        with open(self.path, encoding='utf-8') as file:
+            for line in file:
+                record = json.loads(line)
+                if target is not None and record['target'] != target:
+                    continue
+                if record_type is not None and record['record_type'] != record_type:
+                    continue
+                if since is not None and record['timestamp'] < since:
+                    continue
+                if until is not None and record['timestamp'] >= until:
+                    continue
+                yield record
+
+    def close(self):
+        super().close()
+        self.file.close()
+
+
+def open_store(spec, batch_size=DEFAULT_BATCH_SIZE):
+    """Opens a store from a path.
+
+    '.ndjson' and '.jsonl' paths (or an 'ndjson:' prefix) open an NDJSONStore;
+    anything else (optionally prefixed 'sqlite:') opens a SQLiteStore.
+    """
+    kind, _, path = spec.partition(':')
+    if kind in ('sqlite', 'ndjson') and path:
+        return (NDJSONStore if kind == 'ndjson' else SQLiteStore)(path, batch_size)
+    if os.path.splitext(spec)[1].lower() in ('.ndjson', '.jsonl'):
+        return NDJSONStore(spec, batch_size)
+    return SQLiteStore(spec, batch_size)
+
+
+def parse_time(value):
+    """Accepts epoch seconds or an ISO 8601 date/time."""
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query a NetInfo result store")
+    parser.add_argument('store', help="Store path (.db/.sqlite for SQLite, .ndjson/.jsonl for NDJSON).")
+    parser.add_argument('--target', help="Only records for this target.")
+    parser.add_argument('--type', dest='record_type', help="Only records of this type, e.g. mx_records.")
+    parser.add_argument('--since', type=parse_time, help="Only records at or after this time.")
+    parser.add_argument('--until', type=parse_time, help="Only records before this time.")
+    args = parser.parse_args()
+    with open_store(args.store) as store:
+        for record in store.query(args.target, args.record_type, args.since, args.until):
+            print(json.dumps(record, default=str))
+
+
+if __name__ == "__main__":
+    main()
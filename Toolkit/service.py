@@ -0,0 +1,296 @@
+import time
+import asyncio
+import threading
+import collections
+
+from Toolkit import http_client
+from DNS_Records.dns_cache import get_resolver
+from DNS_Records.dns_engine import AsyncDNSEngine
+from DNS_Records.resolver_pool import ResolverPool
+from Toolkit.registry import COMMANDS
+
+DEFAULT_RESULT_TTL = 300
+DEFAULT_RESULT_CACHE_SIZE = 10000
+
+# Record type -> menu choice whose result dns_profile fills in
+DNS_CHOICES = {'CNAME': '19', 'MX': '20', 'SOA': '21', 'NS': '22', 'SRV': '24', 'TXT': '25'}
+
+
+class ResultCache:
+    """Thread-safe LRU cache of operation results that expire after a TTL."""
+
+    def __init__(self, ttl=DEFAULT_RESULT_TTL, max_size=DEFAULT_RESULT_CACHE_SIZE):
+        """Initialize the cache.
+
+        Args:
+            ttl (float): Seconds a result stays fresh.
+            max_size (int): Maximum number of results kept; least recently used go first.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns (True, result) for a fresh entry, (False, None) otherwise."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, result):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+class NetInfoService:
+    """Runs menu operations and returns their results as JSON-friendly data.
+
+    Resolvers, HTTP sessions, the aiohttp connection pool and recent results
+    are kept between calls, so a resident process pays for them only once.
+    """
+
+    def __init__(self, result_ttl=DEFAULT_RESULT_TTL, cache_size=DEFAULT_RESULT_CACHE_SIZE):
+        # The fetchers, module-level helpers and async engine all share one DNS cache
+        self.resolver = get_resolver()
+        self.http = http_client.get_session()
+        self.results = ResultCache(result_ttl, cache_size)
+        self.bgp = COMMANDS['bgp'](session=self.http)
+        self.mx_fetcher = COMMANDS['mx_records'](resolver=self.resolver)
+        self.soa_fetcher = COMMANDS['soa_records'](resolver=self.resolver)
+        self.ns_fetcher = COMMANDS['ns_records'](resolver=self.resolver)
+        self.ptr_fetcher = COMMANDS['ptr_records'](resolver=self.resolver)
+        self.srv_fetcher = COMMANDS['srv_records'](resolver=self.resolver)
+        if isinstance(self.resolver, ResolverPool):
+            self.dns = AsyncDNSEngine(resolver=self.resolver.as_async())
+        else:
+            self.dns = AsyncDNSEngine()
+        self.loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._loop_thread.start()
+        self.operations = {
+            '1': self.ip_info,
+            '2': self.port_scan,
+            '3': self.whois,
+            '4': self.crawl,
+            '5': self.headers,
+            '6': self.robots,
+            '7': self.sitemap,
+            '8': self.ssl_certificate,
+            '9': lambda target, **options: self.bgp_view('ASN_Prefixes', target),
+            '10': lambda target, **options: self.bgp_view('ASN_Peers', target),
+            '11': lambda target, **options: self.bgp_view('ASN_Upstreams', target),
+            '12': lambda target, **options: self.bgp_view('ASN_Downstreams', target),
+            '13': lambda target, **options: self.bgp_view('ASN_IXs', target),
+            '14': lambda target, **options: self.bgp_view('IP_Prefix', *target.split('/', 1)),
+            '15': lambda target, **options: self.bgp_view('ASN_Info', target),
+            '16': lambda target, **options: self.bgp_view('IX', target),
+            '17': lambda target, **options: self.bgp_view('Search', target),
+            '18': self.a_records,
+            '19': self.cname_records,
+            '20': self.mx_records,
+            '21': self.soa_record,
+            '22': self.ns_records,
+            '23': self.ptr_records,
+            '24': self.srv_records,
+            '25': self.txt_records,
+            '26': self.ip_location,
+        }
+
+    def run(self, choice, target, refresh=False, **options):
+        """Runs a menu operation, serving a cached result when one is still fresh.
+
+        Args:
+            choice (str): Menu choice, '1' to '26'.
+            target (str): Domain, IP, ASN, URL or query the operation expects.
+            refresh (bool): Skip the result cache and fetch again.
+            **options: Operation specific settings (ports, timeout, depth).
+
+        Returns:
+            tuple: (result, cached) where cached tells whether the cache answered.
+
+        Raises:
+            KeyError: If the choice is not a menu option.
+        """
+        operation = self.operations[choice]
+        key = (choice, target, tuple(sorted(options.items())))
+        if not refresh:
+            hit, result = self.results.get(key)
+            if hit:
+                return result, True
+        result = operation(target, **options)
+        self.results.put(key, result)
+        return result, False
+
+    def dns_profile(self, target, rdtypes=tuple(DNS_CHOICES), refresh=False):
+        """Resolves several record types of a domain as one concurrent batch.
+
+        The queries go through the async DNS engine, so they cost about one
+        round trip together. Each result is shaped like, and cached as, the
+        matching menu operation's result, so service.run serves it afterwards.
+        CNAME is the exception: the menu operation follows the whole chain, so
+        the profile's single-hop answer is neither served from nor stored in
+        that operation's cache entry.
+
+        Args:
+            target (str): Domain to resolve.
+            rdtypes (tuple): Record types from DNS_CHOICES.
+            refresh (bool): Skip the result cache and query again.
+
+        Returns:
+            dict: Menu choice -> result.
+        """
+        results = {}
+        missing = []
+        for rdtype in rdtypes:
+            choice = DNS_CHOICES[rdtype]
+            if refresh or rdtype == 'CNAME':
+                hit, result = False, None
+            else:
+                hit, result = self.results.get((choice, target, ()))
+            if hit:
+                results[choice] = result
+            else:
+                missing.append(rdtype)
+        if missing:
+            answers = self.run_async(self.dns.resolve_domain(target, missing))
+            for rdtype, answer in answers.items():
+                choice = DNS_CHOICES[rdtype]
+                results[choice] = self.dns_result(rdtype, answer)
+                if rdtype != 'CNAME':
+                    self.results.put((choice, target, ()), results[choice])
+        return results
+
+    def dns_result(self, rdtype, answer):
+        """Shapes a DNSAnswer like the result of the menu operation for its record type."""
+        from DNS_Records.CNAME_records import cname_records_from_answer
+        from DNS_Records.TXT_records import txt_records_from_answer
+        if rdtype == 'CNAME':
+            return {'cname_records': cname_records_from_answer(answer)}
+        if rdtype == 'MX':
+            return {'mx_records': [{'preference': preference, 'exchange': exchange}
+                                   for preference, exchange in self.mx_fetcher.from_answer(answer)]}
+        if rdtype == 'SOA':
+            return {'soa_record': self.soa_fetcher.from_answer(answer)}
+        if rdtype == 'NS':
+            return {'ns_records': self.ns_fetcher.from_answer(answer)}
+        if rdtype == 'SRV':
+            return {'srv_records': self.srv_fetcher.from_answer(answer)}
+        return {'txt_records': [b''.join(record).decode('utf-8', 'replace')
+                                for record in txt_records_from_answer(answer)]}
+
+    def run_async(self, coro):
+        """Runs a coroutine on the service's event loop and waits for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def close(self):
+        """Closes the pooled sessions and stops the event loop."""
+        self.run_async(http_client.close_async_session())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._loop_thread.join()
+        http_client.close()
+
+    def ip_info(self, target, **options):
+        obj = COMMANDS['ip_whois'](target)
+        return {'rdap': obj.lookup_rdap(depth=3), 'whois': obj.lookup_whois()}
+
+    def port_scan(self, target, ports='1-1024', timeout=None, **options):
+        from IP_info.port_scanner import find_open_ports, DEFAULT_TIMEOUT
+        start_port, _, end_port = str(ports).partition('-')
+        open_ports = self.run_async(find_open_ports(
+            target, int(start_port), int(end_port or start_port), float(timeout or DEFAULT_TIMEOUT)))
+        return {'open_ports': open_ports}
+
+    def whois(self, target, **options):
+        from IP_info.Whois_info import get_whois_info
+        domain, info = get_whois_info(target)
+        return {'domain': domain, 'whois': dict(info) if info else None}
+
+    def crawl(self, target, **options):
+        from IP_info.Crawler import crawl
+        return asyncio.run(crawl(target))
+
+    def headers(self, target, **options):
+        from IP_info.HEADER_info import get_header_info
+        return get_header_info(target, session=self.http)
+
+    def robots(self, target, **options):
+        from IP_info.Robot_info import get_robot_info
+        return get_robot_info(target, session=self.http)
+
+    def sitemap(self, target, depth=1, **options):
+        from IP_info.sitemap import LinkExtractor
+        url = target if target.startswith(('http://', 'https://')) else 'http://' + target
+        extractor = LinkExtractor(url, int(depth))
+        try:
+            extractor.extract_links(url, int(depth))
+        finally:
+            extractor.close_session()
+        return {'links': sorted(extractor.all_links)}
+
+    def ssl_certificate(self, target, whois=True, **options):
+        from IP_info.SSL_Certificate_Information import get_ssl_certificate_info, get_whois_info
+        result = {'certificate': get_ssl_certificate_info(target)}
+        # Options from the /run query string arrive as strings
+        if str(whois).lower() in ('1', 'true', 'yes'):
+            result['whois'] = get_whois_info(target)
+        return result
+
+    def bgp_view(self, view, *args):
+        return self.bgp.get_data(self.bgp.endpoint(view, *args))
+
+    def a_records(self, target, getaddrinfo=False, **options):
+        from DNS_Records.A_records import DNSUtils
+        # A and AAAA go out together on the warm async engine; getaddrinfo only if asked and DNS found nothing
+        fallback = str(getaddrinfo).lower() in ('1', 'true', 'yes')
+        result = self.run_async(DNSUtils.resolve_addresses(target, self.dns, fallback))
+        return {'a_records': result['ipv4'], 'ipv4_addresses': result['ipv4'], 'ipv6_addresses': result['ipv6'],
+                'addresses': result['addresses']}
+
+    def cname_records(self, target, **options):
+        from DNS_Records.CNAME_records import follow_cname_chain
+        result = follow_cname_chain(target)
+        return {'cname_records': result['chain'], 'canonical_name': result['canonical_name'],
+                'addresses': result['addresses'], 'loop': result['loop']}
+
+    def mx_records(self, target, **options):
+        return {'mx_records': [{'preference': preference, 'exchange': exchange}
+                               for preference, exchange in self.mx_fetcher.get_mx_records(target)]}
+
+    def soa_record(self, target, **options):
+        return {'soa_record': self.soa_fetcher.get_soa_record(target)}
+
+    def ns_records(self, target, **options):
+        return {'ns_records': self.ns_fetcher.get_ns_records(target)}
+
+    def ptr_records(self, target, **options):
+        return {'ptr_records': self.ptr_fetcher.fetch_ptr_records(target)}
+
+    def srv_records(self, target, **options):
+        return {'srv_records': self.srv_fetcher.fetch_srv_records(target)}
+
+    def txt_records(self, target, **options):
+        from DNS_Records.TXT_records import get_txt_records
+        return {'txt_records': [b''.join(record).decode('utf-8', 'replace')
+                                for record in get_txt_records(target)]}
+
+    def ip_location(self, target, **options):
+        async def locate():
+            api = COMMANDS['ip_location'](session=await http_client.get_async_session())
+            return await api.collect_locations(target)
+        return self.run_async(locate())
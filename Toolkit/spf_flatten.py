@@ -0,0 +1,66 @@
+"""Bulk SPF flattening: every domain's SPF record expanded into merged CIDRs."""
+import sys
+import time
+import asyncio
+
+from DNS_Records.spf import SPFFlattener
+from Toolkit.dns_bulk import open_engine, DEFAULT_IN_FLIGHT
+
+RECORD_TYPE = 'spf_flattened'
+
+
+def spf_main(domains, output='-', in_flight=DEFAULT_IN_FLIGHT, nameservers=None, port=53, store=None, writer=None):
+    """Flattens the SPF record of every domain, resolving each shared include only once.
+
+    Results go to the result store and/or NDJSON writer when given, otherwise
+    to output as tab-separated lines: domain, status, DNS lookups, then every
+    merged CIDR.
+
+    Args:
+        domains (iterable): Domains, consumed lazily.
+        output (str): File for the lines, '-' for stdout.
+        in_flight (int): Maximum number of domains expanded at once.
+        nameservers (list, optional): Upstream resolvers. Defaults to the system configuration.
+        port (int): Port the upstream resolvers listen on.
+        store (Toolkit.result_store.ResultStore, optional): Store for the results.
+        writer (Toolkit.output.NDJSONWriter, optional): Streams each result.
+
+    Returns:
+        dict: Number of domains per status.
+    """
+    stream = None
+    if store is None and writer is None:
+        stream = sys.stdout if output == '-' else open(output, 'w', encoding='utf-8')
+    counts = {}
+    start = time.perf_counter()
+
+    async def run():
+        engine = open_engine(nameservers, port, in_flight)
+        flattener = SPFFlattener(engine)
+        try:
+            async for result in flattener.stream(domains, in_flight):
+                counts[result['status']] = counts.get(result['status'], 0) + 1
+                if stream is not None:
+                    stream.write('\t'.join([result['domain'], result['status'], str(result['lookups'])]
+                                           + result['ip4'] + result['ip6']) + '\n')
+                if writer is not None:
+                    writer.emit(None, RECORD_TYPE, result['domain'], result)
+                if store is not None:
+                    store.write(result['domain'], RECORD_TYPE, result)
+        finally:
+            engine.close()
+        return len(flattener.expansions)
+
+    try:
+        expansions = asyncio.run(run())
+    finally:
+        if stream is not None and stream is not sys.stdout:
+            stream.close()
+    summary = ', '.join(f"{status} {count}" for status, count in sorted(counts.items()))
+    print(f"Flattened {sum(counts.values())} SPF records ({expansions} distinct records expanded) in "
+          f"{time.perf_counter() - start:.2f}s: {summary}", file=sys.stderr)
+    return counts
+
+
+if __name__ == "__main__":
+    spf_main(['google.com', 'microsoft.com', 'github.com', 'sendgrid.com'])
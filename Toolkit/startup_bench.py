@@ -0,0 +1,77 @@
+"""Measures NetInfo_Toolkit cold start and per-command first-use latency.
+
+Each measurement runs in a fresh interpreter so module caches never carry over.
+
+Usage:
+    python -m Toolkit.startup_bench [--runs 5]
+"""
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+from Toolkit.registry import COMMANDS, MENU_CHOICES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COLD_START = """
+import time
+start = time.perf_counter()
+import NetInfo_Toolkit
+print(time.perf_counter() - start)
+"""
+
+FIRST_USE = """
+import time
+import NetInfo_Toolkit
+from Toolkit.registry import COMMANDS
+start = time.perf_counter()
+COMMANDS[{name!r}].load()
+print(time.perf_counter() - start)
+"""
+
+EAGER_START = """
+import time
+start = time.perf_counter()
+from Toolkit.registry import COMMANDS
+for command in COMMANDS.values():
+    command.load()
+print(time.perf_counter() - start)
+"""
+
+
+def time_snippet(code, runs):
+    """Runs a snippet in `runs` fresh interpreters and returns the median seconds it reports."""
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c', code], cwd=ROOT,
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        samples.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NetInfo_Toolkit startup benchmark")
+    parser.add_argument('--runs', type=int, default=5, help="Interpreter launches per measurement (default: 5).")
+    args = parser.parse_args()
+
+    print(f"Cold start (lazy registry):   {time_snippet(COLD_START, args.runs) * 1000:8.1f} ms")
+    try:
+        print(f"Eager import of every tool:   {time_snippet(EAGER_START, args.runs) * 1000:8.1f} ms")
+    except RuntimeError as e:
+        print(f"Eager import of every tool:   failed ({e})")
+    print("\nFirst-use latency per command:")
+    for name in COMMANDS:
+        choices = ','.join(choice for choice, command in MENU_CHOICES.items() if command == name)
+        try:
+            elapsed = f"{time_snippet(FIRST_USE.format(name=name), args.runs) * 1000:8.1f} ms"
+        except RuntimeError as e:
+            elapsed = f"failed ({e})"
+        print(f"  {name:<14} {elapsed}  (menu {choices})")
+
+
+if __name__ == "__main__":
+    main()
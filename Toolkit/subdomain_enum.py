@@ -0,0 +1,99 @@
+"""Wordlist- and permutation-driven subdomain enumeration with wildcard filtering."""
+import sys
+import time
+import asyncio
+
+from DNS_Records.subdomains import candidate_labels, WildcardFilter
+from Toolkit.bulk import read_targets
+from Toolkit.dns_bulk import open_engine, compact_line, DEFAULT_IN_FLIGHT, PROGRESS_INTERVAL
+from Toolkit.registry import RECORD_TYPES
+
+
+def subdomain_main(domains, wordlist, permute=False, output='-', in_flight=DEFAULT_IN_FLIGHT, nameservers=None,
+                   port=53, store=None, writer=None, progress_interval=PROGRESS_INTERVAL, raw_udp=False):
+    """Brute-forces subdomains of each domain from a wordlist and writes the ones that exist.
+
+    The wordlist is streamed once per domain and candidates are resolved with
+    at most in_flight queries outstanding. Each parent is probed once for a
+    wildcard; names answering with nothing but the wildcard's addresses are
+    dropped. Hits go to the result store and/or NDJSON writer when given,
+    otherwise to output as compact tab-separated lines.
+
+    Args:
+        domains (list): Domains to enumerate.
+        wordlist (str): Path of the wordlist, one label per line, or '-' for stdin (single domain only).
+        permute (bool): Also try numbered and tagged permutations of every word.
+        output (str): File for the hits, '-' for stdout.
+        in_flight (int): Maximum number of outstanding queries.
+        nameservers (list, optional): Upstream resolvers. Defaults to the system configuration.
+        port (int): Port the upstream resolvers listen on.
+        store (Toolkit.result_store.ResultStore, optional): Store for the hits.
+        writer (Toolkit.output.NDJSONWriter, optional): Streams each hit.
+        progress_interval (float): Seconds between progress lines.
+        raw_udp (bool): Use the pipelined raw UDP engine for the highest queries per second.
+
+    Returns:
+        dict: Number of answers per status, with wildcard matches counted as 'WILDCARD'.
+    """
+    domains = [domain.strip().rstrip('.').lower() for domain in domains if domain.strip()]
+    if wordlist == '-' and len(domains) > 1:
+        print("A wordlist read from stdin can only be used for one domain.", file=sys.stderr)
+        return {}
+    stream = None
+    if store is None and writer is None:
+        stream = sys.stdout if output == '-' else open(output, 'w', encoding='utf-8')
+    counts = {}
+    start = last_report = time.perf_counter()
+
+    def handle(answer, elapsed):
+        name = answer.name.rstrip('.')
+        if stream is not None:
+            stream.write(compact_line(answer._replace(name=name)))
+        data = {'a_records': [record.value for record in answer.records if record.rdtype == 'A'],
+                'ttl': answer.ttl}
+        if writer is not None:
+            writer.emit('18', RECORD_TYPES['18'], name, data, None, elapsed)
+        if store is not None:
+            store.write(name, RECORD_TYPES['18'], data)
+
+    async def run():
+        nonlocal last_report
+        engine = open_engine(nameservers, port, in_flight, raw_udp)
+        wildcards = WildcardFilter(engine)
+        try:
+            for domain in domains:
+                if await wildcards.fingerprint(domain):
+                    print(f"{domain} has a wildcard; its answers are filtered out", file=sys.stderr)
+            queries = ((f"{label}.{domain}", 'A') for domain in domains
+                       for label in candidate_labels(read_targets(wordlist), permute))
+            async for answer, elapsed in engine.stream(queries, in_flight):
+                status = answer.status
+                if answer.records and await wildcards.is_wildcard(answer):
+                    status = 'WILDCARD'
+                counts[status] = counts.get(status, 0) + 1
+                if status == 'NOERROR':
+                    handle(answer, elapsed)
+                now = time.perf_counter()
+                if now - last_report >= progress_interval:
+                    last_report = now
+                    done = sum(counts.values())
+                    print(f"{done} candidates, {counts.get('NOERROR', 0)} found, {done / (now - start):.0f} qps",
+                          file=sys.stderr)
+        finally:
+            engine.close()
+
+    try:
+        asyncio.run(run())
+    finally:
+        if stream is not None and stream is not sys.stdout:
+            stream.close()
+    total = sum(counts.values())
+    elapsed = time.perf_counter() - start
+    summary = ', '.join(f"{status} {count}" for status, count in sorted(counts.items()))
+    print(f"Tried {total} candidates in {elapsed:.2f}s ({total / elapsed if elapsed else 0:.0f} qps): {summary}",
+          file=sys.stderr)
+    return counts
+
+
+if __name__ == "__main__":
+    subdomain_main(['example.com'], 'subdomains.txt', permute=True)
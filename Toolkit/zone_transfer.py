@@ -0,0 +1,162 @@
+"""Zone-transfer fast path: whole zones via AXFR, with per-type queries for zones that refuse it."""
+import sys
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import dns.exception
+
+from DNS_Records.dns_cache import get_resolver
+from DNS_Records.zone_transfer import stream_zone, nameserver_addresses
+from Toolkit.dns_bulk import open_engine, compact_line, RDTYPE_CHOICES, DEFAULT_IN_FLIGHT
+from Toolkit.registry import RECORD_TYPES
+from Toolkit.zone_refresh import answer_data, soa_serial
+
+# Record types queried one at a time for zones that refuse a transfer
+FALLBACK_TYPES = ('NS', 'MX', 'TXT', 'SRV', 'A', 'CNAME')
+# Store record type holding each zone's last transfer: serial, server and record count
+TRANSFER_TYPE = 'zone_transfer'
+DEFAULT_TRANSFERS = 8
+
+
+def record_type(rdtype):
+    """Store record type for answers of rdtype; types without a menu option get their own."""
+    choice = RDTYPE_CHOICES.get(rdtype)
+    return RECORD_TYPES[choice] if choice else f"{rdtype.lower()}_records"
+
+
+def axfr_main(domains, store=None, rdtypes=FALLBACK_TYPES, output='-', in_flight=DEFAULT_IN_FLIGHT,
+              nameservers=None, port=53, writer=None, servers=None, transfers=DEFAULT_TRANSFERS, raw_udp=False):
+    """Fetches whole zones by AXFR where the nameservers allow it, and by per-type queries where they do not.
+
+    Each domain's nameservers (from its NS records, or the given servers) are
+    asked for a transfer in turn. The transfer is parsed as it arrives and
+    every record set goes straight to the store, writer or output, so a large
+    zone is never held in memory. Zones that no server will transfer have the
+    chosen record types queried through the async DNS engine instead.
+
+    A transfer that breaks off after some of its records were written is not
+    retried elsewhere or queried again, which would write those records twice;
+    the zone is counted as 'partial' and transferred in full on the next run.
+
+    With a store, the serial of every complete transfer is kept; a zone whose
+    SOA serial has not moved since is not transferred again.
+
+    Args:
+        domains (iterable): Zones to fetch.
+        store (Toolkit.result_store.ResultStore, optional): Store for the records.
+        rdtypes (tuple): Record types queried for zones that refuse the transfer.
+        output (str): File for the compact answer lines when no store or writer is given, '-' for stdout.
+        in_flight (int): Maximum number of outstanding fallback queries.
+        nameservers (list, optional): Upstream resolvers. Defaults to the system configuration.
+        port (int): Port the upstream resolvers and the zones' nameservers listen on.
+        writer (Toolkit.output.NDJSONWriter, optional): Streams each record set, with
+            'source' telling whether it came from a transfer ('axfr') or a query.
+        servers (list, optional): Nameserver addresses to transfer from instead of the
+            zone's NS records, e.g. an internal primary.
+        transfers (int): Maximum number of transfers running at once.
+        raw_udp (bool): Use the pipelined raw UDP engine for the fallback queries.
+
+    Returns:
+        dict: Number of zones 'transferred', 'partial', 'unchanged' and 'queried', and the 'records' written.
+    """
+    rdtypes = list(dict.fromkeys(rdtype.upper() for rdtype in rdtypes))
+    invalid = [rdtype for rdtype in rdtypes if rdtype not in RDTYPE_CHOICES]
+    if invalid:
+        print(f"Unsupported record type(s): {', '.join(invalid)}. Choose among {', '.join(RDTYPE_CHOICES)}.",
+              file=sys.stderr)
+        return {}
+    domains = list(dict.fromkeys(domain.strip().rstrip('.').lower() for domain in domains if domain.strip()))
+    previous = store.latest(TRANSFER_TYPE) if store is not None else {}
+    stream = None
+    if store is None and writer is None:
+        stream = sys.stdout if output == '-' else open(output, 'w', encoding='utf-8')
+    lock = threading.Lock()
+    counts = {'transferred': 0, 'partial': 0, 'unchanged': 0, 'queried': 0, 'records': 0}
+    start = time.perf_counter()
+
+    def emit(answer, source, elapsed=None):
+        data = {'rdtype': answer.rdtype, **answer_data(answer), 'source': source}
+        if stream is not None:
+            with lock:
+                stream.write(compact_line(answer))
+        if writer is not None:
+            writer.emit(RDTYPE_CHOICES.get(answer.rdtype), record_type(answer.rdtype), answer.name.rstrip('.'),
+                        data, answer.error, elapsed)
+        if store is not None and answer.error is None:
+            # A failed fallback query must not replace the stored record set
+            store.write(answer.name.rstrip('.'), record_type(answer.rdtype), data)
+
+    def current_serial(domain):
+        try:
+            answer = get_resolver().resolve(domain, 'SOA')
+        except dns.exception.DNSException:
+            return None
+        return answer[0].serial
+
+    def transfer(domain):
+        """Transfers one zone; returns 'transferred', 'partial', 'unchanged' or None if no server allowed it."""
+        last = previous.get(domain)
+        if last is not None and last.get('serial') is not None and current_serial(domain) == last['serial']:
+            return 'unchanged'
+        candidates = [(address, address) for address in servers] if servers else nameserver_addresses(domain)
+        for nameserver, address in candidates:
+            written = 0
+            serial = None
+            try:
+                for answer in stream_zone(domain, address, port):
+                    if serial is None and answer.rdtype == 'SOA':
+                        serial = soa_serial(answer)
+                    emit(answer, 'axfr')
+                    written += len(answer.records)
+            except (dns.exception.DNSException, OSError, EOFError) as e:
+                if not written:
+                    continue
+                with lock:
+                    counts['records'] += written
+                print(f"Transfer of {domain} from {nameserver} broke off after {written} records: {e}",
+                      file=sys.stderr)
+                return 'partial'
+            with lock:
+                counts['records'] += written
+            if store is not None:
+                store.write(domain, TRANSFER_TYPE, {'serial': serial, 'server': nameserver, 'records': written})
+            return 'transferred'
+        return None
+
+    async def query_refused(refused):
+        engine = open_engine(nameservers, port, in_flight, raw_udp)
+        try:
+            queries = ((domain, rdtype) for domain in refused for rdtype in rdtypes)
+            async for answer, elapsed in engine.stream(queries, in_flight):
+                emit(answer, 'query', elapsed)
+                counts['records'] += len(answer.records)
+        finally:
+            engine.close()
+
+    try:
+        with ThreadPoolExecutor(max_workers=transfers) as executor:
+            outcomes = list(executor.map(transfer, domains))
+        refused = []
+        for domain, outcome in zip(domains, outcomes):
+            if outcome is None:
+                refused.append(domain)
+            else:
+                counts[outcome] += 1
+        if refused:
+            counts['queried'] = len(refused)
+            asyncio.run(query_refused(refused))
+    finally:
+        if stream is not None and stream is not sys.stdout:
+            stream.close()
+    elapsed = time.perf_counter() - start
+    print(f"Fetched {len(domains)} zones in {elapsed:.2f}s: {counts['transferred']} by AXFR, {counts['partial']} "
+          f"partially, {counts['unchanged']} unchanged since the last transfer, {counts['queried']} by per-type "
+          f"queries; {counts['records']} records",
+          file=sys.stderr)
+    return counts
+
+
+if __name__ == "__main__":
+    axfr_main(['zonetransfer.me', 'example.com'])
@@ -1,8 +1,86 @@
 import requests
 import logging
 import json
+import time
+import asyncio
+import re
+from Toolkit.http_client import get_session, get_async_session
+from imp.bgp_cache import BGPCache, get_default_cache
+
+# The six views fetched for an ASN by the menu options 9-13 and 15
+ASN_VIEWS = ['ASN_Info', 'ASN_Prefixes', 'ASN_Peers', 'ASN_Upstreams', 'ASN_Downstreams', 'ASN_IXs']
 
 class BGP:
+    BASE_URL = 'https://api.bgpview.io'
+
+    # View name -> endpoint path, filled in with the view's arguments
+    ENDPOINTS = {
+        'ASN_Info': '/asn/{0}',
+        'ASN_Prefixes': '/asn/{0}/prefixes',
+        'ASN_Peers': '/asn/{0}/peers',
+        'ASN_Upstreams': '/asn/{0}/upstreams',
+        'ASN_Downstreams': '/asn/{0}/downstreams',
+        'ASN_IXs': '/asn/{0}/ixs',
+        'IP_Prefix': '/prefix/{0}/{1}',
+        'IP': '/ip/{0}',
+        'IX': '/ix/{0}',
+        'Search': '/search?query_term={0}',
+    }
+
+    def __init__(self, session=None, cache=None):
+        """Initialize the client.
+
+        Args:
+            session (requests.Session, optional): Session reused across calls so
+                connections stay open. Defaults to the shared pooled session.
+            cache (imp.bgp_cache.BGPCache, optional): Response cache. Defaults to
+                the on-disk default cache; pass False to disable caching.
+        """
+        self.session = session or get_session()
+        self.cache = get_default_cache() if cache is None else cache or None
+
+    @classmethod
+    def endpoint(cls, view, *args):
+        """Builds the API URL for one of the ENDPOINTS views."""
+        return cls.BASE_URL + cls.ENDPOINTS[view].format(*args)
+
+    @classmethod
+    def view_of(cls, endpoint):
+        """Returns the ENDPOINTS view an API URL belongs to, or None."""
+        path = endpoint[len(cls.BASE_URL):] if endpoint.startswith(cls.BASE_URL) else endpoint
+        for view, template in cls.ENDPOINTS.items():
+            pattern = re.sub(r'\\\{\d\\\}', '[^/?]+', re.escape(template))
+            if re.fullmatch(pattern, path):
+                return view
+        return None
+
+    def get_data(self, endpoint):
+        """Fetches an endpoint and returns its decoded JSON body.
+
+        Fresh cached responses are returned without a request; stale ones are
+        revalidated with a conditional request.
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails.
+        """
+        if self.cache is None:
+            response = self.session.get(endpoint)
+            response.raise_for_status()
+            return response.json()
+
+        view = self.view_of(endpoint)
+        entry = self.cache.get(endpoint, view)
+        if entry is not None and entry.fresh:
+            return entry.data
+        response = self.session.get(endpoint, headers=self.cache.conditional_headers(entry))
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(endpoint)
+            return entry.data
+        response.raise_for_status()
+        content = response.json()
+        self.cache.put(endpoint, view, content, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return content
+
     def save_to_file(self, filename, domain, content):
         """
         Saves content to a file.
@@ -23,16 +101,14 @@ class BGP:
 
     def fetch_data(self, endpoint, output_filename):
         try:
-            response = requests.get(endpoint)
-            response.raise_for_status()
-            content = response.json()
+            content = self.get_data(endpoint)
             self.save_to_file(output_filename, endpoint, content)
             print(f"Data saved to '{output_filename}' successfully.")
         except requests.exceptions.HTTPError as he:
             logging.error(f"HTTP Error: {he}")
             print(f"Received HTML instead of JSON from '{endpoint}'. Saving as is to '{output_filename}'.")
             with open(output_filename, 'w') as file:
-                file.write(response.text)
+                file.write(he.response.text)
         except Exception as e:
             logging.error(f"Error fetching data from '{endpoint}': {e}")
 
@@ -40,47 +116,171 @@ class BGP:
     # Function to get ASN Information
     def ASN_Info(self, as_number):
         output_filename = f"{self.safe_filename(as_number)}_ASN_Info.json"
-        self.fetch_data(f'https://api.bgpview.io/asn/{as_number}', output_filename)
+        self.fetch_data(self.endpoint('ASN_Info', as_number), output_filename)
 
     # Function to get ASN Prefixes
     def ASN_Prefixes(self, as_number):
         output_filename = f"{self.safe_filename(as_number)}_ASN_Prefixes.json"
-        self.fetch_data(f'https://api.bgpview.io/asn/{as_number}/prefixes', output_filename)
+        self.fetch_data(self.endpoint('ASN_Prefixes', as_number), output_filename)
 
     # Function to get ASN Peers
     def ASN_Peers(self, as_number):
         output_filename = f"{self.safe_filename(as_number)}_ASN_Peers.json"
-        self.fetch_data(f'https://api.bgpview.io/asn/{as_number}/peers', output_filename)
+        self.fetch_data(self.endpoint('ASN_Peers', as_number), output_filename)
 
     # Function to get ASN Upstreams
     def ASN_Upstreams(self, as_number):
         output_filename = f"{self.safe_filename(as_number)}_ASN_Upstreams.json"
-        self.fetch_data(f'https://api.bgpview.io/asn/{as_number}/upstreams', output_filename)
+        self.fetch_data(self.endpoint('ASN_Upstreams', as_number), output_filename)
 
     # Function to get ASN Downstreams
     def ASN_Downstreams(self, as_number):
         output_filename = f"{self.safe_filename(as_number)}_ASN_Downstreams.json"
-        self.fetch_data(f'https://api.bgpview.io/asn/{as_number}/downstreams', output_filename)
+        self.fetch_data(self.endpoint('ASN_Downstreams', as_number), output_filename)
 
     # Function to get ASN IXs
     def ASN_IXs(self, as_number):
         output_filename = f"{self.safe_filename(as_number)}_ASN_IXs.json"
-        self.fetch_data(f'https://api.bgpview.io/asn/{as_number}/ixs', output_filename)
+        self.fetch_data(self.endpoint('ASN_IXs', as_number), output_filename)
 
     # Function to get IP Prefix Information
     def IP_Prefix(self, IP, Cidr):
         output_filename = f"{self.safe_filename(IP)}_IP_Prefix.json"
-        self.fetch_data(f'https://api.bgpview.io/prefix/{IP}/{Cidr}', output_filename)
+        self.fetch_data(self.endpoint('IP_Prefix', IP, Cidr), output_filename)
 
     # Function to get IX Information
     def IX(self, ix_id):
         output_filename = f"{self.safe_filename(ix_id)}_IX.json"
-        self.fetch_data(f'https://api.bgpview.io/ix/{ix_id}', output_filename)
+        self.fetch_data(self.endpoint('IX', ix_id), output_filename)
 
     # Function to search BGPview
     def Search(self, query):
         output_filename = f"{self.safe_filename(query)}_Search.json"
-        self.fetch_data(f'https://api.bgpview.io/search?query_term={query}', output_filename)
+        self.fetch_data(self.endpoint('Search', query), output_filename)
+
+
+class RateLimiter:
+    """Spaces calls so that at most `rate` start per second."""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self._next_slot = 0
+        self._lock = None
+
+    async def wait(self):
+        if not self.interval:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AsyncBGP:
+    """Asynchronous BGPView client for bulk queries.
+
+    Requests share one pooled aiohttp session, at most `concurrency` are in
+    flight, and each endpoint family (view) is rate limited separately.
+    """
+
+    def __init__(self, concurrency=10, rate_limit=5, retries=3, session=None, cache=None):
+        """Initialize the client.
+
+        Args:
+            concurrency (int): Maximum number of requests in flight.
+            rate_limit (float): Requests per second allowed per view; 0 disables it.
+            retries (int): Attempts per request on HTTP 429 or 5xx responses; at least one is made.
+            session (aiohttp.ClientSession, optional): Session to use instead of
+                the event loop's pooled one.
+            cache (imp.bgp_cache.BGPCache, optional): Response cache. Defaults to
+                the on-disk default cache; pass False to disable caching.
+        """
+        self.concurrency = concurrency
+        self.rate_limit = rate_limit
+        self.retries = max(1, retries)
+        self.session = session
+        self.cache = get_default_cache() if cache is None else cache or None
+        self._semaphore = None
+        self._limiters = {}
+
+    async def get_data(self, view, *args):
+        """Fetches one view and returns its decoded JSON body.
+
+        Fresh cached responses are returned without a request; stale ones are
+        revalidated with a conditional request.
+
+        Raises:
+            aiohttp.ClientError: If the request keeps failing after all retries.
+        """
+        url = BGP.endpoint(view, *args)
+        entry = self.cache.get(url, view) if self.cache is not None else None
+        if entry is not None and entry.fresh:
+            return entry.data
+        headers = BGPCache.conditional_headers(entry)
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        limiter = self._limiters.setdefault(view, RateLimiter(self.rate_limit))
+        session = self.session or await get_async_session()
+        for attempt in range(1, self.retries + 1):
+            await limiter.wait()
+            async with self._semaphore:
+                async with session.get(url, headers=headers) as response:
+                    if response.status == 304 and entry is not None:
+                        self.cache.touch(url)
+                        return entry.data
+                    if (response.status == 429 or response.status >= 500) and attempt < self.retries:
+                        retry_after = response.headers.get('Retry-After', '')
+                        delay = float(retry_after) if retry_after.isdigit() else 2 ** attempt
+                    else:
+                        response.raise_for_status()
+                        content = await response.json(content_type=None)
+                        if self.cache is not None:
+                            self.cache.put(url, view, content, response.headers.get('ETag'),
+                                           response.headers.get('Last-Modified'))
+                        return content
+            logging.warning(f"BGPView returned {response.status} for {url}, retrying in {delay}s")
+            await asyncio.sleep(delay)
+
+    async def fetch_many(self, view, items, on_result=None):
+        """Fetches one view for many arguments concurrently.
+
+        Args:
+            view (str): One of BGP.ENDPOINTS, e.g. 'ASN_Prefixes'.
+            items (iterable): Arguments for the view; use tuples for views that
+                take several (e.g. ('192.209.63.0', '24') for 'IP_Prefix').
+            on_result (callable, optional): Called as on_result(view, item, data,
+                error, elapsed) as soon as each request finishes.
+
+        Returns:
+            dict: item -> decoded JSON, or the exception raised for that item.
+        """
+        async def fetch(item):
+            start = time.perf_counter()
+            args = item if isinstance(item, tuple) else (item,)
+            try:
+                data, error = await self.get_data(view, *args), None
+            except Exception as e:
+                data, error = None, e
+            if on_result is not None:
+                on_result(view, item, data, error, time.perf_counter() - start)
+            return item, data if error is None else error
+
+        return dict(await asyncio.gather(*(fetch(item) for item in items)))
+
+    async def asn_views(self, asns, views=ASN_VIEWS, on_result=None):
+        """Fetches several views for many ASNs concurrently.
+
+        Returns:
+            dict: asn -> {view -> decoded JSON or exception}.
+        """
+        asns = list(asns)
+        per_view = await asyncio.gather(*(self.fetch_many(view, asns, on_result) for view in views))
+        return {asn: {view: results[asn] for view, results in zip(views, per_view)} for asn in asns}
 
 
 if __name__ == "__main__":
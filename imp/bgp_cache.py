@@ -0,0 +1,128 @@
+import os
+import json
+import time
+import logging
+import sqlite3
+import threading
+from collections import namedtuple
+
+DEFAULT_CACHE_PATH = os.environ.get(
+    'NETINFO_BGP_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'netinfo', 'bgp_cache.db'))
+
+# Seconds a response stays fresh, per BGP view. Slow-moving data lives longest.
+DEFAULT_TTLS = {
+    'ASN_Info': 86400,
+    'ASN_Prefixes': 3600,
+    'ASN_Peers': 21600,
+    'ASN_Upstreams': 21600,
+    'ASN_Downstreams': 21600,
+    'ASN_IXs': 86400,
+    'IP_Prefix': 3600,
+    'IP': 3600,
+    'IX': 86400,
+    'Search': 3600,
+}
+FALLBACK_TTL = 3600
+
+CacheEntry = namedtuple('CacheEntry', ['data', 'fetched_at', 'etag', 'last_modified', 'fresh'])
+
+
+class BGPCache:
+    """Disk-backed cache of BGP API responses, keyed by endpoint URL.
+
+    Entries outlive their TTL so a stale entry can still be revalidated with a
+    conditional request (If-None-Match / If-Modified-Since) instead of being
+    downloaded again.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttls=None):
+        """Initialize the cache.
+
+        Args:
+            path (str): SQLite file holding the cache; created if missing.
+            ttls (dict, optional): Per-view TTL overrides in seconds.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "url TEXT PRIMARY KEY, view TEXT, fetched_at REAL NOT NULL, "
+                "etag TEXT, last_modified TEXT, body TEXT NOT NULL)")
+
+    def ttl(self, view):
+        return self.ttls.get(view, FALLBACK_TTL)
+
+    def get(self, url, view):
+        """Returns the CacheEntry for url, or None if it was never cached."""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT body, fetched_at, etag, last_modified FROM responses WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        body, fetched_at, etag, last_modified = row
+        fresh = time.time() - fetched_at < self.ttl(view)
+        if fresh:
+            self.hits += 1
+        return CacheEntry(json.loads(body), fetched_at, etag, last_modified, fresh)
+
+    def put(self, url, view, data, etag=None, last_modified=None):
+        with self._lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses (url, view, fetched_at, etag, last_modified, body) "
+                "VALUES (?, ?, ?, ?, ?, ?)", (url, view, time.time(), etag, last_modified, json.dumps(data)))
+
+    def touch(self, url):
+        """Marks an entry fresh again after the server answered 304 Not Modified."""
+        self.revalidated += 1
+        with self._lock, self.connection:
+            self.connection.execute("UPDATE responses SET fetched_at = ? WHERE url = ?", (time.time(), url))
+
+    @staticmethod
+    def conditional_headers(entry):
+        """Returns the revalidation headers for a stale entry."""
+        headers = {}
+        if entry is not None and entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def stats(self):
+        return {'hits': self.hits, 'revalidated': self.revalidated, 'misses': self.misses}
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def set_default_cache(cache):
+    """Replaces the process-wide cache; pass False to disable default caching."""
+    global _default_cache
+    with _default_cache_lock:
+        _default_cache = cache
+
+
+def get_default_cache():
+    """Returns the process-wide cache at DEFAULT_CACHE_PATH, or None if it cannot be opened."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            try:
+                _default_cache = BGPCache()
+            except (OSError, sqlite3.Error) as e:
+                logging.warning(f"BGP cache disabled, cannot open {DEFAULT_CACHE_PATH}: {e}")
+                _default_cache = False
+        return _default_cache or None